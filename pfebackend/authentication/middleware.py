@@ -1,25 +1,153 @@
 from channels.middleware import BaseMiddleware
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
 from asgiref.sync import sync_to_async
 from urllib.parse import parse_qs
+import threading
+import time
+
+
+class JWTUserCache:
+    """
+    Short-lived, per-process cache of the users resolved from JWTs
+
+    Entries are keyed by the token's user id and ``jti`` and expire after
+    ``WEBSOCKET_AUTH_CACHE_TIMEOUT`` seconds, or earlier when the token
+    itself expires. Saving or deleting a user drops their entries (see
+    ``authentication.signals``), so deactivations apply on the next
+    handshake in this process and within the timeout everywhere else.
+
+    The cache lives in process memory rather than in Django's cache so a
+    hit needs neither the database nor a worker thread.
+    """
+
+    # Upper bound on cached tokens; expired entries are purged first
+    MAX_ENTRIES = 10000
+
+    _entries = {}  # user_id -> {jti: (expires_at, user)}
+    _size = 0
+    _stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+    _lock = threading.Lock()
+
+    @classmethod
+    def timeout(cls):
+        return getattr(settings, 'WEBSOCKET_AUTH_CACHE_TIMEOUT', 60)
+
+    @classmethod
+    def get(cls, user_id, jti):
+        """Get the cached user for a token, or None"""
+        now = time.monotonic()
+        with cls._lock:
+            entry = cls._entries.get(user_id, {}).get(jti)
+            if entry and entry[0] > now:
+                cls._stats['hits'] += 1
+                return entry[1]
+            cls._stats['misses'] += 1
+            return None
+
+    @classmethod
+    def set(cls, user_id, jti, user, token_exp=None):
+        """
+        Cache the user resolved for a token
+
+        Args:
+            user_id: Id claim of the token
+            jti: Unique token identifier
+            user: Resolved user instance
+            token_exp: Token expiry as a UNIX timestamp, if known
+        """
+        timeout = cls.timeout()
+        if timeout <= 0 or not jti:
+            return
+        if token_exp is not None:
+            timeout = min(timeout, token_exp - time.time())
+            if timeout <= 0:
+                return
+
+        expires_at = time.monotonic() + timeout
+        with cls._lock:
+            if cls._size >= cls.MAX_ENTRIES:
+                cls._purge(time.monotonic())
+            user_entries = cls._entries.setdefault(user_id, {})
+            if jti not in user_entries:
+                cls._size += 1
+            user_entries[jti] = (expires_at, user)
+
+    @classmethod
+    def _purge(cls, now):
+        """Drop expired entries, then everything if the cache is still full"""
+        for user_id in list(cls._entries):
+            user_entries = cls._entries[user_id]
+            for jti in [jti for jti, (expires_at, _) in user_entries.items() if expires_at <= now]:
+                del user_entries[jti]
+                cls._size -= 1
+            if not user_entries:
+                del cls._entries[user_id]
+
+        if cls._size >= cls.MAX_ENTRIES:
+            cls._entries.clear()
+            cls._size = 0
+
+    @classmethod
+    def invalidate_user(cls, user_id):
+        """Drop every cached token of a user"""
+        with cls._lock:
+            user_entries = cls._entries.pop(user_id, None)
+            if user_entries:
+                cls._size -= len(user_entries)
+                cls._stats['invalidations'] += 1
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._entries.clear()
+            cls._size = 0
+
+    @classmethod
+    def get_stats(cls):
+        """
+        Get the hit and miss counters of this process
+
+        Returns:
+            dict: hits, misses, invalidations, cached entries and hit_rate
+        """
+        with cls._lock:
+            stats = dict(cls._stats)
+            stats['entries'] = cls._size
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else None
+        return stats
+
+    @classmethod
+    def reset_stats(cls):
+        with cls._lock:
+            for key in cls._stats:
+                cls._stats[key] = 0
+
 
 class JWTAuthMiddleware(BaseMiddleware):
+    def __init__(self, inner):
+        super().__init__(inner)
+        # Stateless, so one authenticator serves every connection
+        self.jwt_authentication = JWTAuthentication()
+
     async def __call__(self, scope, receive, send):
         # Initialize user as AnonymousUser by default
         scope["user"] = AnonymousUser()
-        
+
         # Try to get token from headers first
         headers = dict(scope["headers"])
         auth_header = headers.get(b"authorization", b"").decode("utf-8")
-        
+
         if auth_header.startswith("Bearer "):
             token = auth_header.split(" ")[1]
             authenticated = await self.authenticate_token(token, scope)
             if authenticated:
                 return await super().__call__(scope, receive, send)
-        
+
         # If no valid token in headers, try query parameters
         if scope["type"] == "websocket":
             # Parse query string
@@ -29,17 +157,28 @@ class JWTAuthMiddleware(BaseMiddleware):
                 token = query_params.get("token", [""])[0]
                 if token:
                     await self.authenticate_token(token, scope)
-        
+
         return await super().__call__(scope, receive, send)
-    
+
     async def authenticate_token(self, token, scope):
-        """Authenticate a token and set user in scope if valid"""
+        """
+        Authenticate a token and set user in scope if valid
+
+        The signature and expiry are always checked; the user lookup is
+        served from ``JWTUserCache`` when the same token was seen recently.
+        """
         try:
             # Validate JWT token
-            jwt_authentication = JWTAuthentication()
-            validated_token = jwt_authentication.get_validated_token(token)
-            user = await sync_to_async(jwt_authentication.get_user)(validated_token)
+            validated_token = self.jwt_authentication.get_validated_token(token)
+            user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+            jti = validated_token.get(api_settings.JTI_CLAIM)
+
+            user = JWTUserCache.get(user_id, jti)
+            if user is None:
+                user = await sync_to_async(self.jwt_authentication.get_user)(validated_token)
+                JWTUserCache.set(user_id, jti, user, token_exp=validated_token.get('exp'))
+
             scope["user"] = user
             return True
         except (InvalidToken, AuthenticationFailed):
-            return False
\ No newline at end of file
+            return False
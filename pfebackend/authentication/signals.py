@@ -0,0 +1,11 @@
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .middleware import JWTUserCache
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_jwt_user_cache(sender, instance, **kwargs):
+    """Drop the WebSocket auth cache entries of a saved or deleted user"""
+    JWTUserCache.invalidate_user(instance.pk)
@@ -2,7 +2,11 @@ from django.test import TestCase
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from authentication.middleware import JWTAuthMiddleware, JWTUserCache
 from users.models import User, Student, Teacher, Administrator
 import jwt
 from django.conf import settings
@@ -193,4 +197,59 @@ class PermissionTests(APITestCase):
         """Test unauthorized access to protected endpoints"""
         # Try accessing protected endpoint without authentication
         response = self.client.get(reverse('user-list'))
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class JWTAuthMiddlewareTests(TestCase):
+    """Tests for the cached WebSocket JWT user resolution"""
+
+    def setUp(self):
+        JWTUserCache.clear()
+        JWTUserCache.reset_stats()
+        self.user = User.objects.create_user(
+            email='socket@test.com',
+            username='sockettest',
+            password='pass123',
+            first_name='Socket',
+            last_name='Test',
+            user_type='student'
+        )
+        self.token = str(AccessToken.for_user(self.user))
+        self.middleware = JWTAuthMiddleware(None)
+
+    def _authenticate(self, token):
+        scope = {}
+        authenticated = async_to_sync(self.middleware.authenticate_token)(token, scope)
+        return authenticated, scope.get('user')
+
+    def test_second_handshake_is_served_from_cache(self):
+        """Test that a repeated token resolves the user without a query"""
+        self._authenticate(self.token)
+
+        with CaptureQueriesContext(connection) as queries:
+            authenticated, user = self._authenticate(self.token)
+
+        self.assertTrue(authenticated)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(len(queries), 0)
+        stats = JWTUserCache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_user_save_invalidates_cache(self):
+        """Test that a deactivated user is rejected on the next handshake"""
+        self._authenticate(self.token)
+
+        self.user.is_active = False
+        self.user.save()
+        authenticated, _ = self._authenticate(self.token)
+
+        self.assertFalse(authenticated)
+        self.assertEqual(JWTUserCache.get_stats()['invalidations'], 1)
+
+    def test_invalid_token_is_rejected(self):
+        """Test that a bad token never reaches the cache"""
+        authenticated, _ = self._authenticate('invalid.token.value')
+
+        self.assertFalse(authenticated)
+        self.assertEqual(JWTUserCache.get_stats()['misses'], 0)
+
@@ -1,46 +1,138 @@
 # chat/consumers.py
-import json
-from asgiref.sync import async_to_sync
-from channels.generic.websocket import WebsocketConsumer, AsyncWebsocketConsumer
+import logging
+from channels.db import database_sync_to_async
+from common import json as fast_json
+from common.consumers import BufferedJsonConsumer
+from common.presence import PresenceConsumerMixin
+from teams.services.team_membership_cache import TeamMembershipCache
+from .services import ChatService, ChatMessageWriter
 
-class ChatConsumer(AsyncWebsocketConsumer):
+logger = logging.getLogger(__name__)
+
+
+class ChatConsumer(PresenceConsumerMixin, BufferedJsonConsumer):
     """
     an asynchronous chat consumer
 
-    Args:
-        AsyncWebsocketConsumer (_type_): _description_
+    Rooms are team rooms (``team_<id>``). Only authenticated members of the
+    team can connect, and membership is re-checked for every message from
+    the in-memory ``TeamMembershipCache``, so removed members lose access
+    without a query per message.
+
+    Messages are broadcast to the room group right away and handed to
+    ``ChatMessageWriter`` to be stored in batches. On connect the client
+    receives the room's recent messages, and the ``history`` command pages
+    further back.
     """
     async def connect(self):
         self.room_name = self.scope["url_route"]["kwargs"]["room_name"]
         self.room_group_name = f"chat_{self.room_name}"
+        self.user = self.scope.get("user")
+        self.team_id = ChatService.team_id_for_room(self.room_name)
+
+        # Reject anonymous users, unknown rooms and non-members
+        if self.team_id is None or not self.user or not self.user.is_authenticated:
+            await self.close()
+            return
+        if not await self._is_member():
+            await self.close()
+            return
 
         # Join room group
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
 
+        # Mark the user online before any push can target this socket
+        await self.start_presence()
         await self.accept()
 
+        # Replay the last messages of the room
+        messages = await self._get_recent_messages()
+        await self.send_event({
+            "type": "recent_messages",
+            "messages": messages,
+            "count": len(messages)
+        })
+
     async def disconnect(self, close_code):
         # Leave room group
         await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
+        # Store the buffered messages rather than waiting for the next batch
+        await ChatMessageWriter.flush()
+
+    async def _is_member(self):
+        """Check team membership, from process memory whenever possible"""
+        team_ids = TeamMembershipCache.get_local(self.user.id)
+        if team_ids is None:
+            team_ids = await database_sync_to_async(TeamMembershipCache.get_team_ids)(self.user.id)
+        return self.team_id in team_ids
 
     # Receive message from WebSocket
     async def receive(self, text_data):
-        text_data_json = json.loads(text_data)
-        print('websocker json-----------------------------------------------')
-        print(text_data_json)
-        print('websocker json-----------------------------------------------')
-        message = text_data_json["message"]
-        print('websocker message-----------------------------------------------')
-        print(message)
-        print('websocker message-----------------------------------------------')
+        try:
+            data = fast_json.loads(text_data)
+        except fast_json.JSONDecodeError:
+            await self.send_event({
+                "type": "error",
+                "message": "Invalid JSON format"
+            })
+            return
+
+        if data.get("command") == "history":
+            if not await self._is_member():
+                await self.close()
+                return
+            await self.send_history(data.get("cursor"), data.get("limit"))
+            return
+
+        content = data.get("message")
+        if not content:
+            return
+
+        if not await self._is_member():
+            logger.debug("Chat message refused", extra={"room": self.room_name, "user_id": self.user.id})
+            await self.close()
+            return
+
+        message = ChatService.build_message(self.room_name, self.user, content)
+        logger.debug(
+            "Chat message received",
+            extra={"room": self.room_name, "sender_id": message.sender_id, "length": len(content)}
+        )
+
         # Send message to room group
         await self.channel_layer.group_send(
-            self.room_group_name, {"type": "chat.message", "message": message}
+            self.room_group_name, {"type": "chat.message", "message": message.to_dict()}
         )
+        await ChatMessageWriter.add(message)
 
     # Receive message from room group
     async def chat_message(self, event):
-        message = event["message"]
-
         # Send message to WebSocket
-        await self.send(text_data=json.dumps({"message": message}))
\ No newline at end of file
+        await self.send_event(event["message"])
+
+    async def send_history(self, cursor, limit):
+        """Send one page of the room's history, newest first"""
+        try:
+            page = await self._get_history(cursor, limit)
+        except ValueError as e:
+            await self.send_event({
+                "type": "error",
+                "message": str(e)
+            })
+            return
+
+        await self.send_event({
+            "type": "history",
+            "messages": page["messages"],
+            "next_cursor": page["next_cursor"],
+            "has_more": page["has_more"]
+        })
+
+    # Database operation wrappers
+    @database_sync_to_async
+    def _get_recent_messages(self):
+        return ChatService.get_recent_messages(self.room_name)
+
+    @database_sync_to_async
+    def _get_history(self, cursor, limit):
+        return ChatService.get_history(self.room_name, cursor=cursor, limit=limit)
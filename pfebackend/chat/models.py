@@ -0,0 +1,83 @@
+# chat/models.py
+import base64
+import uuid
+from datetime import datetime
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class ChatMessage(models.Model):
+    """
+    A message posted in a chat room.
+    
+    Messages are keyed by room name and identified by a UUID assigned when
+    the consumer receives them, so they can be broadcast before the batched
+    write reaches the database. History is ordered on ``(created_at, message_id)``.
+    """
+    message_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    room = models.CharField(max_length=100)
+    sender = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='chat_messages'
+    )
+    content = models.TextField()
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['-created_at', '-message_id']
+        indexes = [
+            # Keyset history per room
+            models.Index(fields=['room', 'created_at', 'message_id'], name='chat_room_keyset_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.room}: {self.content[:50]}"
+    
+    @property
+    def cursor(self):
+        """Opaque position of the message in its room's history"""
+        return self.encode_cursor(self.created_at, self.message_id)
+    
+    @staticmethod
+    def encode_cursor(created_at, message_id):
+        """Encode a (created_at, message_id) keyset position as an opaque string"""
+        raw = f"{created_at.isoformat()}|{message_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+    
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        Decode a cursor made by ``encode_cursor``
+        
+        Returns:
+            tuple: (created_at, message_id)
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            created_at, message_id = raw.rsplit('|', 1)
+            return datetime.fromisoformat(created_at), uuid.UUID(message_id)
+        except (AttributeError, TypeError, ValueError, UnicodeDecodeError):
+            raise ValueError("Invalid cursor")
+    
+    def to_dict(self):
+        """
+        Convert the message to a dictionary for API/WebSocket responses
+        
+        The text is kept under ``message``, the key chat clients already read.
+        """
+        return {
+            'id': str(self.message_id),
+            'room': self.room,
+            'message': self.content,
+            'sender_id': self.sender_id,
+            'sender': self.sender.username if self.sender_id else None,
+            'created_at': self.created_at.isoformat(),
+            'cursor': self.cursor,
+        }
@@ -0,0 +1,346 @@
+import asyncio
+import atexit
+import logging
+import re
+import time
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from common.cache import shared_timeout
+from teams.services.team_membership_cache import TeamMembershipCache
+from .models import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+
+class ChatService:
+    """
+    Service class for chat rooms and their history
+
+    Rooms are scoped to teams: room ``team_<id>`` is open to the members of
+    team ``<id>`` only, checked against ``TeamMembershipCache``.
+
+    Stored messages are paged per room on ``(created_at, message_id)``. The
+    last ``CHAT_REPLAY_SIZE`` messages of each room are also kept in the
+    shared cache so a (re)connecting client can be replayed without a query.
+    The list is cached under the room's current version; every stored batch
+    bumps the version with an atomic ``incr``, so a list loaded before the
+    batch committed is never served after it. With a per-process cache the
+    list is reloaded from the database every ``RECENT_LOCAL_TIMEOUT``
+    seconds, since other processes' writes do not reach it.
+    """
+
+    # Page sizes for keyset history
+    HISTORY_PAGE_SIZE = 50
+    HISTORY_MAX_PAGE_SIZE = 100
+
+    # Seconds a room's recent messages stay cached, in a shared or a per-process cache
+    RECENT_CACHE_TIMEOUT = 60 * 60 * 24
+    RECENT_LOCAL_TIMEOUT = 5
+
+    TEAM_ROOM_PATTERN = re.compile(r'^team_(\d+)$')
+
+    @classmethod
+    def team_room(cls, team_id):
+        """Name of a team's chat room"""
+        return f'team_{team_id}'
+
+    @classmethod
+    def team_id_for_room(cls, room):
+        """
+        Get the team a room belongs to
+
+        Returns:
+            int|None: Team id, or None if the room is not a team room
+        """
+        match = cls.TEAM_ROOM_PATTERN.match(room or '')
+        return int(match.group(1)) if match else None
+
+    @classmethod
+    def can_access(cls, user, room):
+        """
+        Whether a user may read and post in a room
+
+        Args:
+            user: User or anonymous user
+            room: Room name
+
+        Returns:
+            bool: True for authenticated members of the room's team
+        """
+        team_id = cls.team_id_for_room(room)
+        if team_id is None or user is None or not user.is_authenticated:
+            return False
+        return TeamMembershipCache.is_member(user.id, team_id)
+
+    @staticmethod
+    def replay_size():
+        return getattr(settings, 'CHAT_REPLAY_SIZE', 50)
+
+    @staticmethod
+    def build_message(room, user, content):
+        """
+        Create an unsaved message, ready to be broadcast and queued for writing
+
+        Args:
+            room: Room name
+            user: Sender, or an anonymous user
+            content: Message text
+
+        Returns:
+            ChatMessage: Message with its id and timestamp assigned
+        """
+        return ChatMessage(
+            room=room,
+            sender=user if user is not None and user.is_authenticated else None,
+            content=content
+        )
+
+    @classmethod
+    def _page_size(cls, limit):
+        """Clamp a requested page size to the allowed range"""
+        try:
+            limit = int(limit) if limit is not None else cls.HISTORY_PAGE_SIZE
+        except (TypeError, ValueError):
+            limit = cls.HISTORY_PAGE_SIZE
+        return max(1, min(limit, cls.HISTORY_MAX_PAGE_SIZE))
+
+    @classmethod
+    def get_history(cls, room, cursor=None, limit=None):
+        """
+        Page through a room's stored messages, newest first
+
+        Each page continues strictly after the cursor of the previous one,
+        so every page is a range scan on ``chat_room_keyset_idx``.
+
+        Args:
+            room: Room name
+            cursor: ``next_cursor`` of the previous page, None for the first page
+            limit: Page size (capped at HISTORY_MAX_PAGE_SIZE)
+
+        Returns:
+            dict: ``messages``, ``next_cursor`` and ``has_more``
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        limit = cls._page_size(limit)
+        queryset = ChatMessage.objects.filter(room=room)
+
+        if cursor:
+            created_at, message_id = ChatMessage.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, message_id__lt=message_id)
+            )
+
+        rows = list(
+            queryset.select_related('sender').order_by('-created_at', '-message_id')[:limit + 1]
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return {
+            'messages': [message.to_dict() for message in rows],
+            'next_cursor': rows[-1].cursor if rows else cursor,
+            'has_more': has_more,
+        }
+
+    @staticmethod
+    def _recent_version_key(room):
+        return f'chat_recent_version_{room}'
+
+    @staticmethod
+    def _recent_cache_key(room, version):
+        return f'chat_recent_{room}_{version}'
+
+    @classmethod
+    def _recent_cache_timeout(cls):
+        return shared_timeout(cls.RECENT_CACHE_TIMEOUT, cls.RECENT_LOCAL_TIMEOUT)
+
+    @classmethod
+    def _recent_version(cls, room):
+        """Get the current version of a room's recent list, None if it cannot be cached"""
+        key = cls._recent_version_key(room)
+        version = cache.get(key)
+        if version is None:
+            # Time based so that a version lost from the cache is never reused
+            cache.add(key, int(time.time() * 1000), cls._recent_cache_timeout())
+            version = cache.get(key)
+        return version
+
+    @classmethod
+    def get_recent_messages(cls, room):
+        """
+        Get the last messages of a room, oldest first, for replay on connect
+
+        Served from the cache; on a miss the list is loaded once from the
+        database. Messages still waiting in this process's write buffer, or
+        being written, are appended so nothing sent moments ago is missing.
+
+        Args:
+            room: Room name
+
+        Returns:
+            list: Message dictionaries
+        """
+        size = cls.replay_size()
+        # Read the version first: a batch stored from now on moves it past this key
+        version = cls._recent_version(room)
+        key = cls._recent_cache_key(room, version)
+        recent = cache.get(key) if version is not None else None
+
+        if recent is None:
+            rows = ChatMessage.objects.filter(room=room).select_related('sender').order_by(
+                '-created_at', '-message_id'
+            )[:size]
+            recent = [message.to_dict() for message in reversed(rows)]
+            if version is not None:
+                cache.add(key, recent, cls._recent_cache_timeout())
+
+        seen = {message['id'] for message in recent}
+        pending = [message.to_dict() for message in ChatMessageWriter.pending(room)]
+        recent = recent + [message for message in pending if message['id'] not in seen]
+
+        return recent[-size:]
+
+    @classmethod
+    def forget_recent(cls, rooms):
+        """
+        Start a new recent list version for rooms whose messages were just stored
+
+        Rooms without a version have no cached list; their next replay starts
+        a version and loads from the database, which holds these messages.
+        """
+        for room in set(rooms):
+            try:
+                cache.incr(cls._recent_version_key(room))
+            except ValueError:
+                pass
+
+
+class ChatMessageWriter:
+    """
+    Per-process write buffer for chat messages
+
+    Consumers hand messages over with ``add`` instead of saving them one by
+    one. The buffer is written with a single ``bulk_create`` once it holds
+    ``CHAT_WRITE_BATCH_SIZE`` messages or ``CHAT_WRITE_FLUSH_INTERVAL``
+    seconds after the first queued message, whichever comes first.
+
+    A batch that fails to write is put back in front of the buffer and
+    retried with a doubling delay, up to ``CHAT_WRITE_MAX_ATTEMPTS`` times.
+    Consumers flush on disconnect, and whatever is left is written when the
+    process exits.
+    """
+
+    _buffer = []
+    _writing = []  # batches handed to _write and not returned yet
+    _flush_handle = None
+    _failures = 0
+
+    @staticmethod
+    def batch_size():
+        return getattr(settings, 'CHAT_WRITE_BATCH_SIZE', 100)
+
+    @staticmethod
+    def flush_interval():
+        return getattr(settings, 'CHAT_WRITE_FLUSH_INTERVAL', 0.25)
+
+    @staticmethod
+    def max_attempts():
+        return getattr(settings, 'CHAT_WRITE_MAX_ATTEMPTS', 5)
+
+    @classmethod
+    def pending(cls, room):
+        """Messages of a room that are queued or being written"""
+        return [
+            message
+            for batch in [*cls._writing, cls._buffer]
+            for message in batch
+            if message.room == room
+        ]
+
+    @classmethod
+    def _schedule(cls, delay):
+        if cls._flush_handle is None:
+            cls._flush_handle = asyncio.get_running_loop().call_later(
+                delay, lambda: asyncio.ensure_future(cls.flush())
+            )
+
+    @classmethod
+    async def add(cls, message):
+        """Queue a message for the next batched write"""
+        cls._buffer.append(message)
+
+        # While a failed batch waits for its retry, new messages wait with it
+        if len(cls._buffer) >= cls.batch_size() and not cls._failures:
+            await cls.flush()
+        else:
+            cls._schedule(cls.flush_interval())
+
+    @classmethod
+    async def flush(cls):
+        """Write every buffered message, re-queuing them if the write fails"""
+        if cls._flush_handle is not None:
+            cls._flush_handle.cancel()
+            cls._flush_handle = None
+
+        batch, cls._buffer = cls._buffer, []
+        if not batch:
+            return
+
+        cls._writing.append(batch)
+        try:
+            written = await database_sync_to_async(cls._write)(batch)
+        finally:
+            cls._writing = [writing for writing in cls._writing if writing is not batch]
+
+        if written:
+            cls._failures = 0
+            return
+
+        cls._failures += 1
+        if cls._failures >= cls.max_attempts():
+            logger.error(
+                "Chat message batch dropped", extra={'messages': len(batch), 'attempts': cls._failures}
+            )
+            cls._failures = 0
+            return
+
+        cls._buffer = batch + cls._buffer
+        cls._schedule(cls.flush_interval() * 2 ** cls._failures)
+
+    @classmethod
+    def flush_on_exit(cls):
+        """Write the buffered messages synchronously, for process shutdown"""
+        batch, cls._buffer = cls._buffer, []
+        if batch:
+            cls._write(batch)
+
+    @classmethod
+    def _write(cls, batch):
+        """
+        Store a batch in one transaction
+
+        Returns:
+            bool: False if the write failed and nothing was stored
+        """
+        try:
+            with transaction.atomic():
+                ChatMessage.objects.bulk_create(batch, batch_size=cls.batch_size())
+        except Exception:
+            logger.exception("Chat message batch write failed", extra={'messages': len(batch)})
+            # Ids assigned by the rolled back statements are not in the database
+            for message in batch:
+                message.pk = None
+                message._state.adding = True
+            return False
+
+        ChatService.forget_recent(message.room for message in batch)
+        logger.debug("Chat message batch written", extra={'messages': len(batch)})
+        return True
+
+
+atexit.register(ChatMessageWriter.flush_on_exit)
@@ -0,0 +1,279 @@
+from datetime import timedelta
+from unittest import mock
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.models import Student, User
+from teams.models import Team, TeamMembership
+from teams.services import TeamMembershipCache
+from chat.models import ChatMessage
+from chat.routing import websocket_urlpatterns
+from chat.services import ChatMessageWriter, ChatService
+
+
+IN_MEMORY_CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+
+def create_user():
+    user = User.objects.create_user(
+        email='member@test.com',
+        username='member',
+        password='pass123',
+        first_name='Member',
+        last_name='Test',
+        user_type='student'
+    )
+    Student.objects.create(
+        user=user,
+        matricule='MAT0001',
+        enrollment_year=2023,
+        current_year='4siw',
+        academic_status='active'
+    )
+    return user
+
+
+def create_team_room(user):
+    team = Team.objects.create(name='Chat Team', academic_year='4siw')
+    TeamMembership.objects.create(team=team, user=user, role=TeamMembership.ROLE_MEMBER)
+    return team, ChatService.team_room(team.id)
+
+
+def create_messages(room, sender, count):
+    base = timezone.now() - timedelta(hours=1)
+    return ChatMessage.objects.bulk_create([
+        ChatMessage(room=room, sender=sender, content=f'Message {i}', created_at=base + timedelta(seconds=i))
+        for i in range(count)
+    ])
+
+
+class ChatHistoryTests(APITestCase):
+    """Tests for keyset chat history and the recent message cache"""
+
+    def setUp(self):
+        cache.clear()
+        TeamMembershipCache.clear_local()
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.team, self.room = create_team_room(self.user)
+        self.messages = create_messages(self.room, self.user, 5)
+
+    def test_history_pages_newest_first(self):
+        """Test that following next_cursor walks the whole room once"""
+        first = ChatService.get_history(self.room, limit=3)
+        second = ChatService.get_history(self.room, cursor=first['next_cursor'], limit=3)
+
+        contents = [m['message'] for m in first['messages'] + second['messages']]
+        self.assertEqual(contents, [f'Message {i}' for i in range(4, -1, -1)])
+        self.assertTrue(first['has_more'])
+        self.assertFalse(second['has_more'])
+
+    def test_recent_messages_are_cached(self):
+        """Test that a second replay needs no query"""
+        ChatService.get_recent_messages(self.room)
+
+        with self.assertNumQueries(0):
+            recent = ChatService.get_recent_messages(self.room)
+
+        self.assertEqual([m['message'] for m in recent], [f'Message {i}' for i in range(5)])
+
+    @override_settings(CHAT_REPLAY_SIZE=3)
+    def test_recent_cache_is_capped(self):
+        """Test that a stored batch refreshes the cached list, up to the cap"""
+        ChatService.get_recent_messages(self.room)
+        new_message = ChatService.build_message(self.room, self.user, 'Latest')
+        ChatMessageWriter._write([new_message])
+
+        recent = ChatService.get_recent_messages(self.room)
+
+        self.assertEqual([m['message'] for m in recent], ['Message 3', 'Message 4', 'Latest'])
+
+    def test_list_loaded_before_a_write_is_not_served_after_it(self):
+        """Test that a replay list filled late by a slow reader is never read back"""
+        version = ChatService._recent_version(self.room)
+        stale = ChatService.get_recent_messages(self.room)
+        cache.delete(ChatService._recent_cache_key(self.room, version))
+
+        ChatMessageWriter._write([ChatService.build_message(self.room, self.user, 'Latest')])
+        # The slow reader caches what it loaded before the batch committed
+        cache.add(ChatService._recent_cache_key(self.room, version), stale)
+
+        recent = ChatService.get_recent_messages(self.room)
+
+        self.assertEqual(recent[-1]['message'], 'Latest')
+
+    def test_endpoint_returns_history(self):
+        """Test the history endpoint"""
+        url = reverse('chat:chat-message-history', kwargs={'room_name': self.room})
+
+        response = self.client.get(url, {'limit': 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([m['message'] for m in response.data['results']], ['Message 4', 'Message 3'])
+        self.assertTrue(response.data['has_more'])
+
+    def test_endpoint_is_limited_to_team_members(self):
+        """Test that other users and non-team rooms are refused"""
+        other_team = Team.objects.create(name='Other Team', academic_year='4siw')
+
+        for room in (ChatService.team_room(other_team.id), 'general'):
+            url = reverse('chat:chat-message-history', kwargs={'room_name': room})
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS, CHAT_WRITE_BATCH_SIZE=2, PRESENCE_BACKEND='local')
+class ChatConsumerTests(TestCase):
+    """Tests for message persistence and replay through the chat consumer"""
+
+    def setUp(self):
+        cache.clear()
+        TeamMembershipCache.clear_local()
+        self.user = create_user()
+        self.team, self.room = create_team_room(self.user)
+
+    def _communicator(self):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f'/ws/chat/{self.room}/')
+        communicator.scope['user'] = self.user
+        return communicator
+
+    async def test_messages_are_written_in_batches_and_replayed(self):
+        """Test that messages are stored in one batch and replayed to new connections"""
+        communicator = self._communicator()
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        replay = await communicator.receive_json_from()
+        self.assertEqual(replay['messages'], [])
+
+        await communicator.send_json_to({'message': 'Hello'})
+        echoed = await communicator.receive_json_from()
+        self.assertEqual(echoed['message'], 'Hello')
+        self.assertEqual(await ChatMessage.objects.acount(), 0)
+
+        # The second message fills the batch and triggers the write
+        await communicator.send_json_to({'message': 'World'})
+        await communicator.receive_json_from()
+        self.assertEqual(await ChatMessage.objects.acount(), 2)
+        await communicator.disconnect()
+
+        communicator = self._communicator()
+        await communicator.connect()
+        replay = await communicator.receive_json_from()
+        self.assertEqual([m['message'] for m in replay['messages']], ['Hello', 'World'])
+
+        await communicator.send_json_to({'command': 'history', 'limit': 1})
+        history = await communicator.receive_json_from()
+        self.assertEqual([m['message'] for m in history['messages']], ['World'])
+        self.assertTrue(history['has_more'])
+        await communicator.disconnect()
+        await ChatMessageWriter.flush()
+
+    async def test_disconnect_flushes_buffered_messages(self):
+        """Test that a partial batch is stored when its sender disconnects"""
+        communicator = self._communicator()
+        await communicator.connect()
+        await communicator.receive_json_from()
+
+        await communicator.send_json_to({'message': 'Hello'})
+        await communicator.receive_json_from()
+        self.assertEqual(await ChatMessage.objects.acount(), 0)
+        await communicator.disconnect()
+
+        self.assertEqual(await ChatMessage.objects.acount(), 1)
+
+    async def test_failed_batch_is_requeued(self):
+        """Test that a batch that could not be written is kept and retried"""
+        message = ChatService.build_message(self.room, self.user, 'Hello')
+        ChatMessageWriter._buffer.append(message)
+
+        with self.assertLogs('chat.services', 'ERROR'):
+            with mock.patch.object(ChatMessage.objects, 'bulk_create', side_effect=DatabaseError('down')):
+                await ChatMessageWriter.flush()
+        self.assertEqual(ChatMessageWriter.pending(self.room), [message])
+
+        await ChatMessageWriter.flush()
+        self.assertEqual(await ChatMessage.objects.acount(), 1)
+        self.assertEqual(ChatMessageWriter.pending(self.room), [])
+
+    async def test_batch_being_written_stays_pending(self):
+        """Test that replays see a batch while it is being written"""
+        message = ChatService.build_message(self.room, self.user, 'Hello')
+        ChatMessageWriter._buffer.append(message)
+        seen = []
+        write = ChatMessageWriter._write
+
+        def watched_write(batch):
+            seen.extend(ChatMessageWriter.pending(self.room))
+            return write(batch)
+
+        with mock.patch.object(ChatMessageWriter, '_write', side_effect=watched_write):
+            await ChatMessageWriter.flush()
+
+        self.assertEqual(seen, [message])
+        self.assertEqual(ChatMessageWriter.pending(self.room), [])
+
+    async def test_non_members_cannot_connect(self):
+        """Test that a team room refuses users outside the team"""
+        other_team = await Team.objects.acreate(name='Other Team', academic_year='4siw')
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns), f'/ws/chat/{ChatService.team_room(other_team.id)}/'
+        )
+        communicator.scope['user'] = self.user
+
+        connected, _ = await communicator.connect()
+
+        self.assertFalse(connected)
+
+
+class TeamMembershipCacheTests(TestCase):
+    """Tests for the cached team ids of users"""
+
+    def setUp(self):
+        cache.clear()
+        TeamMembershipCache.clear_local()
+        self.user = create_user()
+        self.team, _ = create_team_room(self.user)
+
+    def test_team_ids_are_cached_in_process(self):
+        """Test that repeated lookups need no query"""
+        TeamMembershipCache.get_team_ids(self.user.id)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(TeamMembershipCache.is_member(self.user.id, self.team.id))
+
+    def test_membership_changes_invalidate(self):
+        """Test that joining and leaving a team refresh the cached ids"""
+        other_team = Team.objects.create(name='Other Team', academic_year='4siw')
+        TeamMembershipCache.get_team_ids(self.user.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            membership = TeamMembership.objects.create(team=other_team, user=self.user)
+        self.assertTrue(TeamMembershipCache.is_member(self.user.id, other_team.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            membership.delete()
+        self.assertFalse(TeamMembershipCache.is_member(self.user.id, other_team.id))
+
+
+    def test_process_memory_is_capped(self):
+        """Test that the least recently looked up users are dropped first"""
+        with mock.patch.object(TeamMembershipCache, 'LOCAL_MAX_ENTRIES', 2):
+            for user_id in (self.user.id, self.user.id + 1, self.user.id + 2):
+                TeamMembershipCache.get_team_ids(user_id)
+
+        self.assertIsNone(TeamMembershipCache.get_local(self.user.id))
+        self.assertIsNotNone(TeamMembershipCache.get_local(self.user.id + 2))
+
+    def test_per_process_cache_keeps_entries_no_longer_than_memory(self):
+        """Test that a per-process cache cannot outlive the in-memory timeout"""
+        with mock.patch('teams.services.team_membership_cache.cache') as shared:
+            shared.get.return_value = None
+            TeamMembershipCache.get_team_ids(self.user.id)
+
+        self.assertEqual(shared.set.call_args.args[2], TeamMembershipCache.LOCAL_TIMEOUT)
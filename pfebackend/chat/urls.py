@@ -0,0 +1,10 @@
+from django.urls import path
+from .views import *
+
+
+app_name = 'chat'
+
+
+urlpatterns = [
+    path('chat/rooms/<str:room_name>/messages/', ChatMessageHistoryView.as_view(), name='chat-message-history'),
+]
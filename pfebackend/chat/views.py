@@ -0,0 +1,38 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .services import ChatService
+
+
+class ChatMessageHistoryView(APIView):
+    """
+    Keyset-paginated message history of a chat room, newest first
+    
+    GET /api/chat/rooms/<room_name>/messages/?cursor=<next_cursor>&limit=50
+    
+    Only members of the room's team can read it.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request, room_name):
+        if not ChatService.can_access(request.user, room_name):
+            return Response(
+                {'detail': "You are not a member of this room's team."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        try:
+            page = ChatService.get_history(
+                room_name,
+                cursor=request.query_params.get('cursor'),
+                limit=request.query_params.get('limit')
+            )
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'status': 'success',
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more'],
+            'results': page['messages']
+        })
@@ -0,0 +1,27 @@
+from django.conf import settings
+
+# Cache backends whose entries live in the memory of one process
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_shared_cache(alias='default'):
+    """Whether a cache is shared by every process (web, WebSocket and Celery workers)"""
+    return settings.CACHES.get(alias, {}).get('BACKEND') not in PROCESS_LOCAL_BACKENDS
+
+
+def shared_timeout(timeout, local_timeout):
+    """
+    Timeout of a cache entry that is invalidated by whichever process writes the data
+
+    Args:
+        timeout: Timeout when the cache is shared, so the invalidation reaches every process
+        local_timeout: Timeout when each process has its own cache, which then
+                       bounds how long another process serves a stale entry
+
+    Returns:
+        Timeout in seconds, or None for no expiry
+    """
+    return timeout if is_shared_cache() else local_timeout
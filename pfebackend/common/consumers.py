@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import weakref
+from collections import deque
+from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
+from common import json as fast_json
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedJsonConsumer(AsyncWebsocketConsumer):
+    """
+    WebSocket consumer base class with a bounded, coalescing outbound queue
+
+    Subclasses call ``send_event`` instead of ``send``. Events are queued per
+    connection and a writer task sends them a few milliseconds later
+    (``WEBSOCKET_BATCH_WINDOW``): a lone event is sent as its own JSON frame,
+    several events queued in the same window go out as one
+    ``{"type": "batch", "events": [...]}`` frame.
+
+    The queue holds at most ``WEBSOCKET_OUTBOUND_QUEUE_SIZE`` events. Under
+    pressure:
+    - events with a ``collapse_key`` replace the queued event with the same
+      key instead of being appended (e.g. the latest unread count wins)
+    - low-priority events are dropped, first the incoming one, then queued
+      ones to make room for normal and high-priority events
+    - a client so slow that the queue is full of events that cannot be
+      dropped is disconnected; it catches up on reconnect
+
+    Queue depths and drop counters are available from ``get_queue_stats``.
+    """
+
+    PRIORITY_LOW = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_HIGH = 2
+
+    # Close code sent to clients that cannot keep up
+    CLOSE_CODE_OVERFLOW = 4008
+
+    # Per consumer class counters, see get_queue_stats()
+    _queue_stats = {}
+    _open_queues = weakref.WeakSet()
+
+    @staticmethod
+    def queue_size():
+        return getattr(settings, 'WEBSOCKET_OUTBOUND_QUEUE_SIZE', 256)
+
+    @staticmethod
+    def batch_window():
+        return getattr(settings, 'WEBSOCKET_BATCH_WINDOW', 0.005)
+
+    @staticmethod
+    def max_batch_size():
+        return getattr(settings, 'WEBSOCKET_MAX_BATCH_SIZE', 50)
+
+    def _stats(self):
+        name = type(self).__name__
+        stats = BufferedJsonConsumer._queue_stats.get(name)
+        if stats is None:
+            stats = BufferedJsonConsumer._queue_stats[name] = {
+                'events': 0, 'frames': 0, 'collapsed': 0,
+                'dropped': 0, 'overflows': 0, 'max_depth': 0,
+            }
+        return stats
+
+    def _init_outbound(self):
+        if not hasattr(self, '_outbound'):
+            self._outbound = deque()
+            self._collapsible = {}
+            self._wakeup = asyncio.Event()
+            self._writer = None
+            self._closing = False
+            BufferedJsonConsumer._open_queues.add(self)
+
+    async def send_event(self, payload, priority=PRIORITY_NORMAL, collapse_key=None):
+        """
+        Queue a JSON-serializable event for the client
+
+        Args:
+            payload: Event to send
+            priority: PRIORITY_LOW events may be dropped under pressure
+            collapse_key: Events with the same key replace each other while queued
+        """
+        self._init_outbound()
+        if self._closing:
+            return
+        stats = self._stats()
+
+        if collapse_key is not None and collapse_key in self._collapsible:
+            self._collapsible[collapse_key]['payload'] = payload
+            stats['collapsed'] += 1
+            return
+
+        if len(self._outbound) >= self.queue_size() and not self._make_room(priority):
+            if priority == self.PRIORITY_LOW:
+                stats['dropped'] += 1
+                return
+            stats['overflows'] += 1
+            logger.warning(
+                "WebSocket outbound queue overflow, closing connection",
+                extra={'consumer': type(self).__name__, 'depth': len(self._outbound)}
+            )
+            self._closing = True
+            await self.close(code=self.CLOSE_CODE_OVERFLOW)
+            return
+
+        entry = {'payload': payload, 'priority': priority, 'collapse_key': collapse_key}
+        self._outbound.append(entry)
+        if collapse_key is not None:
+            self._collapsible[collapse_key] = entry
+
+        stats['events'] += 1
+        stats['max_depth'] = max(stats['max_depth'], len(self._outbound))
+
+        if self._writer is None:
+            self._writer = asyncio.ensure_future(self._write_loop())
+        self._wakeup.set()
+
+    def _make_room(self, priority):
+        """Drop the oldest queued low-priority event to fit a more important one"""
+        if priority == self.PRIORITY_LOW:
+            return False
+
+        for entry in self._outbound:
+            if entry['priority'] == self.PRIORITY_LOW:
+                self._outbound.remove(entry)
+                if entry['collapse_key'] is not None:
+                    self._collapsible.pop(entry['collapse_key'], None)
+                self._stats()['dropped'] += 1
+                return True
+        return False
+
+    async def _write_loop(self):
+        """Send queued events, one frame per batch window"""
+        try:
+            while True:
+                await self._wakeup.wait()
+                await asyncio.sleep(self.batch_window())
+
+                payloads = []
+                while self._outbound and len(payloads) < self.max_batch_size():
+                    entry = self._outbound.popleft()
+                    if entry['collapse_key'] is not None:
+                        self._collapsible.pop(entry['collapse_key'], None)
+                    payloads.append(entry['payload'])
+                if not self._outbound:
+                    self._wakeup.clear()
+
+                if payloads:
+                    await self._send_frame(payloads)
+        except asyncio.CancelledError:
+            pass
+
+    async def _send_frame(self, payloads):
+        if len(payloads) == 1:
+            text = fast_json.dumps(payloads[0])
+        else:
+            text = fast_json.dumps({'type': 'batch', 'events': payloads})
+
+        await self.send(text_data=text)
+        self._stats()['frames'] += 1
+
+    async def websocket_disconnect(self, message):
+        """Stop the writer before the usual disconnect handling"""
+        if hasattr(self, '_outbound'):
+            self._closing = True
+            if self._writer is not None:
+                self._writer.cancel()
+            self._outbound.clear()
+            self._collapsible.clear()
+            BufferedJsonConsumer._open_queues.discard(self)
+        await super().websocket_disconnect(message)
+
+    @classmethod
+    def get_queue_stats(cls):
+        """
+        Get the outbound queue metrics of this process
+
+        Returns:
+            dict: ``connections``, current ``queued`` events and the deepest
+                  current queue, plus cumulative counters per consumer class
+                  (events, frames, collapsed, dropped, overflows, max_depth)
+        """
+        depths = [len(consumer._outbound) for consumer in list(cls._open_queues)]
+        return {
+            'connections': len(depths),
+            'queued': sum(depths),
+            'deepest_queue': max(depths) if depths else 0,
+            'consumers': {name: dict(stats) for name, stats in cls._queue_stats.items()},
+        }
+
+    @classmethod
+    def reset_queue_stats(cls):
+        cls._queue_stats.clear()
@@ -0,0 +1,57 @@
+"""
+Fast JSON encoding shared by the REST renderers and the WebSocket consumers.
+
+orjson is used when it is installed, with the standard library as a
+fallback. Both produce the same compact output as DRF's ``JSONRenderer``:
+values orjson does not handle the way DRF does (datetimes, Decimals, lazy
+strings, querysets...) go through DRF's ``JSONEncoder``.
+"""
+import json
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+JSONDecodeError = json.JSONDecodeError
+
+_encoder = JSONEncoder()
+
+if orjson is not None:
+    # Datetimes and dataclass/numpy handling are left to DRF's encoder so the
+    # output matches the stdlib path byte for byte
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def backend():
+    """Name of the JSON implementation in use"""
+    return 'orjson' if orjson is not None else 'json'
+
+
+def dumps_bytes(obj):
+    """Serialize ``obj`` to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_encoder.default, option=_ORJSON_OPTIONS)
+    return json.dumps(obj, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def dumps(obj):
+    """Serialize ``obj`` to a compact JSON string"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_encoder.default, option=_ORJSON_OPTIONS).decode()
+    return json.dumps(obj, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+
+
+def loads(data):
+    """
+    Parse JSON from ``str`` or ``bytes``
+
+    Raises:
+        JSONDecodeError: If the data is not valid JSON (orjson's error is a
+            subclass of the stdlib one)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
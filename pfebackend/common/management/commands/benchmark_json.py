@@ -0,0 +1,83 @@
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from common import json as fast_json
+from common.renderers import FastJSONRenderer
+
+# example usage :
+# python manage.py benchmark_json
+# python manage.py benchmark_json --rows 100 --iterations 2000
+class Command(BaseCommand):
+    help = 'Compare render throughput of the stock JSONRenderer and FastJSONRenderer on a paginated page'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=100,
+            help='Rows in the rendered page',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=1000,
+            help='Renders per renderer',
+        )
+
+    def build_page(self, rows):
+        """A page shaped like the notification list responses"""
+        now = timezone.now()
+        results = [
+            {
+                'id': i,
+                'uuid': uuid.uuid4(),
+                'title': f'Notification {i}',
+                'content': 'Votre équipe a été validée pour la soutenance',
+                'type': 'team_invitation',
+                'status': 'unread',
+                'priority': 'medium',
+                'action_url': f'/teams/{i}/',
+                'metadata': {'team_id': i, 'score': Decimal('15.50'), 'tags': ['a', 'b']},
+                'created_at': now - timedelta(minutes=i),
+                'read_at': None,
+            }
+            for i in range(rows)
+        ]
+        return {
+            'status': 'success',
+            'count': rows,
+            'next': '/api/notifications/?page=2',
+            'previous': None,
+            'results': results,
+        }
+
+    def time_renderer(self, renderer, data, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            renderer.render(data)
+        return time.perf_counter() - start
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        iterations = options['iterations']
+        data = self.build_page(rows)
+
+        stock, fast = JSONRenderer(), FastJSONRenderer()
+        if stock.render(data) != fast.render(data):
+            self.stdout.write(self.style.WARNING('Renderer outputs differ'))
+
+        # Warm up both paths before timing
+        self.time_renderer(stock, data, 10)
+        self.time_renderer(fast, data, 10)
+
+        stock_seconds = self.time_renderer(stock, data, iterations)
+        fast_seconds = self.time_renderer(fast, data, iterations)
+
+        self.stdout.write(f'Backend: {fast_json.backend()}, {rows} rows, {iterations} renders each')
+        self.stdout.write(f'JSONRenderer:     {iterations / stock_seconds:.0f} renders/s')
+        self.stdout.write(f'FastJSONRenderer: {iterations / fast_seconds:.0f} renders/s')
+        self.stdout.write(self.style.SUCCESS(f'Speedup: {stock_seconds / fast_seconds:.2f}x'))
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import threading
+import time
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RedisPresenceBackend:
+    """
+    Presence stored in Redis sets, one set per heartbeat interval
+
+    A heartbeat adds the user to the set of the current interval, which
+    expires shortly after the next one. A user is online while they are in
+    the current or the previous interval's set, so presence lapses one to
+    two intervals after the last heartbeat without any cleanup job.
+    """
+
+    KEY_PREFIX = 'presence'
+
+    def __init__(self, url, interval):
+        self.url = url
+        self.interval = interval
+        self._client = None
+        self._async_clients = {}
+
+    def _client_sync(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url, socket_connect_timeout=0.5, socket_timeout=0.5)
+        return self._client
+
+    def _client_async(self):
+        # redis.asyncio connections belong to the event loop that opened them
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            import redis.asyncio
+            client = redis.asyncio.Redis.from_url(self.url, socket_connect_timeout=0.5, socket_timeout=0.5)
+            self._async_clients[loop] = client
+        return client
+
+    def _keys(self):
+        bucket = int(time.time() // self.interval)
+        return f'{self.KEY_PREFIX}:{bucket}', f'{self.KEY_PREFIX}:{bucket - 1}'
+
+    def heartbeat(self, user_ids):
+        current, _ = self._keys()
+        pipe = self._client_sync().pipeline(transaction=False)
+        pipe.sadd(current, *user_ids)
+        pipe.expire(current, self.interval * 2 + 5)
+        pipe.execute()
+
+    async def aheartbeat(self, user_ids):
+        current, _ = self._keys()
+        pipe = self._client_async().pipeline(transaction=False)
+        pipe.sadd(current, *user_ids)
+        pipe.expire(current, self.interval * 2 + 5)
+        await pipe.execute()
+
+    def online(self, user_ids):
+        current, previous = self._keys()
+        pipe = self._client_sync().pipeline(transaction=False)
+        pipe.smismember(current, user_ids)
+        pipe.smismember(previous, user_ids)
+        in_current, in_previous = pipe.execute()
+        return {
+            user_id
+            for user_id, now, before in zip(user_ids, in_current, in_previous)
+            if now or before
+        }
+
+
+class LocalPresenceBackend:
+    """In-process presence for development and tests, with the same expiry rules"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def heartbeat(self, user_ids):
+        now = time.monotonic()
+        with self._lock:
+            for user_id in user_ids:
+                self._seen[user_id] = now
+
+    async def aheartbeat(self, user_ids):
+        self.heartbeat(user_ids)
+
+    def online(self, user_ids):
+        horizon = time.monotonic() - self.interval * 2
+        with self._lock:
+            return {user_id for user_id in user_ids if self._seen.get(user_id, horizon) > horizon}
+
+    def clear(self):
+        with self._lock:
+            self._seen.clear()
+
+
+class PresenceService:
+    """
+    Service class for tracking which users are connected
+
+    WebSocket consumers send a heartbeat every half
+    ``PRESENCE_HEARTBEAT_INTERVAL`` (see ``PresenceConsumerMixin``); services ask for the online
+    users among many ids at once with ``online_user_ids``, which is one
+    Redis round trip whatever the number of users.
+
+    ``PRESENCE_BACKEND`` selects 'redis' (``PRESENCE_REDIS_URL``) or 'local'
+    (single process). If the presence store cannot be reached, every user
+    is reported online so that nothing relying on presence is lost.
+    """
+
+    _backend = None
+    _backend_config = None
+    _backend_lock = threading.Lock()
+
+    @staticmethod
+    def interval():
+        return getattr(settings, 'PRESENCE_HEARTBEAT_INTERVAL', 30)
+
+    @classmethod
+    def backend(cls):
+        """Get the presence backend for the current settings"""
+        config = (
+            getattr(settings, 'PRESENCE_BACKEND', 'redis'),
+            getattr(settings, 'PRESENCE_REDIS_URL', 'redis://redis:6379/2'),
+            cls.interval(),
+        )
+        if cls._backend_config != config:
+            with cls._backend_lock:
+                if cls._backend_config != config:
+                    name, url, interval = config
+                    if name == 'local':
+                        cls._backend = LocalPresenceBackend(interval)
+                    else:
+                        cls._backend = RedisPresenceBackend(url, interval)
+                    cls._backend_config = config
+        return cls._backend
+
+    @classmethod
+    def heartbeat(cls, user_ids):
+        """Mark users as online for the next heartbeat interval"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        try:
+            cls.backend().heartbeat(user_ids)
+        except Exception as e:
+            logger.warning(f"Presence heartbeat failed: {str(e)}")
+
+    @classmethod
+    async def aheartbeat(cls, user_ids):
+        """Async version of ``heartbeat`` for consumers"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        try:
+            await cls.backend().aheartbeat(user_ids)
+        except Exception as e:
+            logger.warning(f"Presence heartbeat failed: {str(e)}")
+
+    @classmethod
+    def online_user_ids(cls, user_ids):
+        """
+        Get which of the given users are online
+
+        Args:
+            user_ids: Iterable of user ids
+
+        Returns:
+            set: Ids of the online users (all of them if presence is unavailable)
+        """
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return set()
+        try:
+            return cls.backend().online(user_ids)
+        except Exception as e:
+            logger.warning(f"Presence lookup failed, assuming everyone is online: {str(e)}")
+            return set(user_ids)
+
+    @classmethod
+    def is_online(cls, user_id):
+        return user_id in cls.online_user_ids([user_id])
+
+    @classmethod
+    def online_team_member_ids(cls, team_id):
+        """
+        Get the online members of a team
+
+        Costs one query for the member ids and one presence lookup.
+        """
+        from teams.models import TeamMembership
+
+        member_ids = TeamMembership.objects.filter(team_id=team_id).values_list('user_id', flat=True)
+        return cls.online_user_ids(member_ids)
+
+
+class PresenceConsumerMixin:
+    """
+    Keeps the connected user marked online while a WebSocket is open
+
+    Call ``start_presence`` before accepting the connection: it sends the
+    first heartbeat, then starts a task sending one every half interval,
+    so a heartbeat always lands in the current or the next interval's set
+    whatever the store's latency. The task is cancelled when the socket
+    disconnects. Presence lapses on its own within two intervals, so other
+    open tabs of the same user keep them online.
+    """
+
+    async def start_presence(self):
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            return
+        await PresenceService.aheartbeat([user.id])
+        self._presence_task = asyncio.ensure_future(self._presence_loop(user.id))
+
+    async def _presence_loop(self, user_id):
+        try:
+            while True:
+                await asyncio.sleep(PresenceService.interval() / 2)
+                await PresenceService.aheartbeat([user_id])
+        except asyncio.CancelledError:
+            pass
+
+    async def websocket_disconnect(self, message):
+        task = getattr(self, '_presence_task', None)
+        if task is not None:
+            task.cancel()
+        await super().websocket_disconnect(message)
@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more SQL queries than its declared budget"""
+
+
+def query_budget(max_queries):
+    """
+    Declare the maximum number of SQL queries a view may run per request
+
+    Works on function views, view classes and view methods, including
+    viewset actions::
+
+        @query_budget(12)
+        def list(self, request, *args, **kwargs):
+            ...
+
+    ``QueryBudgetMiddleware`` checks the budget on every request.
+
+    Args:
+        max_queries: Number of queries allowed, for all database aliases together
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+def get_query_budget(view_func, method):
+    """
+    Find the budget declared for the view handling a request
+
+    The handler method (or viewset action) wins over its class, which wins
+    over a budget set on the view function itself.
+
+    Returns:
+        int|None: Declared budget, None when the view has none
+    """
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    if view_class is None:
+        return getattr(view_func, 'query_budget', None)
+
+    actions = getattr(view_func, 'actions', None)
+    handler_name = actions.get(method.lower()) if actions else method.lower()
+    handler = getattr(view_class, handler_name, None) if handler_name else None
+
+    budget = getattr(handler, 'query_budget', None)
+    if budget is None:
+        budget = getattr(view_class, 'query_budget', None)
+    return budget
+
+
+class QueryCounter:
+    """Database execute wrapper counting queries, their time and repeated SQL"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        """Queries whose SQL (parameters aside) already ran in this request"""
+        return sum(count - 1 for count in self.statements.values())
+
+    def most_repeated(self, limit=3):
+        return [(sql, count) for sql, count in self.statements.most_common(limit) if count > 1]
+
+
+class QueryBudgetMiddleware:
+    """
+    Counts the SQL queries of every request
+
+    For each request the middleware records the number of queries, the
+    time spent in the database and how many queries repeated a statement
+    already run (the signature of an N+1 pattern):
+    - aggregated per route in process memory, see ``get_route_stats``
+    - as ``X-Query-*`` response headers when ``QUERY_BUDGET_HEADERS`` is on
+    - checked against the budget declared with ``@query_budget``; requests
+      over budget are logged, or raise ``QueryBudgetExceeded`` when
+      ``QUERY_BUDGET_RAISE`` is on (the test runner turns it on)
+    """
+
+    _route_stats = {}
+    _lock = threading.Lock()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return response
+
+        route = f'{request.method} /{match.route}'
+        budget = getattr(request, '_query_budget', None)
+        over_budget = budget is not None and counter.count > budget
+        self.record(route, counter, over_budget)
+
+        if getattr(settings, 'QUERY_BUDGET_HEADERS', False):
+            response['X-Query-Count'] = str(counter.count)
+            response['X-Query-Time-Ms'] = f'{counter.seconds * 1000:.2f}'
+            response['X-Query-Duplicates'] = str(counter.duplicates)
+            if budget is not None:
+                response['X-Query-Budget'] = str(budget)
+
+        if over_budget:
+            message = f"{route} ran {counter.count} queries, its budget is {budget}"
+            if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+                repeated = '\n'.join(f'{count}x {sql}' for sql, count in counter.most_repeated())
+                raise QueryBudgetExceeded(f"{message}\n{repeated}" if repeated else message)
+            logger.warning(
+                message,
+                extra={'route': route, 'queries': counter.count, 'duplicates': counter.duplicates}
+            )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_budget = get_query_budget(view_func, request.method)
+
+    @classmethod
+    def record(cls, route, counter, over_budget):
+        with cls._lock:
+            stats = cls._route_stats.get(route)
+            if stats is None:
+                stats = cls._route_stats[route] = {
+                    'requests': 0, 'queries': 0, 'max_queries': 0,
+                    'db_seconds': 0.0, 'duplicates': 0, 'over_budget': 0,
+                }
+            stats['requests'] += 1
+            stats['queries'] += counter.count
+            stats['max_queries'] = max(stats['max_queries'], counter.count)
+            stats['db_seconds'] += counter.seconds
+            stats['duplicates'] += counter.duplicates
+            stats['over_budget'] += int(over_budget)
+
+    @classmethod
+    def get_route_stats(cls):
+        """
+        Get the query metrics of this process, per route
+
+        Returns:
+            dict: Route ("GET /api/themes/") -> cumulative ``requests``,
+                  ``queries``, ``max_queries``, ``db_seconds``, ``duplicates``
+                  and ``over_budget`` plus ``avg_queries``
+        """
+        with cls._lock:
+            return {
+                route: dict(stats, avg_queries=stats['queries'] / stats['requests'])
+                for route, stats in cls._route_stats.items()
+            }
+
+    @classmethod
+    def reset_route_stats(cls):
+        with cls._lock:
+            cls._route_stats.clear()
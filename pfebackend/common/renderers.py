@@ -0,0 +1,29 @@
+from rest_framework.renderers import JSONRenderer
+from common import json as fast_json
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by ``common.json`` (orjson when available).
+
+    Compact responses take the fast path; indented output (browsable API,
+    ``?indent=`` media type parameter) and non-default DRF JSON settings
+    fall back to the stock renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (
+            self.get_indent(accepted_media_type, renderer_context) is not None
+            or self.ensure_ascii or not self.compact
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = fast_json.dumps_bytes(data)
+        # Same strict javascript subset guarantee as JSONRenderer
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext, override_settings
+
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class QueryBudgetTestRunner(DiscoverRunner):
+    """
+    Test runner that fails requests running over their view's query budget
+
+    Turns ``QUERY_BUDGET_RAISE`` on, so ``QueryBudgetMiddleware`` raises
+    ``QueryBudgetExceeded`` and the test client re-raises it in the test.
+    Tests run in one process against an in-memory cache, without Redis.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.QUERY_BUDGET_RAISE = True
+        self._caches = override_settings(CACHES=TEST_CACHES)
+        self._caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._caches.disable()
+        super().teardown_test_environment(**kwargs)
+
+
+class QueryCountAssertionsMixin:
+    """
+    Test case mixin for catching N+1 queries
+
+    ``assertConstantQueries`` runs an endpoint, adds rows, runs it again and
+    fails if the second run needed more queries: a list endpoint that loads
+    its relations in bulk costs the same whatever the number of rows.
+    """
+
+    def capture_queries(self, func):
+        """
+        Run ``func`` and record the queries it executes
+
+        Returns:
+            tuple: ``func``'s result and the list of executed queries
+        """
+        with CaptureQueriesContext(connection) as context:
+            result = func()
+        return result, context.captured_queries
+
+    def assertConstantQueries(self, func, grow, msg=None):
+        """
+        Assert ``func`` runs as many queries after ``grow`` added rows as before
+
+        ``func`` is called once beforehand so that per-process caches are warm
+        for both measured runs.
+
+        Args:
+            func: Callable hitting the code under test, e.g. a client request
+            grow: Callable creating more of the rows ``func`` lists
+            msg: Optional message prefix for failures
+        """
+        func()
+        _, before = self.capture_queries(func)
+        grow()
+        _, after = self.capture_queries(func)
+
+        if len(after) > len(before):
+            statements = '\n'.join(query['sql'] for query in after)
+            self.fail(self._formatMessage(
+                msg,
+                f'{len(before)} queries before adding rows, {len(after)} after:\n{statements}'
+            ))
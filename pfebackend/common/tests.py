@@ -6,6 +6,9 @@ from rest_framework.test import APITestCase
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.response import Response
 from django.utils import timezone
+from django.test import SimpleTestCase, override_settings
+from channels.testing import WebsocketCommunicator
+from common.consumers import BufferedJsonConsumer
 
 # Create a test model that uses TimeStampedModel
 class TestModel(TimeStampedModel):
@@ -81,4 +84,262 @@ class StaticPaginationTests(APITestCase):
         
         response = self.viewset.paginator.get_paginated_response([])
         self.assertEqual(len(response.data['results']), 0)
-        self.assertEqual(response.data['count'], 0)
\ No newline at end of file
+        self.assertEqual(response.data['count'], 0)
+
+
+class BurstConsumer(BufferedJsonConsumer):
+    """Consumer sending a burst of events for each received message"""
+
+    async def connect(self):
+        await self.accept()
+
+    async def receive(self, text_data):
+        for i in range(5):
+            await self.send_event({'type': 'event', 'index': i})
+        for count in range(3):
+            await self.send_event(
+                {'type': 'unread_count', 'count': count},
+                priority=self.PRIORITY_LOW, collapse_key='unread_count'
+            )
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class BufferedJsonConsumerTests(SimpleTestCase):
+    """Tests for the coalescing outbound queue of WebSocket consumers"""
+
+    def setUp(self):
+        BufferedJsonConsumer.reset_queue_stats()
+
+    async def _burst(self):
+        communicator = WebsocketCommunicator(BurstConsumer.as_asgi(), '/ws/test/')
+        await communicator.connect()
+        await communicator.send_to(text_data='go')
+        frame = await communicator.receive_json_from()
+        await communicator.disconnect()
+        return frame
+
+    async def test_burst_is_sent_as_one_frame(self):
+        """Test that events queued in one window share a frame and counts collapse"""
+        frame = await self._burst()
+
+        self.assertEqual(frame['type'], 'batch')
+        self.assertEqual([event['index'] for event in frame['events'][:5]], list(range(5)))
+        self.assertEqual(frame['events'][5:], [{'type': 'unread_count', 'count': 2}])
+        stats = BufferedJsonConsumer.get_queue_stats()['consumers']['BurstConsumer']
+        self.assertEqual((stats['frames'], stats['collapsed']), (1, 2))
+
+    @override_settings(WEBSOCKET_OUTBOUND_QUEUE_SIZE=5)
+    async def test_low_priority_events_are_dropped_when_full(self):
+        """Test that a full queue drops low-priority events first"""
+        frame = await self._burst()
+
+        self.assertEqual(len(frame['events']), 5)
+        self.assertTrue(all(event['type'] == 'event' for event in frame['events']))
+        self.assertEqual(BufferedJsonConsumer.get_queue_stats()['consumers']['BurstConsumer']['dropped'], 3)
+
+    @override_settings(WEBSOCKET_OUTBOUND_QUEUE_SIZE=3)
+    async def test_overflowing_client_is_disconnected(self):
+        """Test that a queue full of undroppable events closes the connection"""
+        communicator = WebsocketCommunicator(BurstConsumer.as_asgi(), '/ws/test/')
+        await communicator.connect()
+        await communicator.send_to(text_data='go')
+
+        output = await communicator.receive_output()
+
+        self.assertEqual(output, {'type': 'websocket.close', 'code': BufferedJsonConsumer.CLOSE_CODE_OVERFLOW})
+        self.assertEqual(BufferedJsonConsumer.get_queue_stats()['consumers']['BurstConsumer']['overflows'], 1)
+
+
+
+class FastJSONTests(SimpleTestCase):
+    """FastJSONRenderer/FastJSONParser must behave exactly like DRF's JSON classes"""
+
+    def sample(self):
+        import uuid
+        from decimal import Decimal
+        from django.utils.translation import gettext_lazy
+        return {
+            'status': 'success',
+            'created_at': timezone.now(),
+            'date': timezone.now().date(),
+            'amount': Decimal('12.50'),
+            'uuid': uuid.uuid4(),
+            'label': gettext_lazy('Name'),
+            'text': 'équipe   ✓',
+            'tags': {'a'},
+            'nested': {1: [1, 2.5, None, True]},
+        }
+
+    def test_renderer_matches_drf(self):
+        from rest_framework.renderers import JSONRenderer
+        from common.renderers import FastJSONRenderer
+
+        data = self.sample()
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_renderer_indent_falls_back(self):
+        from rest_framework.renderers import JSONRenderer
+        from common.renderers import FastJSONRenderer
+
+        data = self.sample()
+        media_type = 'application/json; indent=2'
+        self.assertEqual(
+            FastJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type)
+        )
+
+    def test_stdlib_fallback(self):
+        from unittest import mock
+        from rest_framework.renderers import JSONRenderer
+        from common import json as fast_json
+        from common.renderers import FastJSONRenderer
+
+        data = self.sample()
+        with mock.patch.object(fast_json, 'orjson', None):
+            self.assertEqual(fast_json.backend(), 'json')
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+            self.assertEqual(fast_json.loads('{"a": [1]}'), {'a': [1]})
+
+    def test_parser_round_trip(self):
+        import io
+        from common.parsers import FastJSONParser
+
+        stream = io.BytesIO('{"title": "équipe", "ids": [1, 2]}'.encode())
+        self.assertEqual(FastJSONParser().parse(stream), {'title': 'équipe', 'ids': [1, 2]})
+
+    def test_parser_rejects_invalid_json(self):
+        import io
+        from rest_framework.exceptions import ParseError
+        from common.parsers import FastJSONParser
+
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"title": '))
+
+    def test_loads_error_is_json_decode_error(self):
+        from common import json as fast_json
+
+        with self.assertRaises(fast_json.JSONDecodeError):
+            fast_json.loads('not json')
+
+
+# Views and routes for QueryBudgetMiddlewareTests
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from django.urls import path
+from rest_framework.views import APIView
+from rest_framework.viewsets import ViewSet
+from rest_framework.permissions import AllowAny
+from common.query_budget import (
+    QueryBudgetExceeded, QueryBudgetMiddleware, get_query_budget, query_budget
+)
+
+
+def run_user_lookups(count):
+    for user_id in range(count):
+        get_user_model().objects.filter(id=user_id).exists()
+
+
+@query_budget(2)
+def lookups_view(request, count):
+    run_user_lookups(count)
+    return JsonResponse({'count': count})
+
+
+@query_budget(5)
+class BudgetAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    @query_budget(1)
+    def get(self, request):
+        run_user_lookups(3)
+        return Response({'status': 'success'})
+
+    def post(self, request):
+        run_user_lookups(3)
+        return Response({'status': 'success'})
+
+
+class BudgetViewSet(ViewSet):
+    permission_classes = [AllowAny]
+
+    @query_budget(4)
+    def list(self, request):
+        return Response([])
+
+
+urlpatterns = [
+    path('lookups/<int:count>/', lookups_view),
+    path('budget/', BudgetAPIView.as_view()),
+    path('viewset/', BudgetViewSet.as_view({'get': 'list'})),
+]
+
+
+@override_settings(ROOT_URLCONF='common.tests', QUERY_BUDGET_HEADERS=True, QUERY_BUDGET_RAISE=True)
+class QueryBudgetMiddlewareTests(TestCase):
+    def setUp(self):
+        QueryBudgetMiddleware.reset_route_stats()
+
+    def test_headers(self):
+        response = self.client.get('/lookups/2/')
+
+        self.assertEqual(response['X-Query-Count'], '2')
+        self.assertEqual(response['X-Query-Duplicates'], '1')
+        self.assertEqual(response['X-Query-Budget'], '2')
+        self.assertIn('X-Query-Time-Ms', response)
+
+    @override_settings(QUERY_BUDGET_HEADERS=False)
+    def test_no_headers_when_disabled(self):
+        response = self.client.get('/lookups/1/')
+        self.assertNotIn('X-Query-Count', response)
+
+    def test_over_budget_raises(self):
+        with self.assertRaises(QueryBudgetExceeded) as context:
+            self.client.get('/lookups/3/')
+        self.assertIn('ran 3 queries, its budget is 2', str(context.exception))
+
+    @override_settings(QUERY_BUDGET_RAISE=False)
+    def test_over_budget_logs_without_raise(self):
+        with self.assertLogs('common.query_budget', level='WARNING'):
+            response = self.client.get('/lookups/3/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_method_budget_wins_over_class_budget(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/budget/')
+
+        response = self.client.post('/budget/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Query-Budget'], '5')
+
+    def test_viewset_action_budget(self):
+        view = BudgetViewSet.as_view({'get': 'list'})
+        self.assertEqual(get_query_budget(view, 'GET'), 4)
+        self.assertIsNone(get_query_budget(lambda request: None, 'GET'))
+
+    def test_route_stats(self):
+        self.client.get('/lookups/1/')
+        self.client.get('/lookups/2/')
+
+        stats = QueryBudgetMiddleware.get_route_stats()['GET /lookups/<int:count>/']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['queries'], 3)
+        self.assertEqual(stats['max_queries'], 2)
+        self.assertEqual(stats['duplicates'], 1)
+        self.assertEqual(stats['over_budget'], 0)
+        self.assertEqual(stats['avg_queries'], 1.5)
+
+
+class SharedCacheTimeoutTests(SimpleTestCase):
+    """Entries invalidated across processes must expire quickly without a shared cache"""
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}})
+    def test_shared_cache_keeps_long_timeout(self):
+        from common.cache import shared_timeout
+
+        self.assertEqual(shared_timeout(3600, 30), 3600)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_per_process_cache_uses_local_timeout(self):
+        from common.cache import shared_timeout
+
+        self.assertEqual(shared_timeout(3600, 30), 30)
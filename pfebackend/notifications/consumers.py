@@ -1,15 +1,19 @@
 # notifications/consumers.py
-import json
-from channels.generic.websocket import AsyncWebsocketConsumer
+from common import json as fast_json
+from common.consumers import BufferedJsonConsumer
+from common.presence import PresenceConsumerMixin
 from channels.db import database_sync_to_async
 from django.contrib.auth.models import User
 from .models import Notification
 from .services import NotificationService
 
 
-class NotificationConsumer(AsyncWebsocketConsumer):
+class NotificationConsumer(PresenceConsumerMixin, BufferedJsonConsumer):
     """
     WebSocket consumer for handling real-time notifications
+
+    Events go through the outbound queue of ``BufferedJsonConsumer``, so a
+    burst of notifications reaches the client in a few batched frames.
     """
     async def connect(self):
         """Handle WebSocket connection"""
@@ -29,6 +33,8 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
         
+        # Mark the user online before any push can target this socket
+        await self.start_presence()
         await self.accept()
         
         # Send any pending notifications
@@ -48,36 +54,63 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         Handle incoming WebSocket messages from client
         """
         try:
-            data = json.loads(text_data)
+            data = fast_json.loads(text_data)
             command = data.get('command', None)
             
             if command == 'mark_read':
                 notification_id = data.get('notification_id')
                 success = await self._mark_notification_read(notification_id)
                 
-                await self.send(text_data=json.dumps({
+                await self.send_event({
                     'type': 'notification_marked_read',
                     'notification_id': notification_id,
                     'success': success
-                }))
+                })
             
             elif command == 'mark_all_read':
                 count = await self._mark_all_notifications_read()
                 
-                await self.send(text_data=json.dumps({
+                await self.send_event({
                     'type': 'all_notifications_marked_read',
                     'count': count
-                }))
+                })
                 
             elif command == 'archive_notification':
                 notification_id = data.get('notification_id')
                 success = await self._archive_notification(notification_id)
                 
-                await self.send(text_data=json.dumps({
+                await self.send_event({
                     'type': 'notification_archived',
                     'notification_id': notification_id,
                     'success': success
-                }))
+                })
+                
+            elif command == 'get_unread_count':
+                count = await self._get_unread_count()
+                
+                # Only the latest count matters, so queued counts collapse
+                await self.send_event({
+                    'type': 'unread_count',
+                    'count': count
+                }, priority=self.PRIORITY_LOW, collapse_key='unread_count')
+                
+            elif command == 'sync_since':
+                try:
+                    page = await self._get_notifications_since(data.get('cursor'), data.get('limit'))
+                except ValueError as e:
+                    await self.send_event({
+                        'type': 'error',
+                        'message': str(e)
+                    })
+                    return
+                
+                await self.send_event({
+                    'type': 'sync',
+                    'notifications': page['notifications'],
+                    'count': len(page['notifications']),
+                    'cursor': page['next_cursor'],
+                    'has_more': page['has_more']
+                })
                 
             elif command == 'respond_to_invitation':
                 invitation_id = data.get('invitation_id')
@@ -99,20 +132,20 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 if result:
                     response_data.update(result)
                 
-                await self.send(text_data=json.dumps(response_data))
+                await self.send_event(response_data)
             
             # You can add more commands here
                 
-        except json.JSONDecodeError:
-            await self.send(text_data=json.dumps({
+        except fast_json.JSONDecodeError:
+            await self.send_event({
                 'type': 'error',
                 'message': 'Invalid JSON format'
-            }))
+            })
         except Exception as e:
-            await self.send(text_data=json.dumps({
+            await self.send_event({
                 'type': 'error',
                 'message': str(e)
-            }))
+            })
     
     # Channel layer message handlers
     async def notification_message(self, event):
@@ -120,10 +153,10 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         Handle notification messages from the channel layer
         and send them to the WebSocket client
         """
-        await self.send(text_data=json.dumps({
+        await self.send_event({
             'type': 'notification',
             'notification': event['notification']
-        }))
+        })
     
     # Database operation wrappers
     @database_sync_to_async
@@ -141,6 +174,16 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         """Archive a notification"""
         return NotificationService.archive_notification(self.user, notification_id)
     
+    @database_sync_to_async
+    def _get_unread_count(self):
+        """Get the number of unread notifications"""
+        return NotificationService.get_unread_count(self.user)
+    
+    @database_sync_to_async
+    def _get_notifications_since(self, cursor, limit):
+        """Get one page of the notifications created after cursor"""
+        return NotificationService.get_notifications_since(self.user, cursor, limit=limit)
+    
     @database_sync_to_async
     def _get_pending_notifications(self):
         """Get pending notifications"""
@@ -150,8 +193,8 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         """Send pending notifications when a client connects"""
         notifications = await self._get_pending_notifications()
         if notifications:
-            await self.send(text_data=json.dumps({
+            await self.send_event({
                 'type': 'pending_notifications',
                 'notifications': notifications,
                 'count': len(notifications)
-            }))
\ No newline at end of file
+            })
\ No newline at end of file
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+from notifications.services import NotificationRetentionService
+
+# example usage :
+# python manage.py prune_notifications
+# python manage.py prune_notifications --days 90 --mode delete --batch-size 5000 --dry-run
+class Command(BaseCommand):
+    help = 'Archive or delete read/archived notifications older than the retention age'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Retention age in days (defaults to NOTIFICATION_RETENTION_DAYS)',
+        )
+        parser.add_argument(
+            '--mode',
+            choices=NotificationRetentionService.MODES,
+            default=None,
+            help='Move rows to the archive table or delete them (defaults to NOTIFICATION_RETENTION_MODE)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Rows moved per transaction (defaults to NOTIFICATION_RETENTION_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            default=None,
+            help='Stop after this many batches',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the notifications that would be pruned',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            result = NotificationRetentionService.prune(
+                days=options['days'],
+                mode=options['mode'],
+                batch_size=options['batch_size'],
+                max_batches=options['max_batches'],
+                dry_run=options['dry_run'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if result['dry_run']:
+            self.stdout.write(self.style.WARNING(
+                f"DRY RUN: {result['rows']} notifications older than "
+                f"{result['cutoff']:%Y-%m-%d} would be {result['mode']}d"
+            ))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['rows']} notifications {result['mode']}d in {result['batches']} batches "
+            f"({result['seconds']:.2f}s, {result['rows_per_second']} rows/s)"
+        ))
@@ -1,4 +1,6 @@
 # notifications/models.py
+import base64
+from datetime import datetime
 from django.db import models
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
@@ -34,6 +36,16 @@ class Notification(TimeStampedModel):
         ('archived', 'Archived'),
     )
     
+    DELIVERY_PENDING = 'pending'
+    DELIVERY_DELIVERED = 'delivered'
+    DELIVERY_FAILED = 'failed'
+    
+    DELIVERY_STATUS_CHOICES = (
+        (DELIVERY_PENDING, 'Pending'),
+        (DELIVERY_DELIVERED, 'Delivered'),
+        (DELIVERY_FAILED, 'Failed'),
+    )
+    
     recipient = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
         on_delete=models.CASCADE, 
@@ -100,11 +112,77 @@ class Notification(TimeStampedModel):
         help_text="Additional data for notification rendering and behavior"
     )
     
+    # WebSocket delivery tracking, only used in outbox delivery mode
+    delivery_status = models.CharField(
+        max_length=10,
+        choices=DELIVERY_STATUS_CHOICES,
+        null=True,
+        blank=True,
+        help_text="Outbox delivery state; empty when pushed directly"
+    )
+    
+    delivery_attempts = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Number of failed WebSocket delivery attempts"
+    )
+    
+    next_attempt_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Earliest time of the next outbox delivery attempt"
+    )
+    
+    delivered_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the outbox pushed the notification"
+    )
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Unread/pending lookups, mark-all-read and the unread badge count
+            models.Index(fields=['recipient', 'status', 'created_at'], name='notif_recipient_status_idx'),
+            # Per-type listings
+            models.Index(fields=['recipient', 'type'], name='notif_recipient_type_idx'),
+            # Keyset history and sync on (created_at, id)
+            models.Index(fields=['recipient', 'created_at', 'id'], name='notif_recipient_keyset_idx'),
+            models.Index(fields=['delivery_status', 'next_attempt_at'], name='notif_outbox_idx'),
+            # Retention scans by age
+            models.Index(fields=['created_at'], name='notif_created_idx'),
+        ]
         
     def __str__(self):
         return f"{self.recipient.username}: {self.content[:50]}"
+    
+    @property
+    def cursor(self):
+        """Opaque position of the notification in a user's history"""
+        return self.encode_cursor(self.created_at, self.id)
+    
+    @staticmethod
+    def encode_cursor(created_at, notification_id):
+        """Encode a (created_at, id) keyset position as an opaque string"""
+        raw = f"{created_at.isoformat()}|{notification_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+    
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        Decode a cursor made by ``encode_cursor``
+        
+        Returns:
+            tuple: (created_at, id)
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            created_at, notification_id = raw.rsplit('|', 1)
+            return datetime.fromisoformat(created_at), int(notification_id)
+        except (AttributeError, TypeError, ValueError, UnicodeDecodeError):
+            raise ValueError("Invalid cursor")
         
     def to_dict(self):
         """
@@ -120,5 +198,42 @@ class Notification(TimeStampedModel):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'priority': self.priority,
             'action_url': self.action_url,
-            'metadata': self.metadata
-        }
\ No newline at end of file
+            'metadata': self.metadata,
+            'cursor': self.cursor
+        }
+
+
+class ArchivedNotification(models.Model):
+    """
+    Compact copy of a read or archived notification moved out of the hot
+    notifications table by the retention job.
+    
+    Only the fields needed to show a user's old notifications are kept, and
+    the table carries a single index besides its primary key.
+    """
+    original_id = models.BigIntegerField(
+        help_text="ID the notification had in the notifications table"
+    )
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_notifications',
+        db_index=False
+    )
+    title = models.CharField(max_length=255, blank=True)
+    content = models.TextField()
+    type = models.CharField(max_length=20)
+    status = models.CharField(max_length=10)
+    priority = models.CharField(max_length=10)
+    action_url = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', 'created_at'], name='archived_notif_recipient_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.recipient_id}: {self.content[:50]} (archived)"
@@ -1,8 +1,20 @@
 # notifications/services.py
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+import asyncio
+import threading
+import time
+import uuid
+from datetime import timedelta
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from .models import Notification
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from common.cache import shared_timeout
+from common.presence import PresenceService
+from .models import ArchivedNotification, Notification
 from django.template.loader import render_to_string
 from django.utils.html import escape
 import logging
@@ -12,8 +24,46 @@ logger = logging.getLogger(__name__)
 class NotificationService:
     """
     Service class for notification-related operations
+
+    Delivery has a single path: notifications are stored first, then
+    ``deliver`` schedules one WebSocket push per notification with
+    ``transaction.on_commit``, so rolled-back rows are never pushed.
+
+    With ``NOTIFICATION_DELIVERY_MODE = 'outbox'`` nothing is pushed from the
+    caller: rows are stored as pending and the ``drain_notification_outbox``
+    Celery task pushes them in batches, retrying failures with exponential
+    backoff (at-least-once delivery).
     """
+
+    DELIVERY_MODE_DIRECT = 'direct'
+    DELIVERY_MODE_OUTBOX = 'outbox'
+
+    # Seconds an unread count stays cached; writes invalidate it sooner. Celery
+    # workers invalidate the counts through the shared cache; with a per-process
+    # cache, counts are kept UNREAD_COUNT_LOCAL_TIMEOUT seconds only
+    UNREAD_COUNT_CACHE_TIMEOUT = 300
+    UNREAD_COUNT_LOCAL_TIMEOUT = 5
+
+    # Page sizes for keyset history and sync
+    HISTORY_PAGE_SIZE = 20
+    HISTORY_MAX_PAGE_SIZE = 100
+
+    # Per-process delivery counters, see get_delivery_stats()
+    _delivery_stats = {'notifications': 0, 'pushes': 0, 'failed_pushes': 0, 'skipped_offline': 0}
+    _delivery_stats_lock = threading.Lock()
     
+    @classmethod
+    def outbox_enabled(cls):
+        """Whether notifications are delivered through the outbox"""
+        return getattr(settings, 'NOTIFICATION_DELIVERY_MODE', cls.DELIVERY_MODE_DIRECT) == cls.DELIVERY_MODE_OUTBOX
+
+    @classmethod
+    def _delivery_fields(cls):
+        """Initial delivery tracking values for new notifications"""
+        if cls.outbox_enabled():
+            return {'delivery_status': Notification.DELIVERY_PENDING, 'next_attempt_at': timezone.now()}
+        return {}
+
     @staticmethod
     def create_notification(recipient, content, notification_type, related_object=None, 
                            title="", priority='medium', action_url='', metadata=None):
@@ -50,9 +100,12 @@ class NotificationService:
                 object_id=object_id,
                 priority=priority,
                 action_url=action_url,
-                metadata=metadata or {}
+                metadata=metadata or {},
+                **NotificationService._delivery_fields()
             )
             
+            NotificationService._count(notifications=1)
+            NotificationService._invalidate_unread_counts([recipient.id])
             return notification
             
         except Exception as e:
@@ -62,7 +115,10 @@ class NotificationService:
     @staticmethod
     def send_notification(notification):
         """
-        Send a notification via WebSocket
+        Send a notification via WebSocket right away
+        
+        Callers should normally use ``deliver``, which waits for the
+        surrounding transaction to commit.
         
         Args:
             notification: Notification instance to send
@@ -77,16 +133,18 @@ class NotificationService:
             
             # Send to user's notification group
             async_to_sync(channel_layer.group_send)(
-                f"user_{notification.recipient.id}_notifications",
+                f"user_{notification.recipient_id}_notifications",
                 {
                     'type': 'notification_message',
                     'notification': notification_data
                 }
             )
             
+            NotificationService._count(pushes=1)
             return True
             
         except Exception as e:
+            NotificationService._count(failed_pushes=1)
             logger.error(f"Error sending notification: {str(e)}")
             return False
     
@@ -105,10 +163,319 @@ class NotificationService:
         )
         
         if notification:
-            NotificationService.send_notification(notification)
+            NotificationService.deliver([notification])
             
         return notification
     
+    @staticmethod
+    def create_notifications_bulk(recipients, content, notification_type, related_object=None,
+                                  title="", priority='medium', action_url='', metadata=None):
+        """
+        Create the same notification for several recipients with one INSERT
+
+        The content type of ``related_object`` is resolved once and duplicate
+        recipients are skipped, keeping the first occurrence.
+
+        Args:
+            recipients: Iterable of users receiving the notification
+            content: Text content of the notification
+            notification_type: Type of notification
+            related_object: Optional related Django model instance
+            title: Optional title for the notification
+            priority: Priority level (low, medium, high)
+            action_url: URL for action button
+            metadata: Additional data for rendering
+
+        Returns:
+            list: The created notification instances
+        """
+        try:
+            content_type = None
+            object_id = None
+
+            if related_object:
+                content_type = ContentType.objects.get_for_model(related_object)
+                object_id = related_object.id
+
+            delivery_fields = NotificationService._delivery_fields()
+            notifications = []
+            seen = set()
+            for recipient in recipients:
+                if recipient is None or recipient.id in seen:
+                    continue
+                seen.add(recipient.id)
+                notifications.append(Notification(
+                    recipient=recipient,
+                    title=title,
+                    content=content,
+                    type=notification_type,
+                    content_type=content_type,
+                    object_id=object_id,
+                    priority=priority,
+                    action_url=action_url,
+                    metadata=dict(metadata or {}),
+                    **delivery_fields
+                ))
+
+            if not notifications:
+                return []
+
+            notifications = Notification.objects.bulk_create(notifications)
+            NotificationService._count(notifications=len(notifications))
+            NotificationService._invalidate_unread_counts(seen)
+            return notifications
+
+        except Exception as e:
+            logger.error(f"Error creating notifications in bulk: {str(e)}")
+            return []
+
+    @staticmethod
+    def send_notifications_bulk(notifications):
+        """
+        Send several notifications via WebSocket in one async batch
+
+        All ``group_send`` calls run concurrently inside a single event loop
+        hop instead of one ``async_to_sync`` round-trip per notification.
+
+        Args:
+            notifications: Notification instances to send
+
+        Returns:
+            int: Number of notifications sent successfully
+        """
+        if not notifications:
+            return 0
+
+        results = NotificationService._push(notifications)
+        return sum(1 for result in results if not isinstance(result, Exception))
+
+    @staticmethod
+    def _push(notifications):
+        """
+        Run one ``group_send`` per notification concurrently.
+
+        With ``PRESENCE_SKIP_OFFLINE_PUSHES``, recipients without an open
+        WebSocket are skipped (one bulk presence lookup); they get their
+        notifications from the database when they connect, so a skipped
+        push counts as a success.
+
+        Returns:
+            list: For each notification, None or the exception raised
+        """
+        results = [None] * len(notifications)
+        to_push = list(range(len(notifications)))
+
+        if getattr(settings, 'PRESENCE_SKIP_OFFLINE_PUSHES', False):
+            online = PresenceService.online_user_ids(
+                notification.recipient_id for notification in notifications
+            )
+            to_push = [index for index in to_push if notifications[index].recipient_id in online]
+            NotificationService._count(skipped_offline=len(notifications) - len(to_push))
+
+        if not to_push:
+            return results
+
+        try:
+            channel_layer = get_channel_layer()
+
+            async def push_all():
+                return await asyncio.gather(
+                    *[
+                        channel_layer.group_send(
+                            f"user_{notifications[index].recipient_id}_notifications",
+                            {
+                                'type': 'notification_message',
+                                'notification': notifications[index].to_dict()
+                            }
+                        )
+                        for index in to_push
+                    ],
+                    return_exceptions=True
+                )
+
+            pushed = async_to_sync(push_all)()
+
+        except Exception as e:
+            logger.error(f"Error sending notifications in bulk: {str(e)}")
+            pushed = [e] * len(to_push)
+
+        for index, result in zip(to_push, pushed):
+            results[index] = result
+
+        failures = [result for result in pushed if isinstance(result, Exception)]
+        for failure in failures:
+            logger.error(f"Error sending notification: {str(failure)}")
+
+        NotificationService._count(
+            pushes=len(to_push) - len(failures),
+            failed_pushes=len(failures)
+        )
+        return results
+
+    @staticmethod
+    def create_and_send_bulk(recipients, content, notification_type, related_object=None,
+                             title="", priority='medium', action_url='', metadata=None):
+        """
+        Create the same notification for several recipients and send them via WebSocket
+
+        Costs a constant number of queries whatever the number of recipients.
+
+        Returns:
+            list: The created notifications (empty if creation failed)
+        """
+        notifications = NotificationService.create_notifications_bulk(
+            recipients, content, notification_type, related_object,
+            title, priority, action_url, metadata
+        )
+
+        if notifications:
+            NotificationService.deliver(notifications)
+
+        return notifications
+
+    @staticmethod
+    def deliver(notifications):
+        """
+        Push stored notifications via WebSocket once the current transaction commits
+
+        Outside of a transaction the push happens immediately. Each
+        notification is pushed exactly once; nothing is sent for rows whose
+        transaction is rolled back.
+
+        In outbox mode the rows are already pending; the outbox worker is
+        only woken up early when ``NOTIFICATION_OUTBOX_KICK`` is enabled.
+
+        Args:
+            notifications: Notification instances to push
+        """
+        notifications = [notification for notification in notifications if notification]
+        if not notifications:
+            return
+
+        if NotificationService.outbox_enabled():
+            if getattr(settings, 'NOTIFICATION_OUTBOX_KICK', False):
+                transaction.on_commit(NotificationService._kick_outbox)
+            return
+
+        transaction.on_commit(lambda: NotificationService.send_notifications_bulk(notifications))
+
+    @staticmethod
+    def _kick_outbox():
+        """Ask a Celery worker to drain the outbox now instead of at the next beat"""
+        from .tasks import drain_notification_outbox
+
+        try:
+            drain_notification_outbox.delay()
+        except Exception as e:
+            # The periodic drain will pick the rows up anyway
+            logger.warning(f"Could not schedule notification outbox drain: {str(e)}")
+
+    @classmethod
+    def drain_outbox(cls, batch_size=None, max_attempts=None):
+        """
+        Push one batch of pending notifications from the outbox
+
+        Due rows are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` (where
+        supported) so several workers can drain in parallel. Delivered rows
+        are marked in one UPDATE; failed rows are rescheduled with
+        exponential backoff and given up on after ``max_attempts``.
+
+        Args:
+            batch_size: Maximum number of notifications to push
+            max_attempts: Attempts before a notification is marked failed
+
+        Returns:
+            dict: Number of notifications claimed, delivered, retried and failed
+        """
+        batch_size = batch_size or getattr(settings, 'NOTIFICATION_OUTBOX_BATCH_SIZE', 200)
+        max_attempts = max_attempts or getattr(settings, 'NOTIFICATION_OUTBOX_MAX_ATTEMPTS', 5)
+        result = {"claimed": 0, "delivered": 0, "retried": 0, "failed": 0}
+
+        with transaction.atomic():
+            now = timezone.now()
+            batch = list(
+                Notification.objects.select_for_update(skip_locked=True).filter(
+                    delivery_status=Notification.DELIVERY_PENDING,
+                    next_attempt_at__lte=now
+                ).order_by('next_attempt_at', 'id')[:batch_size]
+            )
+            result["claimed"] = len(batch)
+            if not batch:
+                return result
+
+            outcomes = cls._push(batch)
+
+            delivered_ids = []
+            failed = []
+            for notification, outcome in zip(batch, outcomes):
+                if not isinstance(outcome, Exception):
+                    delivered_ids.append(notification.id)
+                    continue
+
+                notification.delivery_attempts += 1
+                if notification.delivery_attempts >= max_attempts:
+                    notification.delivery_status = Notification.DELIVERY_FAILED
+                    notification.next_attempt_at = None
+                    result["failed"] += 1
+                else:
+                    notification.next_attempt_at = now + cls._retry_delay(notification.delivery_attempts)
+                    result["retried"] += 1
+                failed.append(notification)
+
+            if delivered_ids:
+                Notification.objects.filter(id__in=delivered_ids).update(
+                    delivery_status=Notification.DELIVERY_DELIVERED,
+                    delivered_at=now,
+                    next_attempt_at=None
+                )
+            if failed:
+                Notification.objects.bulk_update(
+                    failed, ['delivery_status', 'delivery_attempts', 'next_attempt_at']
+                )
+            result["delivered"] = len(delivered_ids)
+
+        return result
+
+    @staticmethod
+    def _retry_delay(attempts):
+        """Exponential backoff for the given number of failed attempts"""
+        base = getattr(settings, 'NOTIFICATION_OUTBOX_RETRY_DELAY', 5)
+        cap = getattr(settings, 'NOTIFICATION_OUTBOX_MAX_RETRY_DELAY', 300)
+        return timedelta(seconds=min(cap, base * 2 ** (attempts - 1)))
+
+    @classmethod
+    def _count(cls, **increments):
+        """Add to the per-process delivery counters"""
+        with cls._delivery_stats_lock:
+            for name, value in increments.items():
+                cls._delivery_stats[name] += value
+
+    @classmethod
+    def get_delivery_stats(cls):
+        """
+        Get the delivery counters of the current process
+
+        Returns:
+            dict: Notifications created, WebSocket pushes made, failed and
+                  skipped for offline recipients, and ``pushes_per_notification``
+                  (skips included), which should stay at 1.0
+        """
+        with cls._delivery_stats_lock:
+            stats = dict(cls._delivery_stats)
+
+        handled = stats['pushes'] + stats['skipped_offline']
+        stats['pushes_per_notification'] = (
+            round(handled / stats['notifications'], 3) if stats['notifications'] else None
+        )
+        return stats
+
+    @classmethod
+    def reset_delivery_stats(cls):
+        """Reset the delivery counters of the current process"""
+        with cls._delivery_stats_lock:
+            for name in cls._delivery_stats:
+                cls._delivery_stats[name] = 0
+
     @staticmethod
     def mark_as_read(user, notification_id):
         """
@@ -126,8 +493,11 @@ class NotificationService:
                 id=notification_id,
                 recipient=user
             )
+            was_unread = notification.status == 'unread'
             notification.status = 'read'
             notification.save(update_fields=['status', 'updated_at'])
+            if was_unread:
+                NotificationService._invalidate_unread_counts([user.id])
             return True
             
         except Notification.DoesNotExist:
@@ -149,6 +519,8 @@ class NotificationService:
             status='unread'
         ).update(status='read')
         
+        if count:
+            NotificationService._invalidate_unread_counts([user.id])
         return count
     
     @staticmethod
@@ -168,13 +540,89 @@ class NotificationService:
                 id=notification_id,
                 recipient=user
             )
+            was_unread = notification.status == 'unread'
             notification.status = 'archived'
             notification.save(update_fields=['status', 'updated_at'])
+            if was_unread:
+                NotificationService._invalidate_unread_counts([user.id])
             return True
             
         except Notification.DoesNotExist:
             return False
     
+    @staticmethod
+    def _unread_count_version_key(user_id):
+        """Generate the cache key of the version of a user's unread count"""
+        return f'notification_unread_version_{user_id}'
+
+    @staticmethod
+    def _unread_count_cache_key(user_id, version):
+        """Generate the cache key of a user's unread count at a version"""
+        return f'notification_unread_count_{user_id}_{version}'
+
+    @staticmethod
+    def _unread_count_timeout():
+        return shared_timeout(
+            NotificationService.UNREAD_COUNT_CACHE_TIMEOUT, NotificationService.UNREAD_COUNT_LOCAL_TIMEOUT
+        )
+
+    @staticmethod
+    def get_unread_count(user):
+        """
+        Get the number of unread notifications of a user
+
+        Served from the cache when possible; otherwise counted with a query
+        answered from the (recipient, status, created_at) index alone.
+
+        Counts are cached under the user's current version, read before
+        counting. Writes replace the version once they commit, so a count
+        taken before a write is never read back after it, whenever it
+        reaches the cache.
+
+        Args:
+            user: User whose notifications to count
+
+        Returns:
+            int: Number of unread notifications
+        """
+        timeout = NotificationService._unread_count_timeout()
+        version_key = NotificationService._unread_count_version_key(user.id)
+
+        version = cache.get(version_key)
+        if version is None:
+            cache.add(version_key, uuid.uuid4().hex, timeout)
+            version = cache.get(version_key)
+
+        cache_key = NotificationService._unread_count_cache_key(user.id, version)
+        count = cache.get(cache_key) if version is not None else None
+        if count is None:
+            count = Notification.objects.filter(recipient_id=user.id, status='unread').count()
+            if version is not None:
+                cache.add(cache_key, count, timeout)
+
+        return count
+
+    @staticmethod
+    def _invalidate_unread_counts(user_ids):
+        """
+        Give the given users a new unread count version once the current
+        transaction commits, with one cache round trip for all of them.
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+
+        def _invalidate():
+            cache.set_many(
+                {
+                    NotificationService._unread_count_version_key(user_id): uuid.uuid4().hex
+                    for user_id in user_ids
+                },
+                NotificationService._unread_count_timeout()
+            )
+
+        transaction.on_commit(_invalidate)
+
     @staticmethod
     def get_pending_notifications(user, limit=10):
         """
@@ -194,6 +642,97 @@ class NotificationService:
         
         return [notification.to_dict() for notification in notifications]
     
+    @classmethod
+    def _page_size(cls, limit):
+        """Clamp a requested page size to the allowed range"""
+        try:
+            limit = int(limit) if limit is not None else cls.HISTORY_PAGE_SIZE
+        except (TypeError, ValueError):
+            limit = cls.HISTORY_PAGE_SIZE
+        return max(1, min(limit, cls.HISTORY_MAX_PAGE_SIZE))
+
+    @staticmethod
+    def _keyset_page(queryset, limit, cursor_of_last):
+        """
+        Evaluate one keyset page, fetching a single extra row to know
+        whether another page follows.
+        """
+        rows = list(queryset[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            'notifications': [notification.to_dict() for notification in rows],
+            'next_cursor': rows[-1].cursor if rows else cursor_of_last,
+            'has_more': has_more,
+        }
+
+    @classmethod
+    def get_notification_history(cls, user, cursor=None, limit=None, status=None, notification_type=None):
+        """
+        Page through a user's notifications, newest first
+
+        Pages are keyed on ``(created_at, id)``: each page continues strictly
+        after the cursor of the previous one, so the query is an index range
+        scan on ``notif_recipient_keyset_idx`` whatever the depth, with no
+        OFFSET and no duplicates when new notifications arrive meanwhile.
+
+        Args:
+            user: User whose notifications to retrieve
+            cursor: ``next_cursor`` of the previous page, None for the first page
+            limit: Page size (capped at HISTORY_MAX_PAGE_SIZE)
+            status: Optional status filter
+            notification_type: Optional type filter
+
+        Returns:
+            dict: ``notifications``, ``next_cursor`` and ``has_more``
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        limit = cls._page_size(limit)
+        queryset = Notification.objects.filter(recipient=user)
+
+        if cursor:
+            created_at, notification_id = Notification.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=notification_id)
+            )
+        if status:
+            queryset = queryset.filter(status=status)
+        if notification_type:
+            queryset = queryset.filter(type=notification_type)
+
+        return cls._keyset_page(queryset.order_by('-created_at', '-id'), limit, cursor)
+
+    @classmethod
+    def get_notifications_since(cls, user, cursor, limit=None):
+        """
+        Get the notifications created after ``cursor``, oldest first
+
+        Used by reconnecting clients to catch up on what they missed: the
+        client sends the cursor of the last notification it has seen and
+        keeps asking with ``next_cursor`` while ``has_more`` is true.
+
+        Args:
+            user: User whose notifications to retrieve
+            cursor: Cursor of the last notification the client has seen
+            limit: Page size (capped at HISTORY_MAX_PAGE_SIZE)
+
+        Returns:
+            dict: ``notifications``, ``next_cursor`` and ``has_more``
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        limit = cls._page_size(limit)
+        created_at, notification_id = Notification.decode_cursor(cursor)
+
+        queryset = Notification.objects.filter(recipient=user).filter(
+            Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=notification_id)
+        ).order_by('created_at', 'id')
+
+        return cls._keyset_page(queryset, limit, cursor)
+
     @staticmethod
     def get_notifications_by_type(user, notification_type, status=None, limit=None):
         """
@@ -221,4 +760,134 @@ class NotificationService:
         if limit:
             queryset = queryset[:limit]
             
-        return queryset
\ No newline at end of file
+        return queryset
+
+
+class NotificationRetentionService:
+    """
+    Service pruning old notifications from the notifications table
+
+    Read and archived notifications older than the retention age are either
+    moved to the compact ``ArchivedNotification`` table or deleted outright.
+    Rows are processed in bounded batches, each in its own transaction, so
+    the job never holds long locks and can be stopped at any point.
+    Unread notifications are never touched.
+    """
+
+    MODE_ARCHIVE = 'archive'
+    MODE_DELETE = 'delete'
+    MODES = (MODE_ARCHIVE, MODE_DELETE)
+
+    PRUNABLE_STATUSES = ('read', 'archived')
+
+    ARCHIVED_FIELDS = (
+        'id', 'recipient_id', 'title', 'content', 'type', 'status',
+        'priority', 'action_url', 'created_at',
+    )
+
+    @classmethod
+    def prunable_queryset(cls, cutoff):
+        """Notifications eligible for pruning, created before ``cutoff``"""
+        return Notification.objects.filter(
+            status__in=cls.PRUNABLE_STATUSES,
+            created_at__lt=cutoff
+        )
+
+    @classmethod
+    def prune(cls, days=None, mode=None, batch_size=None, max_batches=None, dry_run=False):
+        """
+        Archive or delete read/archived notifications older than ``days``
+
+        Args:
+            days: Retention age in days (NOTIFICATION_RETENTION_DAYS by default)
+            mode: 'archive' to move rows to the archive table, 'delete' to drop them
+            batch_size: Rows moved per transaction
+            max_batches: Optional limit on the number of batches for this run
+            dry_run: Only count the rows that would be pruned
+
+        Returns:
+            dict: Mode, cutoff, batches, rows moved, elapsed seconds and rows per second
+        """
+        days = days if days is not None else getattr(settings, 'NOTIFICATION_RETENTION_DAYS', 180)
+        mode = mode or getattr(settings, 'NOTIFICATION_RETENTION_MODE', cls.MODE_ARCHIVE)
+        batch_size = batch_size or getattr(settings, 'NOTIFICATION_RETENTION_BATCH_SIZE', 1000)
+
+        if mode not in cls.MODES:
+            raise ValueError(f"Unknown retention mode '{mode}', expected one of {', '.join(cls.MODES)}")
+
+        cutoff = timezone.now() - timedelta(days=days)
+        result = {
+            "mode": mode,
+            "cutoff": cutoff,
+            "dry_run": dry_run,
+            "batches": 0,
+            "rows": 0,
+            "seconds": 0.0,
+            "rows_per_second": 0.0,
+        }
+
+        started_at = time.perf_counter()
+
+        if dry_run:
+            result["rows"] = cls.prunable_queryset(cutoff).count()
+        else:
+            while max_batches is None or result["batches"] < max_batches:
+                moved = cls._prune_batch(cutoff, mode, batch_size)
+                if not moved:
+                    break
+                result["batches"] += 1
+                result["rows"] += moved
+                if moved < batch_size:
+                    break
+
+        result["seconds"] = time.perf_counter() - started_at
+        if result["seconds"] and not dry_run:
+            result["rows_per_second"] = round(result["rows"] / result["seconds"], 1)
+
+        logger.info(
+            f"Notification retention ({mode}{', dry run' if dry_run else ''}): {result['rows']} rows "
+            f"older than {cutoff:%Y-%m-%d} in {result['batches']} batches, "
+            f"{result['seconds']:.3f}s ({result['rows_per_second']} rows/s)"
+        )
+        return result
+
+    @classmethod
+    def _prune_batch(cls, cutoff, mode, batch_size):
+        """
+        Move or delete one batch of the oldest prunable notifications
+
+        Rows are walked in ``created_at`` order so each batch is a range scan
+        on the ``notif_created_idx`` index.
+
+        Returns:
+            int: Number of notifications removed from the notifications table
+        """
+        with transaction.atomic():
+            rows = list(
+                cls.prunable_queryset(cutoff)
+                .order_by('created_at', 'id')
+                .values(*cls.ARCHIVED_FIELDS)[:batch_size]
+            )
+            if not rows:
+                return 0
+
+            if mode == cls.MODE_ARCHIVE:
+                ArchivedNotification.objects.bulk_create([
+                    ArchivedNotification(
+                        original_id=row['id'],
+                        recipient_id=row['recipient_id'],
+                        title=row['title'],
+                        content=row['content'],
+                        type=row['type'],
+                        status=row['status'],
+                        priority=row['priority'],
+                        action_url=row['action_url'],
+                        created_at=row['created_at'],
+                    )
+                    for row in rows
+                ])
+
+            Notification.objects.filter(id__in=[row['id'] for row in rows]).delete()
+
+        return len(rows)
+
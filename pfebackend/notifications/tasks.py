@@ -0,0 +1,69 @@
+from celery import shared_task
+from django.conf import settings
+from django.db import DatabaseError
+import logging
+from .services import NotificationRetentionService, NotificationService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(autoretry_for=(DatabaseError,), retry_backoff=True, retry_jitter=True, max_retries=5)
+def drain_notification_outbox(max_batches=None):
+    """
+    Celery task pushing pending outbox notifications to the channel layer.
+
+    Drains batches until the outbox has no due rows left or ``max_batches``
+    is reached. Notifications that fail are rescheduled with exponential
+    backoff by ``NotificationService.drain_outbox``; database errors retry
+    the whole task with Celery's own backoff.
+
+    Args:
+        max_batches (int): Maximum number of batches per run
+
+    Returns:
+        dict: Totals of notifications claimed, delivered, retried and failed
+    """
+    max_batches = max_batches or getattr(settings, 'NOTIFICATION_OUTBOX_MAX_BATCHES', 50)
+    batch_size = getattr(settings, 'NOTIFICATION_OUTBOX_BATCH_SIZE', 200)
+    totals = {"batches": 0, "claimed": 0, "delivered": 0, "retried": 0, "failed": 0}
+
+    for _ in range(max_batches):
+        result = NotificationService.drain_outbox(batch_size=batch_size)
+        if not result["claimed"]:
+            break
+
+        totals["batches"] += 1
+        for key, value in result.items():
+            totals[key] += value
+
+        if result["claimed"] < batch_size:
+            break
+
+    if totals["claimed"]:
+        logger.info(
+            f"Notification outbox drained: {totals['delivered']} delivered, "
+            f"{totals['retried']} to retry, {totals['failed']} failed in {totals['batches']} batches"
+        )
+    return totals
+
+
+@shared_task(autoretry_for=(DatabaseError,), retry_backoff=True, retry_jitter=True, max_retries=3)
+def prune_notifications(days=None, mode=None, max_batches=None):
+    """
+    Celery task archiving or deleting old read/archived notifications.
+
+    Runs ``NotificationRetentionService.prune`` with the NOTIFICATION_RETENTION_*
+    settings unless overridden. Batches are committed one by one, so a retry
+    after a database error simply continues where the previous run stopped.
+
+    Args:
+        days (int): Retention age in days
+        mode (str): 'archive' or 'delete'
+        max_batches (int): Maximum number of batches per run
+
+    Returns:
+        dict: Rows moved, batches, elapsed seconds and rows per second
+    """
+    result = NotificationRetentionService.prune(days=days, mode=mode, max_batches=max_batches)
+    result["cutoff"] = result["cutoff"].isoformat()
+    return result
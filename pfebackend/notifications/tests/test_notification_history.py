@@ -0,0 +1,97 @@
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.models import User
+from notifications.models import Notification
+from notifications.services import NotificationService
+
+
+class NotificationHistoryTests(APITestCase):
+    """Tests for keyset notification history and incremental sync"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='user@test.com',
+            username='user',
+            password='pass123',
+            first_name='User',
+            last_name='Test',
+            user_type='student'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('notifications:notification-history')
+
+        notifications = Notification.objects.bulk_create([
+            Notification(recipient=self.user, content=f'Notification {i}', type='system')
+            for i in range(7)
+        ])
+        # Two notifications share a timestamp to exercise the id tie-breaker
+        base = timezone.now() - timedelta(hours=1)
+        for i, notification in enumerate(notifications):
+            Notification.objects.filter(id=notification.id).update(
+                created_at=base + timedelta(minutes=min(i, 5))
+            )
+        self.ids = [notification.id for notification in notifications]
+
+    def test_history_pages_cover_everything_once(self):
+        """Test that following next_cursor walks the history newest first without gaps"""
+        seen = []
+        cursor = None
+        while True:
+            page = NotificationService.get_notification_history(self.user, cursor=cursor, limit=3)
+            seen.extend(notification['id'] for notification in page['notifications'])
+            cursor = page['next_cursor']
+            if not page['has_more']:
+                break
+
+        self.assertEqual(seen, [self.ids[6], self.ids[5], self.ids[4], self.ids[3], self.ids[2], self.ids[1], self.ids[0]])
+
+    def test_sync_since_returns_only_missed_notifications(self):
+        """Test that sync from a cursor returns newer notifications, oldest first"""
+        cursor = Notification.objects.get(id=self.ids[4]).cursor
+
+        page = NotificationService.get_notifications_since(self.user, cursor, limit=10)
+
+        self.assertEqual([n['id'] for n in page['notifications']], [self.ids[5], self.ids[6]])
+        self.assertFalse(page['has_more'])
+        self.assertEqual(page['next_cursor'], page['notifications'][-1]['cursor'])
+
+    def test_sync_with_nothing_new_keeps_cursor(self):
+        """Test that an up-to-date client gets an empty page and its own cursor back"""
+        cursor = Notification.objects.get(id=self.ids[6]).cursor
+
+        page = NotificationService.get_notifications_since(self.user, cursor)
+
+        self.assertEqual(page['notifications'], [])
+        self.assertEqual(page['next_cursor'], cursor)
+
+    def test_page_is_a_single_query(self):
+        """Test that a deep page costs one query"""
+        cursor = Notification.objects.get(id=self.ids[3]).cursor
+
+        with CaptureQueriesContext(connection) as queries:
+            NotificationService.get_notification_history(self.user, cursor=cursor, limit=2)
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('OFFSET', queries[0]['sql'].upper())
+
+    def test_endpoint_history_and_since(self):
+        """Test the history endpoint in both directions"""
+        response = self.client.get(self.url, {'limit': 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([n['id'] for n in response.data['results']], [self.ids[6], self.ids[5]])
+        self.assertTrue(response.data['has_more'])
+
+        response = self.client.get(self.url, {'since': response.data['results'][-1]['cursor']})
+        self.assertEqual([n['id'] for n in response.data['results']], [self.ids[6]])
+
+    def test_endpoint_rejects_invalid_cursor(self):
+        """Test that a malformed cursor is a 400"""
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
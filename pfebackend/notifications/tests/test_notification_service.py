@@ -0,0 +1,230 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from unittest.mock import patch
+from users.models import User
+from teams.models import Team
+from notifications.models import Notification
+from notifications.services import NotificationService
+
+
+@override_settings(
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+    PRESENCE_SKIP_OFFLINE_PUSHES=False
+)
+class NotificationBulkServiceTests(TestCase):
+    """Tests for the batched notification fan-out"""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                email=f'user{index}@test.com',
+                username=f'user{index}',
+                password='pass123',
+                first_name=f'User{index}',
+                last_name='Test',
+                user_type='student'
+            )
+            for index in range(3)
+        ]
+        self.team = Team.objects.create(name='Team', academic_year='4siw', maximum_members=3)
+
+    def test_create_and_send_bulk_creates_one_row_per_recipient(self):
+        """Test that duplicate recipients are skipped and rows share the payload"""
+        notifications = NotificationService.create_and_send_bulk(
+            recipients=self.users + [self.users[0]],
+            title='Meeting',
+            content='A meeting was scheduled',
+            notification_type='team_meeting',
+            related_object=self.team,
+            priority='high',
+            metadata={'team_id': self.team.id}
+        )
+
+        self.assertEqual(len(notifications), 3)
+        self.assertTrue(all(notification.pk for notification in notifications))
+        self.assertEqual(
+            set(Notification.objects.values_list('recipient_id', flat=True)),
+            {user.id for user in self.users}
+        )
+        notification = Notification.objects.get(recipient=self.users[1])
+        self.assertEqual(notification.related_object, self.team)
+        self.assertEqual(notification.metadata, {'team_id': self.team.id})
+
+    def test_query_count_does_not_grow_with_recipients(self):
+        """Test that the fan-out costs a single INSERT"""
+        ContentType.objects.get_for_model(self.team)
+
+        with self.assertNumQueries(1):
+            NotificationService.create_and_send_bulk(
+                recipients=self.users,
+                content='Update',
+                notification_type='team_update',
+                related_object=self.team
+            )
+
+    def test_messages_are_pushed_to_each_recipient_group(self):
+        """Test that every recipient's group receives its notification"""
+        channel_layer = get_channel_layer()
+        channel_name = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(f"user_{self.users[2].id}_notifications", channel_name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notifications = NotificationService.create_and_send_bulk(
+                recipients=self.users,
+                content='Reminder',
+                notification_type='meeting_reminder'
+            )
+
+        message = async_to_sync(channel_layer.receive)(channel_name)
+        self.assertEqual(message['type'], 'notification_message')
+        self.assertEqual(message['notification']['id'], notifications[2].id)
+
+    def test_empty_recipients_do_nothing(self):
+        """Test that no query is made without recipients"""
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                NotificationService.create_and_send_bulk(recipients=[], content='x', notification_type='system'),
+                []
+            )
+
+
+@override_settings(
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+    PRESENCE_SKIP_OFFLINE_PUSHES=False
+)
+class NotificationDeliveryTests(TestCase):
+    """Tests for the single, commit-deferred delivery pipeline"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='user@test.com',
+            username='user',
+            password='pass123',
+            first_name='User',
+            last_name='Test',
+            user_type='student'
+        )
+        NotificationService.reset_delivery_stats()
+
+    def test_push_waits_for_commit(self):
+        """Test that nothing is pushed before the transaction commits"""
+        with self.captureOnCommitCallbacks() as callbacks:
+            NotificationService.create_and_send(self.user, 'Hello', 'system')
+            self.assertEqual(NotificationService.get_delivery_stats()['pushes'], 0)
+
+        self.assertTrue(callbacks)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(NotificationService.get_delivery_stats()['pushes'], 1)
+
+    def test_rolled_back_notification_is_never_pushed(self):
+        """Test that a rollback discards the pending push"""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    NotificationService.create_and_send(self.user, 'Hello', 'system')
+                    raise RuntimeError("rollback")
+            except RuntimeError:
+                pass
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(NotificationService.get_delivery_stats()['pushes'], 0)
+
+    def test_one_push_per_notification(self):
+        """Test that each stored notification is pushed exactly once"""
+        other = User.objects.create_user(
+            email='other@test.com',
+            username='other',
+            password='pass123',
+            first_name='Other',
+            last_name='Test',
+            user_type='student'
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.create_and_send(self.user, 'Hello', 'system')
+            NotificationService.create_and_send_bulk([self.user, other], 'Hello all', 'system')
+
+        stats = NotificationService.get_delivery_stats()
+        self.assertEqual(stats['notifications'], 3)
+        self.assertEqual(stats['pushes'], 3)
+        self.assertEqual(stats['pushes_per_notification'], 1.0)
+
+
+@override_settings(
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+    NOTIFICATION_DELIVERY_MODE='outbox',
+    NOTIFICATION_OUTBOX_MAX_ATTEMPTS=2,
+    PRESENCE_SKIP_OFFLINE_PUSHES=False,
+)
+class NotificationOutboxTests(TestCase):
+    """Tests for the transactional outbox delivery mode"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='user@test.com',
+            username='user',
+            password='pass123',
+            first_name='User',
+            last_name='Test',
+            user_type='student'
+        )
+        NotificationService.reset_delivery_stats()
+
+    def test_notifications_are_stored_pending_without_push(self):
+        """Test that outbox mode never pushes from the caller"""
+        with self.captureOnCommitCallbacks(execute=True):
+            notification = NotificationService.create_and_send(self.user, 'Hello', 'system')
+            NotificationService.create_and_send_bulk([self.user], 'Hello again', 'system')
+
+        notification.refresh_from_db()
+        self.assertEqual(notification.delivery_status, Notification.DELIVERY_PENDING)
+        self.assertEqual(Notification.objects.filter(delivery_status=Notification.DELIVERY_PENDING).count(), 2)
+        self.assertEqual(NotificationService.get_delivery_stats()['pushes'], 0)
+
+    def test_drain_pushes_and_marks_delivered(self):
+        """Test that the drain task delivers pending notifications"""
+        from notifications.tasks import drain_notification_outbox
+
+        channel_layer = get_channel_layer()
+        channel_name = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(f"user_{self.user.id}_notifications", channel_name)
+        notification = NotificationService.create_and_send(self.user, 'Hello', 'system')
+
+        totals = drain_notification_outbox()
+
+        self.assertEqual(totals['delivered'], 1)
+        notification.refresh_from_db()
+        self.assertEqual(notification.delivery_status, Notification.DELIVERY_DELIVERED)
+        self.assertIsNotNone(notification.delivered_at)
+        message = async_to_sync(channel_layer.receive)(channel_name)
+        self.assertEqual(message['notification']['id'], notification.id)
+
+        # Nothing left to deliver
+        self.assertEqual(drain_notification_outbox()['claimed'], 0)
+
+    def test_failed_push_is_retried_with_backoff_then_failed(self):
+        """Test the retry schedule when the channel layer is unavailable"""
+        notification = NotificationService.create_and_send(self.user, 'Hello', 'system')
+
+        with patch.object(NotificationService, '_push', side_effect=lambda batch: [RuntimeError('down')] * len(batch)):
+            result = NotificationService.drain_outbox()
+            self.assertEqual(result['retried'], 1)
+
+            notification.refresh_from_db()
+            self.assertEqual(notification.delivery_status, Notification.DELIVERY_PENDING)
+            self.assertEqual(notification.delivery_attempts, 1)
+            self.assertGreater(notification.next_attempt_at, timezone.now())
+
+            # Not due yet
+            self.assertEqual(NotificationService.drain_outbox()['claimed'], 0)
+
+            Notification.objects.filter(pk=notification.pk).update(next_attempt_at=timezone.now())
+            self.assertEqual(NotificationService.drain_outbox()['failed'], 1)
+
+        notification.refresh_from_db()
+        self.assertEqual(notification.delivery_status, Notification.DELIVERY_FAILED)
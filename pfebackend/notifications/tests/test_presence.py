@@ -0,0 +1,116 @@
+import asyncio
+from unittest import mock
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.models import Student, User
+from teams.models import Team, TeamMembership
+from teams.services import TeamMembershipCache
+from common.presence import PresenceConsumerMixin, PresenceService
+from notifications.services import NotificationService
+
+
+def create_student(index):
+    user = User.objects.create_user(
+        email=f'user{index}@test.com',
+        username=f'user{index}',
+        password='pass123',
+        first_name=f'User{index}',
+        last_name='Test',
+        user_type='student'
+    )
+    Student.objects.create(
+        user=user,
+        matricule=f'MAT{index:04d}',
+        enrollment_year=2023,
+        current_year='4siw',
+        academic_status='active'
+    )
+    return user
+
+
+@override_settings(
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+    PRESENCE_BACKEND='local',
+    PRESENCE_SKIP_OFFLINE_PUSHES=True
+)
+class PresenceTests(APITestCase):
+    """Tests for presence tracking and skipped pushes to offline users"""
+
+    def setUp(self):
+        cache.clear()
+        TeamMembershipCache.clear_local()
+        PresenceService.backend().clear()
+        NotificationService.reset_delivery_stats()
+        self.users = [create_student(index) for index in range(3)]
+
+    def test_online_users_are_found_in_bulk(self):
+        """Test that heartbeats mark users online for the bulk lookup"""
+        PresenceService.heartbeat([self.users[0].id, self.users[2].id])
+
+        online = PresenceService.online_user_ids(user.id for user in self.users)
+
+        self.assertEqual(online, {self.users[0].id, self.users[2].id})
+
+    def test_consumers_heartbeat_at_once_then_every_half_interval(self):
+        """Test that a new socket is online right away and never misses an interval"""
+        consumer = PresenceConsumerMixin()
+        consumer.scope = {'user': self.users[0]}
+
+        async def start():
+            with mock.patch('common.presence.asyncio.sleep', side_effect=asyncio.CancelledError) as sleep:
+                await consumer.start_presence()
+                online = PresenceService.online_user_ids([self.users[0].id])
+                await consumer._presence_task
+            return online, sleep.call_args.args[0]
+
+        online, delay = async_to_sync(start)()
+
+        self.assertEqual(online, {self.users[0].id})
+        self.assertEqual(delay, PresenceService.interval() / 2)
+
+    def test_pushes_to_offline_users_are_skipped(self):
+        """Test that only online recipients get a channel layer push"""
+        PresenceService.heartbeat([self.users[1].id])
+        channel_layer = get_channel_layer()
+        channel_name = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(f"user_{self.users[1].id}_notifications", channel_name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notifications = NotificationService.create_and_send_bulk(self.users, 'Reminder', 'system')
+
+        message = async_to_sync(channel_layer.receive)(channel_name)
+        self.assertEqual(message['notification']['id'], notifications[1].id)
+        stats = NotificationService.get_delivery_stats()
+        self.assertEqual((stats['pushes'], stats['skipped_offline']), (1, 2))
+        self.assertEqual(stats['pushes_per_notification'], 1.0)
+
+    def test_team_online_members_endpoint(self):
+        """Test that team members can see who is online"""
+        team = Team.objects.create(name='Team', academic_year='4siw')
+        for user in self.users[:2]:
+            TeamMembership.objects.create(team=team, user=user, role=TeamMembership.ROLE_MEMBER)
+        PresenceService.heartbeat([self.users[1].id, self.users[2].id])
+        url = reverse('teams:team-members-online', kwargs={'team_id': team.id})
+
+        self.client.force_authenticate(user=self.users[0])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['online_user_ids'], [self.users[1].id])
+
+        self.client.force_authenticate(user=self.users[2])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(PRESENCE_BACKEND='redis', PRESENCE_REDIS_URL='redis://127.0.0.1:1/0')
+class PresenceUnavailableTests(TestCase):
+    """Tests for the fail-open behaviour without a presence store"""
+
+    def test_everyone_is_online_when_store_is_down(self):
+        """Test that lookups fall back to reporting every user online"""
+        self.assertEqual(PresenceService.online_user_ids([1, 2]), {1, 2})
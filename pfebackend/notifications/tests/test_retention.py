@@ -0,0 +1,89 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from users.models import User
+from notifications.models import ArchivedNotification, Notification
+from notifications.services import NotificationRetentionService
+
+
+class NotificationRetentionTests(TestCase):
+    """Tests for archiving and pruning old notifications"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='user@test.com',
+            username='user',
+            password='pass123',
+            first_name='User',
+            last_name='Test',
+            user_type='student'
+        )
+
+    def _create(self, count, status, days_old):
+        notifications = Notification.objects.bulk_create([
+            Notification(recipient=self.user, content=f'Old {i}', type='system', status=status)
+            for i in range(count)
+        ])
+        # created_at is auto_now_add, so age the rows afterwards
+        Notification.objects.filter(id__in=[n.id for n in notifications]).update(
+            created_at=timezone.now() - timedelta(days=days_old)
+        )
+        return notifications
+
+    def test_archive_moves_old_read_notifications_in_batches(self):
+        """Test that old read/archived rows move to the archive table batch by batch"""
+        self._create(5, 'read', 200)
+        self._create(2, 'archived', 200)
+        self._create(3, 'read', 10)
+
+        result = NotificationRetentionService.prune(days=180, mode='archive', batch_size=3)
+
+        self.assertEqual(result['rows'], 7)
+        self.assertEqual(result['batches'], 3)
+        self.assertEqual(Notification.objects.count(), 3)
+        self.assertEqual(ArchivedNotification.objects.filter(recipient=self.user).count(), 7)
+        self.assertIn('rows_per_second', result)
+
+    def test_unread_notifications_are_never_pruned(self):
+        """Test that unread notifications survive regardless of age"""
+        self._create(4, 'unread', 400)
+
+        result = NotificationRetentionService.prune(days=180, mode='delete')
+
+        self.assertEqual(result['rows'], 0)
+        self.assertEqual(Notification.objects.count(), 4)
+
+    def test_delete_mode_skips_the_archive(self):
+        """Test that delete mode drops rows without archiving them"""
+        self._create(4, 'read', 200)
+
+        NotificationRetentionService.prune(days=180, mode='delete')
+
+        self.assertEqual(Notification.objects.count(), 0)
+        self.assertEqual(ArchivedNotification.objects.count(), 0)
+
+    def test_max_batches_bounds_a_run(self):
+        """Test that a run stops after max_batches"""
+        self._create(5, 'read', 200)
+
+        result = NotificationRetentionService.prune(days=180, mode='delete', batch_size=2, max_batches=1)
+
+        self.assertEqual(result['rows'], 2)
+        self.assertEqual(Notification.objects.count(), 3)
+
+    def test_command_dry_run_changes_nothing(self):
+        """Test that the management command's dry run only counts rows"""
+        self._create(3, 'read', 200)
+        out = StringIO()
+
+        call_command('prune_notifications', '--days', '180', '--dry-run', stdout=out)
+
+        self.assertIn('3 notifications', out.getvalue())
+        self.assertEqual(Notification.objects.count(), 3)
+
+    def test_unknown_mode_is_rejected(self):
+        """Test that an unknown mode raises"""
+        with self.assertRaises(ValueError):
+            NotificationRetentionService.prune(mode='truncate')
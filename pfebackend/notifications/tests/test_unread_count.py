@@ -0,0 +1,96 @@
+from unittest import mock
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.models import User
+from notifications.models import Notification
+from notifications.services import NotificationService
+
+
+class UnreadNotificationCountTests(APITestCase):
+    """Tests for the cached unread notification count"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='user@test.com',
+            username='user',
+            password='pass123',
+            first_name='User',
+            last_name='Test',
+            user_type='student'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('notifications:notification-unread-count')
+
+    def _create(self, count):
+        with self.captureOnCommitCallbacks(execute=True):
+            return [NotificationService.create_notification(self.user, 'Hello', 'system') for _ in range(count)]
+
+    def test_endpoint_returns_unread_count(self):
+        """Test the unread-count endpoint"""
+        self._create(3)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'unread_count': 3})
+
+    def test_count_is_served_from_cache(self):
+        """Test that a second read needs no query"""
+        self._create(2)
+        NotificationService.get_unread_count(self.user)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(NotificationService.get_unread_count(self.user), 2)
+
+    def test_cache_is_invalidated_on_create_and_read(self):
+        """Test that creating and reading notifications refresh the count"""
+        notifications = self._create(2)
+        self.assertEqual(NotificationService.get_unread_count(self.user), 2)
+
+        self._create(1)
+        self.assertEqual(NotificationService.get_unread_count(self.user), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.mark_as_read(self.user, notifications[0].id)
+        self.assertEqual(NotificationService.get_unread_count(self.user), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.archive_notification(self.user, notifications[1].id)
+        self.assertEqual(NotificationService.get_unread_count(self.user), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.mark_all_as_read(self.user)
+        self.assertEqual(NotificationService.get_unread_count(self.user), 0)
+        self.assertFalse(Notification.objects.filter(recipient=self.user, status='unread').exists())
+
+    def test_per_process_cache_keeps_counts_briefly(self):
+        """Test that counts other processes cannot invalidate expire within seconds"""
+        with mock.patch('notifications.services.cache') as shared:
+            shared.get.return_value = None
+            NotificationService.get_unread_count(self.user)
+
+        self.assertEqual(shared.add.call_args.args[2], NotificationService.UNREAD_COUNT_LOCAL_TIMEOUT)
+
+    def test_count_taken_before_a_write_is_not_served_after_it(self):
+        """Test that a count cached late by a slow reader is never read back"""
+        self._create(2)
+        NotificationService.get_unread_count(self.user)
+        version = cache.get(NotificationService._unread_count_version_key(self.user.id))
+        cache.delete(NotificationService._unread_count_cache_key(self.user.id, version))
+
+        self._create(1)
+        # The slow reader caches what it counted before the write committed
+        cache.add(NotificationService._unread_count_cache_key(self.user.id, version), 2)
+
+        self.assertEqual(NotificationService.get_unread_count(self.user), 3)
+
+    def test_requires_authentication(self):
+        """Test that anonymous users cannot read counts"""
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
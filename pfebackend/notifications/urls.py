@@ -0,0 +1,11 @@
+from django.urls import path
+from .views import *
+
+
+app_name = 'notifications'
+
+
+urlpatterns = [
+    path('notifications/unread-count/', UnreadNotificationCountView.as_view(), name='notification-unread-count'),
+    path('notifications/history/', NotificationHistoryView.as_view(), name='notification-history'),
+]
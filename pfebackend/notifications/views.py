@@ -0,0 +1,54 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .services import NotificationService
+
+
+class UnreadNotificationCountView(APIView):
+    """
+    Number of unread notifications of the current user (notification badge)
+    
+    GET /api/notifications/unread-count/
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        return Response({'unread_count': NotificationService.get_unread_count(request.user)})
+
+
+class NotificationHistoryView(APIView):
+    """
+    Keyset-paginated notification history of the current user, newest first
+    
+    GET /api/notifications/history/?cursor=<next_cursor>&limit=20&status=read&type=system
+    
+    With ``since=<cursor>`` the notifications created after that cursor are
+    returned oldest first instead, so a reconnecting client can catch up on
+    what it missed.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        params = request.query_params
+        try:
+            if params.get('since'):
+                page = NotificationService.get_notifications_since(
+                    request.user, params['since'], limit=params.get('limit')
+                )
+            else:
+                page = NotificationService.get_notification_history(
+                    request.user,
+                    cursor=params.get('cursor'),
+                    limit=params.get('limit'),
+                    status=params.get('status'),
+                    notification_type=params.get('type')
+                )
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'status': 'success',
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more'],
+            'results': page['notifications']
+        })
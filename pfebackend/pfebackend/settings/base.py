@@ -1,5 +1,6 @@
 from pathlib import Path
 from datetime import timedelta
+from celery.schedules import crontab
 from dotenv import load_dotenv
 import os
 
@@ -33,6 +34,27 @@ CHANNEL_LAYERS = {
         },
     },
 }
+
+# Cache shared by the web, WebSocket and Celery processes, so that team
+# memberships, timelines, chat replay and unread counts invalidated in one
+# process are invalidated in all of them. 'local' keeps one cache per process
+# (common/cache.py then shortens the timeouts of those entries)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "redis")
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://redis:6379/3")
+if CACHE_BACKEND == "local":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_REDIS_URL,
+        },
+    }
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -74,6 +96,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'common.query_budget.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -155,6 +178,16 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    # orjson-backed JSON (see common/json.py), stdlib fallback
+    'DEFAULT_RENDERER_CLASSES': [
+        'common.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'common.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,  # Default number of items per page
 }
@@ -183,6 +216,9 @@ SIMPLE_JWT = {
 }
 AUTH_USER_MODEL = "users.User"
 
+# Seconds a user resolved from a JWT is reused for WebSocket handshakes
+WEBSOCKET_AUTH_CACHE_TIMEOUT = 60
+
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
         'Bearer': {
@@ -214,6 +250,70 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_BROKER_URL = "redis://:my_password@localhost:6379/0"
 CELERY_RESULT_BACKEND = "redis://:my_password@localhost:6379/1"
 
+CELERY_BEAT_SCHEDULE = {
+    'prune-notifications': {
+        'task': 'notifications.tasks.prune_notifications',
+        'schedule': crontab(hour=3, minute=30),
+    },
+}
+
+# Notification delivery: 'direct' pushes to the channel layer once the
+# request's transaction commits, 'outbox' stores notifications as pending
+# and lets the drain_notification_outbox Celery task push them.
+NOTIFICATION_DELIVERY_MODE = os.getenv("NOTIFICATION_DELIVERY_MODE", "direct")
+if NOTIFICATION_DELIVERY_MODE == "outbox":
+    CELERY_BEAT_SCHEDULE['drain-notification-outbox'] = {
+        'task': 'notifications.tasks.drain_notification_outbox',
+        'schedule': 5.0,
+    }
+NOTIFICATION_OUTBOX_BATCH_SIZE = 200
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = 5
+NOTIFICATION_OUTBOX_RETRY_DELAY = 5  # seconds, doubled after each failure
+NOTIFICATION_OUTBOX_MAX_RETRY_DELAY = 300
+# Also wake a worker right after commit instead of waiting for the beat
+NOTIFICATION_OUTBOX_KICK = False
+
+# WebSocket consumers: per-connection outbound queue bound, and the window
+# in seconds during which queued events are coalesced into one frame
+WEBSOCKET_OUTBOUND_QUEUE_SIZE = 256
+WEBSOCKET_BATCH_WINDOW = 0.005
+WEBSOCKET_MAX_BATCH_SIZE = 50
+
+# Presence: consumers heartbeat twice every PRESENCE_HEARTBEAT_INTERVAL seconds;
+# 'redis' shares presence between processes, 'local' keeps it in process
+PRESENCE_BACKEND = os.getenv("PRESENCE_BACKEND", "redis")
+PRESENCE_REDIS_URL = os.getenv("PRESENCE_REDIS_URL", "redis://redis:6379/2")
+PRESENCE_HEARTBEAT_INTERVAL = 30
+# Do not push notifications to users without an open WebSocket; they read
+# them from the database when they connect
+PRESENCE_SKIP_OFFLINE_PUSHES = True
+
+# Chat: messages are written in batches of CHAT_WRITE_BATCH_SIZE or every
+# CHAT_WRITE_FLUSH_INTERVAL seconds, failed batches are retried up to
+# CHAT_WRITE_MAX_ATTEMPTS times; CHAT_REPLAY_SIZE messages are replayed on connect
+CHAT_WRITE_BATCH_SIZE = 100
+CHAT_WRITE_FLUSH_INTERVAL = 0.25
+CHAT_WRITE_MAX_ATTEMPTS = 5
+CHAT_REPLAY_SIZE = 50
+
+# Notification retention: read/archived notifications older than this are
+# moved to the archive table ('archive') or dropped ('delete') every night
+NOTIFICATION_RETENTION_DAYS = 180
+NOTIFICATION_RETENTION_MODE = 'archive'
+NOTIFICATION_RETENTION_BATCH_SIZE = 1000
+
+# Query budgets (common/query_budget.py): X-Query-* response headers in
+# development; requests over their view's @query_budget raise instead of
+# logging a warning when QUERY_BUDGET_RAISE is on (always under the test runner)
+QUERY_BUDGET_HEADERS = os.getenv("QUERY_BUDGET_HEADERS", str(DEBUG)).lower() == "true"
+QUERY_BUDGET_RAISE = os.getenv("QUERY_BUDGET_RAISE", "False").lower() == "true"
+TEST_RUNNER = 'common.testing.QueryBudgetTestRunner'
+
+# Student imports (users/services/student_import_service.py): rows are written
+# in chunks of STUDENT_IMPORT_CHUNK_SIZE; new accounts get STUDENT_IMPORT_PASSWORD
+STUDENT_IMPORT_CHUNK_SIZE = 500
+STUDENT_IMPORT_PASSWORD = os.getenv("STUDENT_IMPORT_PASSWORD", "zaarirmoh")
+
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [
@@ -46,6 +46,8 @@ urlpatterns = [
     path('api/', include('timelines.urls')),
     path('api/', include('themes.urls')),
     path('api/', include('supervision.urls')),
+    path('api/', include('notifications.urls')),
+    path('api/', include('chat.urls')),
 
 ]
 
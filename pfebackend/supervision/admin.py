@@ -79,43 +79,67 @@ class DefenseAdmin(ModelAdmin):
         # Get theme supervisor and co-supervisors
         theme = defense.theme
         supervisor = theme.proposed_by
-        co_supervisors = theme.co_supervisors.all()
+        co_supervisors = list(theme.co_supervisors.all())
         
         # Get jury members
         # jury_members = [jm.user for jm in defense.jury_members.all()]
-        jury_members = [jm for jm in defense.jury_members.all()]
+        jury_members = list(defense.jury_members.select_related('user'))
         
         # 1. Notify team members
         defense_url = f"/defenses/{defense.id}/"  # Adjust based on your URL structure
-        for member in team_members:
-            NotificationService.create_and_send(
-                recipient=member,
-                title=_("Defense Scheduled"),
-                content=_(f"Your team's defense for '{theme.title}' has been scheduled for {defense.date} at {defense.start_time}."),
-                notification_type="defense_scheduled",
-                related_object=defense,
-                priority="high",
-                action_url=defense_url,
-                metadata={
-                    "defense_id": defense.id,
-                    "defense_date": defense.date.isoformat(),
-                    "defense_time": defense.start_time.isoformat(),
-                    "location": defense.location,
-                    "room": defense.room,
-                }
-            )
+        NotificationService.create_and_send_bulk(
+            recipients=team_members,
+            title=_("Defense Scheduled"),
+            content=_(f"Your team's defense for '{theme.title}' has been scheduled for {defense.date} at {defense.start_time}."),
+            notification_type="defense_scheduled",
+            related_object=defense,
+            priority="high",
+            action_url=defense_url,
+            metadata={
+                "defense_id": defense.id,
+                "defense_date": defense.date.isoformat(),
+                "defense_time": defense.start_time.isoformat(),
+                "location": defense.location,
+                "room": defense.room,
+            }
+        )
         
         # 2. Notify theme supervisor and co-supervisors
-        for teacher in [supervisor] + list(co_supervisors):
-            NotificationService.create_and_send(
-                recipient=teacher,
-                title=_("Defense Supervision"),
-                content=_(f"You are supervising a defense for team '{team.name}' on {defense.date} at {defense.start_time}."),
-                notification_type="defense_supervision",
+        NotificationService.create_and_send_bulk(
+            recipients=[supervisor] + list(co_supervisors),
+            title=_("Defense Supervision"),
+            content=_(f"You are supervising a defense for team '{team.name}' on {defense.date} at {defense.start_time}."),
+            notification_type="defense_supervision",
+            related_object=defense,
+            priority="medium",
+            action_url=defense_url,
+            metadata={
+                "defense_id": defense.id,
+                "defense_date": defense.date.isoformat(),
+                "defense_time": defense.start_time.isoformat(),
+                "team_name": team.name,
+                "location": defense.location,
+                "room": defense.room,
+            }
+        )
+        
+        # 3. Notify jury members who are not already notified as supervisors,
+        # one batch for the president and one for the other members
+        teachers = {supervisor} | set(co_supervisors)
+        for is_president in (True, False):
+            NotificationService.create_and_send_bulk(
+                recipients=[
+                    jury_member.user for jury_member in jury_members
+                    if jury_member.is_president == is_president and jury_member.user not in teachers
+                ],
+                title=_("Jury Participation"),
+                content=_(f"You are assigned as a jury member for team '{team.name}' defense on {defense.date} at {defense.start_time}."),
+                notification_type="jury_assignment",
                 related_object=defense,
                 priority="medium",
                 action_url=defense_url,
                 metadata={
+                    "is_president": is_president,
                     "defense_id": defense.id,
                     "defense_date": defense.date.isoformat(),
                     "defense_time": defense.start_time.isoformat(),
@@ -124,27 +148,6 @@ class DefenseAdmin(ModelAdmin):
                     "room": defense.room,
                 }
             )
-        for jury_member in jury_members:
-            jury_user = jury_member.user
-            if jury_user not in ([supervisor] + list(co_supervisors)):  # Avoid duplicate notifications
-                NotificationService.create_and_send(
-                    recipient=jury_user,
-                    title=_("Jury Participation"),
-                    content=_(f"You are assigned as a jury member for team '{team.name}' defense on {defense.date} at {defense.start_time}."),
-                    notification_type="jury_assignment",
-                    related_object=defense,
-                    priority="medium",
-                    action_url=defense_url,
-                    metadata={
-                        "is_president": jury_member.is_president,
-                        "defense_id": defense.id,
-                        "defense_date": defense.date.isoformat(),
-                        "defense_time": defense.start_time.isoformat(),
-                        "team_name": team.name,
-                        "location": defense.location,
-                        "room": defense.room,
-                    }
-                )
     
     def _send_defense_updated_notifications(self, defense, admin_user, changed_fields):
         """
@@ -164,7 +167,7 @@ class DefenseAdmin(ModelAdmin):
         supervisor = theme.proposed_by
         co_supervisors = theme.co_supervisors.all()
         
-        jury_members = [jm.user for jm in defense.jury_members.all()]
+        jury_members = [jm.user for jm in defense.jury_members.select_related('user')]
         
         # Create change message
         change_message = _("Defense details have been updated")
@@ -182,25 +185,24 @@ class DefenseAdmin(ModelAdmin):
         
         # Notify all recipients
         defense_url = f"/defenses/{defense.id}/"  # Adjust based on your URL structure
-        for recipient in all_recipients:
-            NotificationService.create_and_send(
-                recipient=recipient,
-                title=_("Defense Update"),
-                content=f"{change_message} - {team.name}, {defense.date} at {defense.start_time}.",
-                notification_type="defense_updated",
-                related_object=defense,
-                priority="high",
-                action_url=defense_url,
-                metadata={
-                    "defense_id": defense.id,
-                    "defense_date": defense.date.isoformat(),
-                    "defense_time": defense.start_time.isoformat(),
-                    "location": defense.location,
-                    "room": defense.room,
-                    "status": defense.status,
-                    "changes": list(important_changes)
-                }
-            )
+        NotificationService.create_and_send_bulk(
+            recipients=all_recipients,
+            title=_("Defense Update"),
+            content=f"{change_message} - {team.name}, {defense.date} at {defense.start_time}.",
+            notification_type="defense_updated",
+            related_object=defense,
+            priority="high",
+            action_url=defense_url,
+            metadata={
+                "defense_id": defense.id,
+                "defense_date": defense.date.isoformat(),
+                "defense_time": defense.start_time.isoformat(),
+                "location": defense.location,
+                "room": defense.room,
+                "status": defense.status,
+                "changes": list(important_changes)
+            }
+        )
 
 
 class MeetingAdmin(ModelAdmin):
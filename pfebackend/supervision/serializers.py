@@ -228,10 +228,14 @@ class ProjectListSerializer(serializers.ModelSerializer):
     
     def get_team_owner(self, obj):
         """Get the team owner"""
-        owner_membership = TeamMembership.objects.filter(
-            team=obj.team, 
-            role=TeamMembership.ROLE_OWNER
-        ).select_related('user').first()
+        # Memberships are prefetched by the view, pick the owner in memory
+        owner_membership = next(
+            (
+                membership for membership in obj.team.teammembership_set.all()
+                if membership.role == TeamMembership.ROLE_OWNER
+            ),
+            None
+        )
         
         if owner_membership:
             # Use your existing UserSerializer
@@ -240,9 +244,7 @@ class ProjectListSerializer(serializers.ModelSerializer):
     
     def get_team_members(self, obj):
         """Get all team members with roles"""
-        memberships = TeamMembership.objects.filter(
-            team=obj.team
-        ).select_related('user')
+        memberships = obj.team.teammembership_set.all()
         
         # Use your existing TeamMembershipSerializer
         return TeamMembershipSerializer(memberships, many=True).data
@@ -282,17 +282,16 @@ class MeetingService:
         action_url = f"/meetings/{meeting.id}/"
         
         # Send notifications to all team members
-        for member in team_members:
-            NotificationService.create_and_send(
-                recipient=member,
-                title=title,
-                content=content,
-                notification_type='team_meeting',
-                related_object=meeting,
-                priority='high',
-                action_url=action_url,
-                metadata=metadata
-            )
+        NotificationService.create_and_send_bulk(
+            recipients=team_members,
+            title=title,
+            content=content,
+            notification_type='team_meeting',
+            related_object=meeting,
+            priority='high',
+            action_url=action_url,
+            metadata=metadata
+        )
     
     @staticmethod
     def _send_meeting_update_notifications(meeting):
@@ -345,17 +344,16 @@ class MeetingService:
         action_url = f"/meetings/{meeting.id}/"
         
         # Send notifications to all team members
-        for member in team_members:
-            NotificationService.create_and_send(
-                recipient=member,
-                title=title,
-                content=content,
-                notification_type='team_meeting_update',
-                related_object=meeting,
-                priority='high',
-                action_url=action_url,
-                metadata=metadata
-            )
+        NotificationService.create_and_send_bulk(
+            recipients=team_members,
+            title=title,
+            content=content,
+            notification_type='team_meeting_update',
+            related_object=meeting,
+            priority='high',
+            action_url=action_url,
+            metadata=metadata
+        )
     
     @staticmethod
     def _send_meeting_cancellation_notifications(meeting):
@@ -398,17 +396,16 @@ class MeetingService:
         action_url = f"/teams/{meeting.team.id}/"
         
         # Send notifications to all team members
-        for member in team_members:
-            NotificationService.create_and_send(
-                recipient=member,
-                title=title,
-                content=content,
-                notification_type='team_meeting_cancelled',
-                related_object=meeting,
-                priority='medium',
-                action_url=action_url,
-                metadata=metadata
-            )
+        NotificationService.create_and_send_bulk(
+            recipients=team_members,
+            title=title,
+            content=content,
+            notification_type='team_meeting_cancelled',
+            related_object=meeting,
+            priority='medium',
+            action_url=action_url,
+            metadata=metadata
+        )
     
     # @staticmethod
     # def _send_attendance_response_notification(attendance):
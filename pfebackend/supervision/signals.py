@@ -119,25 +119,13 @@ def send_upcoming_meeting_reminders():
         action_url = f"/meetings/{meeting.id}/"
         
         # Send notifications to all team members
-        for member in team_members:
-            # # Check if user has already responded to the meeting
-            # attendance = MeetingAttendance.objects.filter(
-            #     meeting=meeting,
-            #     attendee=member
-            # ).first()
-            
-            # # Add attendance status to content if available
-            # if attendance and attendance.status != MeetingAttendance.STATUS_PENDING:
-            #     status_text = "confirmed" if attendance.status == MeetingAttendance.STATUS_CONFIRMED else "declined"
-            #     content += f"\nYou have {status_text} this meeting."
-            
-            NotificationService.create_and_send(
-                recipient=member,
-                title=title,
-                content=content,
-                notification_type='meeting_reminder',
-                related_object=meeting,
-                priority='high',
-                action_url=action_url,
-                metadata=metadata
-            )
\ No newline at end of file
+        NotificationService.create_and_send_bulk(
+            recipients=team_members,
+            title=title,
+            content=content,
+            notification_type='meeting_reminder',
+            related_object=meeting,
+            priority='high',
+            action_url=action_url,
+            metadata=metadata
+        )
\ No newline at end of file
@@ -27,6 +27,7 @@ from themes.models import ThemeAssignment
 from .filters import ProjectListFilter
 from teams.permissions import IsTeamOwner
 from .permissions import IsJuryPresident
+from users.serializers.base import BaseProfileSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -204,15 +205,14 @@ def get_supervisors_and_teachers(team_id):
 def notify_upload(user, team_id, upload_title):
     """Helper function to send notifications about new uploads"""
     recipients = get_supervisors_and_teachers(team_id)
-    for recipient in recipients:
-        NotificationService.create_and_send(
-            recipient=recipient,
-            content=f"New resource '{upload_title}' uploaded by {user.username}",
-            notification_type="resource_upload",
-            metadata={
-                "profile_picture": user.profile_picture_url,
-            },
-        )
+    NotificationService.create_and_send_bulk(
+        recipients=recipients,
+        content=f"New resource '{upload_title}' uploaded by {user.username}",
+        notification_type="resource_upload",
+        metadata={
+            "profile_picture": user.profile_picture_url,
+        },
+    )
 
 
 class UploadViewSet(viewsets.ModelViewSet):
@@ -245,11 +245,17 @@ class UploadViewSet(viewsets.ModelViewSet):
         
         if is_teacher:
             # Teachers see all uploads, can filter by team using query params
-            return Upload.objects.all().select_related('uploaded_by', 'team')
+            queryset = Upload.objects.all()
         else:
             # Students see only uploads from their teams
             user_team_ids = user.teams.values_list('id', flat=True)
-            return Upload.objects.filter(team_id__in=user_team_ids).select_related('uploaded_by', 'team')
+            queryset = Upload.objects.filter(team_id__in=user_team_ids)
+
+        return queryset.select_related('uploaded_by', 'team').prefetch_related(
+            'comments__author',
+            *BaseProfileSerializer.profile_prefetches('uploaded_by__'),
+            *BaseProfileSerializer.profile_prefetches('comments__author__'),
+        )
 
     @swagger_auto_schema(
         operation_description="""
@@ -611,14 +617,21 @@ class ProjectListView(ListAPIView):
         Get all theme assignments with prefetched related data for performance
         """
         return ThemeAssignment.objects.select_related(
-            'theme', 'team', 'assigned_by'
+            'theme', 'theme__proposed_by', 'team', 'assigned_by'
         ).prefetch_related(
+            'theme__documents',
             'theme__co_supervisors',
             'team__members',
-            'team__uploads',
+            'team__uploads__uploaded_by',
+            'team__uploads__comments__author',
             'team__meetings',
-            'team__teammembership_set',
-            'team__teammembership_set__user'
+            'team__teammembership_set__user',
+            *BaseProfileSerializer.profile_prefetches('assigned_by__'),
+            *BaseProfileSerializer.profile_prefetches('theme__proposed_by__'),
+            *BaseProfileSerializer.profile_prefetches('theme__co_supervisors__'),
+            *BaseProfileSerializer.profile_prefetches('team__teammembership_set__user__'),
+            *BaseProfileSerializer.profile_prefetches('team__uploads__uploaded_by__'),
+            *BaseProfileSerializer.profile_prefetches('team__uploads__comments__author__'),
         ).all()
         
 class DefenseViewSet(viewsets.ModelViewSet):
@@ -640,7 +653,7 @@ class DefenseViewSet(viewsets.ModelViewSet):
         
         # Return all defenses for admin users
         if user.is_staff or user.is_superuser:
-            return Defense.objects.all()
+            return Defense.objects.prefetch_related('jury_members__user')
         
         # For normal users, filter based on their relation to defenses
         return Defense.objects.filter(
@@ -648,7 +661,7 @@ class DefenseViewSet(viewsets.ModelViewSet):
             Q(theme_assignment__team__members=user) |
             # User is part of the jury
             Q(jury=user)
-        ).distinct()
+        ).distinct().prefetch_related('jury_members__user')
         
     def get_serializer_class(self):
         """
@@ -3,6 +3,7 @@ from teams.services.auto_team_assignment_service import AutoTeamAssignmentServic
 
 # example usage : 
 # python manage.py auto_assign_teams 4siw --min_members 3 --max_members 5
+# python manage.py auto_assign_teams 4siw --seed 42 --balance-skills --keep-partial-teams --dry-run
 class Command(BaseCommand):
     help = 'Automatically assign teamless students to teams for a specific academic year'
 
@@ -20,6 +21,22 @@ class Command(BaseCommand):
             default=5,
             help='Maximum number of members per team',
         )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Seed for a reproducible grouping of students',
+        )
+        parser.add_argument(
+            '--balance-skills',
+            action='store_true',
+            help='Balance teams on the students\' skill proficiency',
+        )
+        parser.add_argument(
+            '--keep-partial-teams',
+            action='store_true',
+            help='Fill existing teams that have room before creating new ones',
+        )
         parser.add_argument(
             '--dry-run',
             action='store_true',
@@ -41,24 +58,29 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING("DRY RUN MODE: No actual changes will be made"))
 
         try:
-            if not dry_run:
-                result = AutoTeamAssignmentService.reassign_students_for_year(
-                    academic_year, min_members, max_members
-                )
-            else:
-                self.stdout.write("DRY RUN: Would run reassign_students_for_year")
-                return
+            result = AutoTeamAssignmentService.reassign_students_for_year(
+                academic_year, min_members, max_members,
+                seed=options['seed'],
+                balance_skills=options['balance_skills'],
+                keep_partial_teams=options['keep_partial_teams'],
+                dry_run=dry_run,
+            )
 
             if "error" in result:
                 self.stdout.write(self.style.ERROR(f"Error: {result['error']}"))
                 return
 
-            self.stdout.write(self.style.SUCCESS("\nAssignment Results:"))
+            if dry_run:
+                self.stdout.write(self.style.WARNING("\nPlanned Assignment (rolled back):"))
+            else:
+                self.stdout.write(self.style.SUCCESS("\nAssignment Results:"))
             self.stdout.write(f"Academic Year: {result['academic_year']}")
             self.stdout.write(f"Min Members: {result['min_members']}")
             self.stdout.write(f"Max Members: {result['max_members']}")
             self.stdout.write(f"Teams Deleted: {result['teams_deleted']}")
             self.stdout.write(f"Students Freed from Deleted Teams: {result['students_freed']}")
+            self.stdout.write(f"Existing Teams Filled: {result['teams_filled']}")
+            self.stdout.write(f"Students Added to Existing Teams: {result['students_added_to_existing_teams']}")
             self.stdout.write(f"New Teams Created: {result['teams_created']}")
             self.stdout.write(f"Students Reassigned: {result['students_reassigned']}")
             self.stdout.write(f"Students Remaining Unassigned: {result['students_remaining']}")
@@ -68,5 +90,10 @@ class Command(BaseCommand):
                 for size, count in result['team_distribution'].items():
                     self.stdout.write(f"  Teams with {size} members: {count}")
 
+            if result.get('timings'):
+                self.stdout.write("\nTimings:")
+                for phase, seconds in result['timings'].items():
+                    self.stdout.write(f"  {phase}: {seconds:.3f}s")
+
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"Failed to perform assignment: {str(e)}"))
\ No newline at end of file
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from teams.models import TeamMembership
+from teams.services.team_membership_cache import TeamMembershipCache
+
+
+@receiver(post_save, sender=TeamMembership)
+@receiver(post_delete, sender=TeamMembership)
+def invalidate_user_team_ids(sender, instance, **kwargs):
+    """Drop the cached team ids of a user whose membership changed"""
+    TeamMembershipCache.invalidate([instance.user_id])
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from common.models import AuditableModel
@@ -6,6 +8,30 @@ from users.models import Student
 from .settings import TeamSettings
 
 
+class TeamQuerySet(models.QuerySet):
+    def with_member_stats(self):
+        """
+        Load member counts and owners along with the teams
+
+        Annotates ``annotated_member_count`` and ``annotated_owner_id`` with
+        subqueries (so they are not skewed by joins added by filters) and
+        prefetches the memberships with their users, which TeamSerializer
+        reads instead of querying each team.
+        """
+        from .team_membership import TeamMembership
+
+        memberships = TeamMembership.objects.filter(team=OuterRef('pk')).order_by()
+        member_count = memberships.values('team').annotate(total=Count('pk')).values('total')
+        owner_id = memberships.filter(role=TeamMembership.ROLE_OWNER).order_by('user_id').values('user_id')[:1]
+
+        return self.annotate(
+            annotated_member_count=Coalesce(Subquery(member_count), 0),
+            annotated_owner_id=Subquery(owner_id),
+        ).prefetch_related(
+            Prefetch('teammembership_set', queryset=TeamMembership.objects.select_related('user'))
+        )
+
+
 class Team(AuditableModel):
     """
     Represents a team that can have multiple student members with different roles.
@@ -37,6 +63,8 @@ class Team(AuditableModel):
         help_text="Maximum number of members allowed in this team"
     )
     
+    objects = TeamQuerySet.as_manager()
+    
     class Meta:
         # Add unique constraint for name per academic year
         unique_together = [('academic_year', 'name')]
@@ -25,7 +25,17 @@ class TeamSerializer(serializers.ModelSerializer):
         
     def get_owner(self, obj):
         """Get the owner's username"""
-        owner = obj.owner
+        if hasattr(obj, 'annotated_owner_id'):
+            # Teams from Team.objects.with_member_stats(): no query per team
+            owner = next(
+                (
+                    membership.user for membership in obj.teammembership_set.all()
+                    if membership.user_id == obj.annotated_owner_id
+                ),
+                None
+            )
+        else:
+            owner = obj.owner
         if owner:
             return {
                 'id': owner.id,
@@ -33,13 +43,18 @@ class TeamSerializer(serializers.ModelSerializer):
             }
         return None
     
+    def _member_count(self, obj):
+        if hasattr(obj, 'annotated_member_count'):
+            return obj.annotated_member_count
+        return obj.current_member_count
+
     def get_member_count(self, obj):
         """Get the number of team members"""
-        return obj.current_member_count
+        return self._member_count(obj)
     
     def get_has_capacity(self, obj):
         """Check if the team has capacity for more members"""
-        return obj.has_capacity
+        return self._member_count(obj) < obj.maximum_members
         
     def validate_name(self, value):
         """Ensure team name is unique (case-insensitive) within an academic year"""
@@ -2,10 +2,14 @@ from .team_invitation_service import TeamInvitationService
 from .team_service import TeamService
 from .team_join_request_service import TeamJoinRequestService
 from .auto_team_assignment_service import AutoTeamAssignmentService
+from .team_partition_planner import TeamPartitionPlanner
+from .team_membership_cache import TeamMembershipCache
 
 __all__ = [
     'TeamInvitationService',
     'TeamService',
     'TeamJoinRequestService',
     'AutoTeamAssignmentService',
+    'TeamPartitionPlanner',
+    'TeamMembershipCache',
 ]
\ No newline at end of file
@@ -1,9 +1,12 @@
 from django.db import transaction
-from django.db.models import Count, Q, F
-import random
+from django.db.models import Case, Count, Exists, IntegerField, OuterRef, Sum, Value, When
+from django.db.models.functions import Coalesce
+import time
 import logging
 from users.models import Student
-from teams.models import Team, TeamMembership
+from teams.models import Team, TeamMembership, TeamSettings
+from teams.services.team_partition_planner import TeamPartitionPlanner
+from teams.services.team_membership_cache import TeamMembershipCache
 
 logger = logging.getLogger(__name__)
 
@@ -13,215 +16,450 @@ class AutoTeamAssignmentService:
     This service will:
     1. Delete teams below minimum size (making those students teamless)
     2. Find all teamless students for a given year
-    3. Create new teams with random sizes between min and max
+    3. Create new teams with sizes between min and max
+
+    Team sizes come from ``TeamPartitionPlanner``, which covers every student
+    whenever the min/max bounds allow it. Runs can be made reproducible with a
+    seed, balanced on student skills, and can top up existing partial teams
+    instead of dissolving them.
+
+    All database work is set-based: undersized teams are removed with two DELETE
+    statements, teamless students are found with a single anti-join, and the new
+    teams and memberships are written with chunked bulk_create calls.
     """
-    
+
+    # Number of rows sent per INSERT when writing teams and memberships
+    BULK_BATCH_SIZE = 500
+
+    AUTO_TEAM_NAME_PREFIX = "Auto-Team"
+
+    # Weight of each proficiency level in a student's skill score
+    SKILL_WEIGHTS = {
+        'beginner': 1,
+        'intermediate': 2,
+        'advanced': 3,
+        'expert': 4,
+    }
+
     @classmethod
-    @transaction.atomic
-    def reassign_students_for_year(cls, academic_year, min_members, max_members):
+    def reassign_students_for_year(cls, academic_year, min_members, max_members,
+                                   seed=None, balance_skills=False, keep_partial_teams=False,
+                                   dry_run=False):
         """
         Main entry point to reassign students for a specific academic year based on team size requirements.
-        
+
         Args:
             academic_year (str): The academic year code ('2', '3', '4siw', etc.)
             min_members (int): Minimum number of members required per team
             max_members (int): Maximum number of members allowed per team
-            
+            seed (int): Optional seed making the grouping of students reproducible
+            balance_skills (bool): Spread students evenly by skill proficiency
+            keep_partial_teams (bool): Fill existing teams that have room before
+                creating new ones, and top up undersized teams instead of
+                deleting them whenever enough students are available
+            dry_run (bool): Run the whole reassignment, then roll it back
+
         Returns:
-            dict: Statistics about the reassignments made
+            dict: Statistics about the reassignments made, including a ``timings``
+                  entry with the duration (in seconds) of each phase
         """
         try:
             if min_members <= 0 or max_members <= 0 or min_members > max_members:
                 return {"error": "Invalid min/max values. Min must be positive and less than or equal to max."}
-            
-            logger.info(f"Starting team reassignment for year '{academic_year}' with min={min_members}, max={max_members}")
-            
+
+            logger.info(
+                f"Starting team reassignment for year '{academic_year}' with min={min_members}, max={max_members}, "
+                f"seed={seed}, balance_skills={balance_skills}, keep_partial_teams={keep_partial_teams}"
+            )
+
+            started_at = time.perf_counter()
+            timings = {}
+
             stats = {
                 "academic_year": academic_year,
                 "min_members": min_members,
                 "max_members": max_members,
+                "seed": seed,
+                "dry_run": dry_run,
                 "teams_deleted": 0,
+                "students_freed": 0,
+                "teams_filled": 0,
+                "students_added_to_existing_teams": 0,
                 "teams_created": 0,
                 "students_reassigned": 0,
                 "students_remaining": 0,
-                "team_distribution": {}
+                "team_distribution": {},
+                "timings": timings,
             }
-            
-            # Step 1: Delete teams with fewer members than the minimum
-            deleted_teams = cls._delete_undersized_teams(academic_year, min_members)
-            stats["teams_deleted"] = deleted_teams["count"]
-            stats["students_freed"] = deleted_teams["students_freed"]
-            
-            # Step 2: Get all teamless students for this year
-            teamless_students = cls._get_teamless_students(academic_year)
-            
-            # Step 3: Create new teams with random sizes and assign students
-            if teamless_students:
-                result = cls._create_teams_and_assign_students(teamless_students, academic_year, min_members, max_members)
-                stats.update(result)
-            
-            logger.info(f"Team reassignment completed: {stats['students_reassigned']} students reassigned to {stats['teams_created']} teams")
+
+            with transaction.atomic():
+                # Step 1: Delete teams with fewer members than the minimum
+                phase_start = time.perf_counter()
+                if keep_partial_teams:
+                    team_limit = cls._team_limit(academic_year, min_members, max_members)
+                    planner = TeamPartitionPlanner(min_members, team_limit, seed=seed)
+                    deleted_teams = cls._dissolve_unrecoverable_teams(academic_year, planner)
+                else:
+                    deleted_teams = cls._delete_undersized_teams(academic_year, min_members)
+                stats["teams_deleted"] = deleted_teams["count"]
+                stats["students_freed"] = deleted_teams["students_freed"]
+                timings["delete_undersized"] = time.perf_counter() - phase_start
+
+                # Step 2: Get all teamless students for this year
+                phase_start = time.perf_counter()
+                teamless_students = cls._get_teamless_students(academic_year, with_skill_scores=balance_skills)
+                timings["find_teamless"] = time.perf_counter() - phase_start
+
+                # Step 3: Fill partial teams, create new teams and assign students
+                if teamless_students:
+                    result = cls._create_teams_and_assign_students(
+                        teamless_students, academic_year, min_members, max_members, timings=timings,
+                        seed=seed, balance_skills=balance_skills, keep_partial_teams=keep_partial_teams
+                    )
+                    stats.update(result)
+
+                if dry_run:
+                    transaction.set_rollback(True)
+
+            timings["total"] = time.perf_counter() - started_at
+
+            logger.info(
+                f"Team reassignment {'simulated' if dry_run else 'completed'}: "
+                f"{stats['students_reassigned']} students reassigned "
+                f"to {stats['teams_created']} new and {stats['teams_filled']} existing teams "
+                f"in {timings['total']:.3f}s"
+            )
             return stats
-            
+
         except Exception as e:
             logger.exception(f"Error during team reassignment: {str(e)}")
             return {"error": str(e)}
-    
+
+    @staticmethod
+    def _team_limit(academic_year, min_members, max_members):
+        """
+        Get the maximum team size, capped by the year's ``TeamSettings``.
+
+        Team.clean() caps maximum_members to the year's global setting, so
+        every planned team must fit under it.
+
+        Raises:
+            ValueError: If the setting is below the requested minimum
+        """
+        team_limit = min(max_members, TeamSettings.get_maximum_members(year=academic_year))
+        if team_limit < min_members:
+            raise ValueError(
+                f"Team settings for year {academic_year} allow at most {team_limit} members, "
+                f"which is below the requested minimum of {min_members}."
+            )
+        return team_limit
+
     @classmethod
     def _delete_undersized_teams(cls, academic_year, min_members):
         """
         Delete teams that have fewer members than the minimum required.
-        
+
+        The undersized teams and their member counts are read with a single
+        aggregate query, then memberships and teams are removed with one
+        DELETE each.
+
         Args:
             academic_year (str): The academic year code
             min_members (int): Minimum number of members required
-            
+
         Returns:
             dict: Statistics about the deletion
         """
         # Find teams below minimum size
-        undersized_teams = Team.objects.filter(
-            academic_year=academic_year
-        ).annotate(
-            member_count=Count('members')
-        ).filter(
-            member_count__lt=min_members
+        undersized_teams = list(
+            Team.objects.filter(
+                academic_year=academic_year
+            ).annotate(
+                member_count=Count('members')
+            ).filter(
+                member_count__lt=min_members
+            ).values_list('id', 'member_count')
         )
-        
-        deleted_count = 0
-        students_freed = 0
-        
-        for team in undersized_teams:
-            # Count members before deletion for statistics
-            member_count = team.members.count()
-            students_freed += member_count
-            
-            # Delete team memberships (will free the students)
-            TeamMembership.objects.filter(team=team).delete()
-            
-            # Delete the team
-            team.delete()
-            deleted_count += 1
-            
-            logger.debug(f"Deleted undersized team '{team.name}' with {member_count} members")
-        
+
+        return cls._delete_teams(undersized_teams)
+
+    @classmethod
+    def _dissolve_unrecoverable_teams(cls, academic_year, planner):
+        """
+        Delete only the undersized teams that cannot be topped up to the minimum.
+
+        The planner keeps the teams closest to the minimum for as long as the
+        teamless students, plus the members of the teams that are dissolved,
+        can fill their missing places.
+
+        Args:
+            academic_year (str): The academic year code
+            planner (TeamPartitionPlanner): Planner holding the size bounds
+
+        Returns:
+            dict: Statistics about the deletion
+        """
+        undersized_teams = list(
+            Team.objects.filter(
+                academic_year=academic_year
+            ).annotate(
+                member_count=Count('members')
+            ).filter(
+                member_count__lt=planner.min_members
+            ).values_list('id', 'member_count')
+        )
+
+        if not undersized_teams:
+            return cls._delete_teams([])
+
+        teamless_count = cls._teamless_students_queryset(academic_year).count()
+        _, dissolved_ids = planner.select_teams_to_keep(teamless_count, undersized_teams)
+
+        dissolved_ids = set(dissolved_ids)
+        return cls._delete_teams([team for team in undersized_teams if team[0] in dissolved_ids])
+
+    @staticmethod
+    def _delete_teams(teams):
+        """
+        Delete the given (team_id, member_count) pairs with one DELETE for the
+        memberships and one for the teams.
+
+        Memberships are deleted without ``post_delete`` signals, which would
+        load every row; the cached team ids of their users are invalidated
+        once instead.
+        """
+        if not teams:
+            logger.info("No undersized teams to delete")
+            return {"count": 0, "students_freed": 0}
+
+        team_ids = [team_id for team_id, _ in teams]
+        students_freed = sum(member_count for _, member_count in teams)
+
+        # Delete team memberships (will free the students), then the teams
+        memberships = TeamMembership.objects.filter(team_id__in=team_ids)
+        TeamMembershipCache.invalidate(memberships.values_list('user_id', flat=True))
+        memberships._raw_delete(memberships.db)
+        Team.objects.filter(id__in=team_ids).delete()
+
+        deleted_count = len(team_ids)
         logger.info(f"Deleted {deleted_count} undersized teams, freeing {students_freed} students")
-        
+
         return {
             "count": deleted_count,
             "students_freed": students_freed
         }
-    
+
     @staticmethod
-    def _get_teamless_students(academic_year):
+    def _teamless_students_queryset(academic_year):
+        """Active students of the given year without a team of that year"""
+        has_team = TeamMembership.objects.filter(
+            user_id=OuterRef('user_id'),
+            team__academic_year=academic_year
+        )
+
+        return Student.objects.filter(
+            current_year=academic_year,
+            academic_status='active'
+        ).filter(
+            ~Exists(has_team)
+        )
+
+    @classmethod
+    def _get_teamless_students(cls, academic_year, with_skill_scores=False):
         """
         Get active students for the given year who don't have a team.
-        
+
+        Uses a single NOT EXISTS anti-join against team memberships instead of
+        comparing every student against a separate queryset in Python.
+
         Args:
             academic_year (str): The academic year code
-            
+            with_skill_scores (bool): Annotate each student with ``skill_score``,
+                the weighted sum of their skill proficiencies, in the same query
+
         Returns:
-            list: Student objects without teams
+            list: Student objects without teams, ordered by id
         """
-        # Get students in this year who are active
-        all_students = Student.objects.filter(
-            current_year=academic_year,
-            academic_status='active'
-        ).select_related('user')
-        
-        # Find students who are in any team for this year
-        students_with_teams = Student.objects.filter(
-            current_year=academic_year,
-            user__teams__academic_year=academic_year
-        ).values_list('id', flat=True).distinct()
-        
-        # Filter out students who already have teams
-        teamless_students = [s for s in all_students if s.id not in students_with_teams]
-        
+        queryset = cls._teamless_students_queryset(academic_year)
+
+        if with_skill_scores:
+            queryset = queryset.annotate(
+                skill_score=Coalesce(
+                    Sum(Case(
+                        *[When(skills__proficiency_level=level, then=Value(weight))
+                          for level, weight in cls.SKILL_WEIGHTS.items()],
+                        default=Value(0),
+                        output_field=IntegerField(),
+                    )),
+                    Value(0),
+                )
+            )
+
+        teamless_students = list(queryset.only('id', 'user', 'current_year').order_by('id'))
+
         logger.info(f"Found {len(teamless_students)} teamless students for year {academic_year}")
-        
+
         return teamless_students
-    
+
     @classmethod
-    def _create_teams_and_assign_students(cls, students, academic_year, min_members, max_members):
+    def _next_auto_team_number(cls, academic_year):
         """
-        Create new teams with random sizes between min and max, and assign students to them.
-        
+        Get the first free number for automatically named teams of a year,
+        so reruns never collide with the (academic_year, name) unique constraint.
+        """
+        prefix = f"{cls.AUTO_TEAM_NAME_PREFIX}-{academic_year}-"
+        existing_names = Team.objects.filter(
+            academic_year=academic_year,
+            name__startswith=prefix
+        ).values_list('name', flat=True)
+
+        highest = 0
+        for name in existing_names:
+            try:
+                highest = max(highest, int(name[len(prefix):]))
+            except ValueError:
+                continue
+
+        return highest + 1
+
+    @classmethod
+    def _create_teams_and_assign_students(cls, students, academic_year, min_members, max_members, timings=None,
+                                          seed=None, balance_skills=False, keep_partial_teams=False):
+        """
+        Create new teams with sizes between min and max, and assign students to them.
+
+        The whole partition is planned in memory first by ``TeamPartitionPlanner``;
+        teams and memberships are then written with chunked ``bulk_create`` calls.
+        Model validation is not run per row: every student passed in is an
+        active, teamless student of ``academic_year`` and every team either is
+        new or was planned within its capacity, which is exactly what
+        ``TeamMembership.clean`` would check.
+
         Args:
             students (list): List of Student objects to assign
             academic_year (str): The academic year code
             min_members (int): Minimum number of members per team
             max_members (int): Maximum number of members per team
-            
+            timings (dict): Optional dict that receives per-phase durations
+            seed (int): Optional seed for a reproducible grouping
+            balance_skills (bool): Balance teams on the students' ``skill_score``
+            keep_partial_teams (bool): Fill existing teams of the year that have room first
+
         Returns:
             dict: Statistics about the assignments made
         """
+        if timings is None:
+            timings = {}
+
         if not students:
             return {
+                "teams_filled": 0,
+                "students_added_to_existing_teams": 0,
                 "teams_created": 0,
                 "students_reassigned": 0,
                 "students_remaining": 0,
                 "team_distribution": {}
             }
-        
-        # Shuffle students for randomization
-        random.shuffle(students)
-        
-        teams_created = 0
-        students_reassigned = 0
+
+        # Plan the whole partition in memory
+        phase_start = time.perf_counter()
+
+        team_limit = cls._team_limit(academic_year, min_members, max_members)
+
+        partial_teams = []
+        if keep_partial_teams:
+            partial_teams = list(
+                Team.objects.filter(
+                    academic_year=academic_year
+                ).annotate(
+                    member_count=Count('members')
+                ).order_by('id').values_list('id', 'member_count', 'maximum_members')
+            )
+
+        skill_scores = None
+        if balance_skills:
+            skill_scores = {student: getattr(student, 'skill_score', 0) for student in students}
+
+        planner = TeamPartitionPlanner(min_members, team_limit, seed=seed)
+        plan = planner.plan(students, partial_teams=partial_teams, skill_scores=skill_scores)
+
+        first_number = cls._next_auto_team_number(academic_year) if plan["new_teams"] else 0
+
+        teams = []
         team_distribution = {}
-        
-        # Keep track of remaining students
-        remaining_students = students.copy()
-        
-        # Create teams until we run out of students or can't form a minimum-sized team
-        while len(remaining_students) >= min_members:
-            # Randomly decide team size between min and max
-            # But don't exceed available students
-            team_size = min(random.randint(min_members, max_members), len(remaining_students))
-            
-            # Create team
-            team_name = f"Auto-Team-{academic_year}-{teams_created + 1}"
-            team = Team(
-                name=team_name,
+        for index, group in enumerate(plan["new_teams"]):
+            teams.append(Team(
+                name=f"{cls.AUTO_TEAM_NAME_PREFIX}-{academic_year}-{first_number + index}",
                 description=f"Automatically created team for {academic_year} academic year",
                 academic_year=academic_year,
-                maximum_members=max_members,
-                # You might need to set created_by and updated_by if these are required
-                # Use a system user or get it from elsewhere
-            )
-            team.save()
-            
-            # Take team_size students from remaining_students
-            team_members = remaining_students[:team_size]
-            remaining_students = remaining_students[team_size:]
-            
-            # Create memberships for these students
-            first_student = True
-            for student in team_members:
-                role = TeamMembership.ROLE_OWNER if first_student else TeamMembership.ROLE_MEMBER
-                TeamMembership.objects.create(
-                    user=student.user,
-                    team=team,
-                    role=role
-                )
-                first_student = False
-            
-            # Update statistics
-            teams_created += 1
-            students_reassigned += team_size
-            
+                maximum_members=team_limit,
+            ))
+
             # Track team size distribution
-            if team_size not in team_distribution:
-                team_distribution[team_size] = 0
-            team_distribution[team_size] += 1
-            
-            logger.debug(f"Created team '{team_name}' with {team_size} members")
-        
+            team_distribution[len(group)] = team_distribution.get(len(group), 0) + 1
+
+        timings["plan"] = time.perf_counter() - phase_start
+
+        # Write the teams, then the memberships
+        phase_start = time.perf_counter()
+        created_teams = cls._bulk_create_teams(teams, academic_year) if teams else []
+        timings["create_teams"] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        memberships = []
+        for team_id, new_members in plan["fills"].items():
+            for student in new_members:
+                memberships.append(TeamMembership(
+                    user_id=student.user_id,
+                    team_id=team_id,
+                    role=TeamMembership.ROLE_MEMBER,
+                ))
+        for team, team_members in zip(created_teams, plan["new_teams"]):
+            for position, student in enumerate(team_members):
+                memberships.append(TeamMembership(
+                    user_id=student.user_id,
+                    team_id=team.id,
+                    role=TeamMembership.ROLE_OWNER if position == 0 else TeamMembership.ROLE_MEMBER,
+                ))
+        if memberships:
+            TeamMembership.objects.bulk_create(memberships, batch_size=cls.BULK_BATCH_SIZE)
+            # bulk_create sends no post_save, so drop the cached team ids here
+            TeamMembershipCache.invalidate(membership.user_id for membership in memberships)
+        timings["create_memberships"] = time.perf_counter() - phase_start
+
+        logger.debug(
+            f"Created {len(created_teams)} teams, filled {len(plan['fills'])} existing teams, "
+            f"{len(memberships)} memberships in total"
+        )
+
         # Return statistics
         return {
-            "teams_created": teams_created,
-            "students_reassigned": students_reassigned, 
-            "students_remaining": len(remaining_students),
+            "teams_filled": len(plan["fills"]),
+            "students_added_to_existing_teams": sum(len(group) for group in plan["fills"].values()),
+            "teams_created": len(created_teams),
+            "students_reassigned": len(memberships),
+            "students_remaining": len(plan["unassigned"]),
             "team_distribution": team_distribution
-        }
\ No newline at end of file
+        }
+
+    @classmethod
+    def _bulk_create_teams(cls, teams, academic_year):
+        """
+        Insert teams in chunks and make sure every instance has its primary key.
+
+        Backends that cannot return ids from a bulk INSERT get them back with
+        one lookup on the (academic_year, name) unique pair.
+        """
+        created = Team.objects.bulk_create(teams, batch_size=cls.BULK_BATCH_SIZE)
+
+        if any(team.pk is None for team in created):
+            ids_by_name = dict(
+                Team.objects.filter(
+                    academic_year=academic_year,
+                    name__in=[team.name for team in created]
+                ).values_list('name', 'id')
+            )
+            for team in created:
+                team.pk = ids_by_name[team.name]
+
+        return created
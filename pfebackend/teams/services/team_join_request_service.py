@@ -59,41 +59,40 @@ class TeamJoinRequestService:
                 requester_name = requester.get_full_name() or requester.username
                 team_name = escape(team.name)
                 
-                for owner in team_owners:
-                    # Create notification content
-                    title = f"Team Join Request: {team_name}"
-                    content = f"{requester_name} has requested to join your team '{team_name}'"
-                    
-                    # Add message if provided
-                    if message:
-                        content += f"\nMessage: \"{message}\""
-                    
-                    # Metadata for rich rendering
-                    metadata = {
-                        'join_request_id': join_request.id,
-                        'team_id': team.id,
-                        'team_name': team.name,
-                        'profile_picture': requester.profile_picture_url,
-                        'requester': {
-                            'id': requester.id,
-                            'username': requester.username,
-                            'name': requester_name,
-                        }
+                # Create notification content
+                title = f"Team Join Request: {team_name}"
+                content = f"{requester_name} has requested to join your team '{team_name}'"
+                
+                # Add message if provided
+                if message:
+                    content += f"\nMessage: \"{message}\""
+                
+                # Metadata for rich rendering
+                metadata = {
+                    'join_request_id': join_request.id,
+                    'team_id': team.id,
+                    'team_name': team.name,
+                    'profile_picture': requester.profile_picture_url,
+                    'requester': {
+                        'id': requester.id,
+                        'username': requester.username,
+                        'name': requester_name,
                     }
-                    
-                    # Create action URL for the request
-                    action_url = f"/join-requests/{join_request.id}/"
-                    
-                    NotificationService.create_and_send(
-                        recipient=owner,
-                        title=title,
-                        content=content,
-                        notification_type='team_join_request',
-                        related_object=join_request,
-                        priority='medium',
-                        action_url=action_url,
-                        metadata=metadata
-                    )
+                }
+                
+                # Create action URL for the request
+                action_url = f"/join-requests/{join_request.id}/"
+                
+                NotificationService.create_and_send_bulk(
+                    recipients=team_owners,
+                    title=title,
+                    content=content,
+                    notification_type='team_join_request',
+                    related_object=join_request,
+                    priority='medium',
+                    action_url=action_url,
+                    metadata=metadata
+                )
                 
                 return join_request
                 
@@ -284,20 +283,19 @@ class TeamJoinRequestService:
                 teammembership__role=TeamMembership.ROLE_OWNER
             )
             
-            for owner in team_owners:
-                NotificationService.create_and_send(
-                    recipient=owner,
-                    title="Join Request Cancelled",
-                    content=f"{requester_name} has cancelled their request to join '{team.name}'",
-                    notification_type='team_update',
-                    related_object=team,
-                    priority='low',
-                    metadata={
-                        'team_id': team.id,
-                        'event_type': 'join_request_cancelled',
-                        'profile_picture': user.profile_picture_url,
-                    }
-                )
+            NotificationService.create_and_send_bulk(
+                recipients=team_owners,
+                title="Join Request Cancelled",
+                content=f"{requester_name} has cancelled their request to join '{team.name}'",
+                notification_type='team_update',
+                related_object=team,
+                priority='low',
+                metadata={
+                    'team_id': team.id,
+                    'event_type': 'join_request_cancelled',
+                    'profile_picture': user.profile_picture_url,
+                }
+            )
             
             return True
             
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from django.core.cache import cache
+from django.db import transaction
+from common.cache import shared_timeout
+from teams.models import TeamMembership
+import threading
+import time
+
+
+class TeamMembershipCache:
+    """
+    Two-level cache of the ids of the teams each user belongs to
+
+    Lookups are served from process memory first, then from the Redis cache
+    (``CACHES``) and only then from the database. Membership changes delete
+    the Redis entry and this process's copy once the transaction commits;
+    other processes drop their in-memory copy after ``LOCAL_TIMEOUT``
+    seconds at the latest, which bounds how long a removed member keeps
+    access. With a per-process cache (``CACHE_BACKEND='local'``) the second
+    level is kept no longer than the first, so the bound still holds.
+
+    Process memory holds at most ``LOCAL_MAX_ENTRIES`` users, the least
+    recently looked up are dropped first.
+    """
+
+    # Seconds a team id set is kept in process memory
+    LOCAL_TIMEOUT = 30
+    # Users whose team ids are kept in process memory
+    LOCAL_MAX_ENTRIES = 10000
+    # Seconds a team id set is kept in the shared cache
+    SHARED_TIMEOUT = 60 * 60
+
+    _local = OrderedDict()  # user_id -> (expires_at, frozenset of team ids)
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(user_id):
+        return f'user_team_ids_{user_id}'
+
+    @classmethod
+    def get_local(cls, user_id):
+        """
+        Get a user's team ids from process memory only
+
+        Returns:
+            frozenset|None: Team ids, or None when not cached in this process
+        """
+        with cls._lock:
+            entry = cls._local.get(user_id)
+            if entry:
+                cls._local.move_to_end(user_id)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    @classmethod
+    def get_team_ids(cls, user_id):
+        """
+        Get the ids of the teams a user belongs to
+
+        Args:
+            user_id: Id of the user
+
+        Returns:
+            frozenset: Team ids
+        """
+        team_ids = cls.get_local(user_id)
+        if team_ids is not None:
+            return team_ids
+
+        team_ids = cache.get(cls._cache_key(user_id))
+        if team_ids is None:
+            team_ids = frozenset(
+                TeamMembership.objects.filter(user_id=user_id).values_list('team_id', flat=True)
+            )
+            cache.set(
+                cls._cache_key(user_id), team_ids, shared_timeout(cls.SHARED_TIMEOUT, cls.LOCAL_TIMEOUT)
+            )
+
+        with cls._lock:
+            cls._local[user_id] = (time.monotonic() + cls.LOCAL_TIMEOUT, team_ids)
+            cls._local.move_to_end(user_id)
+            while len(cls._local) > cls.LOCAL_MAX_ENTRIES:
+                cls._local.popitem(last=False)
+        return team_ids
+
+    @classmethod
+    def is_member(cls, user_id, team_id):
+        """Whether a user belongs to a team"""
+        return team_id in cls.get_team_ids(user_id)
+
+    @classmethod
+    def invalidate(cls, user_ids):
+        """
+        Forget the team ids of the given users once the current transaction commits
+
+        Args:
+            user_ids: Iterable of user ids whose memberships changed
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+
+        def _invalidate():
+            with cls._lock:
+                for user_id in user_ids:
+                    cls._local.pop(user_id, None)
+            cache.delete_many([cls._cache_key(user_id) for user_id in user_ids])
+
+        transaction.on_commit(_invalidate)
+
+    @classmethod
+    def clear_local(cls):
+        with cls._lock:
+            cls._local.clear()
@@ -0,0 +1,245 @@
+import random
+
+
+class TeamPartitionPlanner:
+    """
+    Plans how a cohort of teamless students is split into teams.
+
+    Unlike drawing random team sizes, the planner always finds sizes between
+    ``min_members`` and ``max_members`` that cover every student whenever such
+    a partition exists, and otherwise places as many students as possible.
+    Team sizes are as even as possible and fully deterministic; the order in
+    which students are dealt into teams comes from a ``random.Random`` seeded
+    with ``seed`` (system randomness when no seed is given).
+
+    The planner can optionally:
+    - fill existing partial teams before creating new ones, topping up teams
+      below the minimum first and only using spare capacity when the leftover
+      students can still form valid teams
+    - balance teams on a per-student skill score with a snake draft
+
+    Every step is linear in the number of students and teams, so a whole
+    cohort (or several academic years) can be planned in one pass.
+    """
+
+    def __init__(self, min_members, max_members, seed=None):
+        if min_members <= 0 or max_members <= 0 or min_members > max_members:
+            raise ValueError("Invalid min/max values. Min must be positive and less than or equal to max.")
+
+        self.min_members = min_members
+        self.max_members = max_members
+        self.seed = seed
+        self._random = random.Random(seed)
+
+    def team_sizes(self, student_count):
+        """
+        Get the team sizes for ``student_count`` students without existing teams.
+
+        Uses the fewest teams that can hold everybody and spreads students as
+        evenly as possible between them. When no valid partition exists, the
+        largest number of students that can be placed is used instead.
+
+        Args:
+            student_count (int): Number of students to place
+
+        Returns:
+            list: Team sizes, largest first
+        """
+        if student_count < self.min_members:
+            return []
+
+        team_count = -(-student_count // self.max_members)  # ceil division
+        if team_count * self.min_members <= student_count:
+            base, extra = divmod(student_count, team_count)
+            return [base + 1] * extra + [base] * (team_count - extra)
+
+        # No exact partition: as many full teams as the minimum size allows
+        return [self.max_members] * (student_count // self.min_members)
+
+    def placeable(self, student_count):
+        """Get how many of ``student_count`` students can be placed in new teams"""
+        return sum(self.team_sizes(student_count))
+
+    def select_teams_to_keep(self, teamless_count, undersized_teams):
+        """
+        Decide which teams below the minimum size can be topped up instead of dissolved.
+
+        Teams with the smallest deficit are kept first. A team is kept only if
+        the teamless students, plus the members freed by the teams that are
+        dissolved, are enough to bring every kept team up to the minimum.
+
+        Args:
+            teamless_count (int): Number of students currently without a team
+            undersized_teams (list): (team_id, member_count) pairs below the minimum
+
+        Returns:
+            tuple: (kept_team_ids, dissolved_team_ids)
+        """
+        ordered = sorted(undersized_teams, key=lambda team: (self.min_members - team[1], team[0]))
+
+        freed_total = sum(member_count for _, member_count in ordered)
+        required = 0
+        freed_by_dissolved = freed_total
+        kept_count = 0
+
+        for _, member_count in ordered:
+            deficit = self.min_members - member_count
+            # Keeping this team costs its deficit and stops freeing its members
+            if required + deficit > teamless_count + freed_by_dissolved - member_count:
+                break
+            required += deficit
+            freed_by_dissolved -= member_count
+            kept_count += 1
+
+        kept = [team_id for team_id, _ in ordered[:kept_count]]
+        dissolved = [team_id for team_id, _ in ordered[kept_count:]]
+        return kept, dissolved
+
+    def plan(self, students, partial_teams=None, skill_scores=None):
+        """
+        Plan the assignment of ``students`` to existing and new teams.
+
+        Args:
+            students (list): Student objects (or ids) to place
+            partial_teams (list): Optional (team_id, member_count) or
+                (team_id, member_count, capacity) tuples for existing teams
+                that may receive new members; capacity defaults to max_members
+            skill_scores (dict): Optional mapping of student to skill score;
+                when given, teams are balanced with a snake draft
+
+        Returns:
+            dict: ``fills`` maps team_id to the students added to that team,
+                  ``new_teams`` lists the members of each team to create (the
+                  first one is the owner) and ``unassigned`` holds the students
+                  that could not be placed
+        """
+        partial_teams = [
+            (team[0], team[1], min(team[2], self.max_members) if len(team) > 2 else self.max_members)
+            for team in (partial_teams or [])
+        ]
+        partial_teams = [team for team in partial_teams if team[1] < team[2]]
+        student_count = len(students)
+
+        fill_targets = self._fill_targets(student_count, partial_teams)
+        filled = sum(fill_targets.values())
+        new_sizes = self.team_sizes(student_count - filled)
+
+        targets = [count for count in fill_targets.values()] + new_sizes
+        ordered_students = self._order_students(students, skill_scores)
+        placed = sum(targets)
+
+        if skill_scores is not None:
+            groups = self._snake_draft(ordered_students[:placed], targets)
+        else:
+            groups = []
+            offset = 0
+            for size in targets:
+                groups.append(ordered_students[offset:offset + size])
+                offset += size
+
+        fill_team_ids = list(fill_targets.keys())
+        return {
+            "fills": {
+                team_id: group
+                for team_id, group in zip(fill_team_ids, groups[:len(fill_team_ids)])
+                if group
+            },
+            "new_teams": groups[len(fill_team_ids):],
+            "unassigned": ordered_students[placed:],
+        }
+
+    def _fill_targets(self, student_count, partial_teams):
+        """
+        Get how many new members each partial team receives.
+
+        Teams below the minimum are topped up first (smallest deficit first).
+        Spare capacity up to the maximum is then used only as far as the
+        remaining students can still be split into valid new teams.
+        """
+        targets = {team_id: 0 for team_id, _, _ in partial_teams}
+        available = student_count
+
+        # Required top-ups for teams below the minimum
+        for team_id, member_count, capacity in sorted(partial_teams, key=lambda team: self.min_members - team[1]):
+            deficit = max(0, self.min_members - member_count)
+            if deficit and deficit <= available and self.min_members <= capacity:
+                targets[team_id] = deficit
+                available -= deficit
+
+        # Optional capacity, keeping the remainder partitionable
+        spare = {
+            team_id: capacity - member_count - targets[team_id]
+            for team_id, member_count, capacity in partial_teams
+            if member_count + targets[team_id] >= self.min_members
+        }
+        capacity = sum(spare.values())
+
+        # Largest fill that places the most students; stops at the first full cover
+        best_fill = 0
+        best_placed = -1
+        for fill in range(min(available, capacity), -1, -1):
+            placed = fill + self.placeable(available - fill)
+            if placed > best_placed:
+                best_fill, best_placed = fill, placed
+            if placed == available:
+                break
+
+        # Hand out the optional slots one at a time, round-robin
+        remaining = best_fill
+        open_teams = [team_id for team_id, slots in spare.items() if slots > 0]
+        while remaining and open_teams:
+            still_open = []
+            for team_id in open_teams:
+                if not remaining:
+                    break
+                targets[team_id] += 1
+                spare[team_id] -= 1
+                remaining -= 1
+                if spare[team_id]:
+                    still_open.append(team_id)
+            open_teams = still_open
+
+        return {team_id: count for team_id, count in targets.items() if count}
+
+    def _order_students(self, students, skill_scores):
+        """
+        Get the order in which students are dealt into teams.
+
+        Students are shuffled with the planner's seed. With skill scores, they
+        are then bucketed by score (highest first), keeping the shuffled order
+        inside each bucket, which stays linear for the small integer scores.
+        """
+        ordered = list(students)
+        self._random.shuffle(ordered)
+
+        if skill_scores is None:
+            return ordered
+
+        buckets = {}
+        for student in ordered:
+            buckets.setdefault(skill_scores.get(student, 0), []).append(student)
+
+        return [student for score in sorted(buckets, reverse=True) for student in buckets[score]]
+
+    @staticmethod
+    def _snake_draft(ordered_students, targets):
+        """
+        Deal students into groups of the given sizes in snake order
+        (1..n, n..1, ...), so strong and weak students are spread evenly.
+        """
+        groups = [[] for _ in targets]
+        open_groups = [index for index, size in enumerate(targets) if size]
+        position = 0
+        forward = True
+
+        while position < len(ordered_students) and open_groups:
+            sequence = open_groups if forward else list(reversed(open_groups))
+            for index in sequence:
+                if position >= len(ordered_students):
+                    break
+                groups[index].append(ordered_students[position])
+                position += 1
+            open_groups = [index for index in open_groups if len(groups[index]) < targets[index]]
+            forward = not forward
+
+        return groups
@@ -6,7 +6,8 @@ from .services.auto_team_assignment_service import AutoTeamAssignmentService
 logger = logging.getLogger(__name__)
 
 @shared_task
-def reassign_students_task(academic_year, min_members, max_members):
+def reassign_students_task(academic_year, min_members, max_members,
+                           seed=None, balance_skills=False, keep_partial_teams=False):
     """
     Celery task to automatically reassign students to teams
     based on minimum and maximum team size requirements.
@@ -15,6 +16,9 @@ def reassign_students_task(academic_year, min_members, max_members):
         academic_year (str): The academic year code ('2', '3', '4siw', etc.)
         min_members (int): Minimum number of members required per team
         max_members (int): Maximum number of members allowed per team
+        seed (int): Optional seed making the grouping of students reproducible
+        balance_skills (bool): Spread students evenly by skill proficiency
+        keep_partial_teams (bool): Fill existing teams before creating new ones
         
     Returns:
         dict: Statistics about the reassignments made
@@ -23,7 +27,8 @@ def reassign_students_task(academic_year, min_members, max_members):
     
     try:
         result = AutoTeamAssignmentService.reassign_students_for_year(
-            academic_year, min_members, max_members
+            academic_year, min_members, max_members,
+            seed=seed, balance_skills=balance_skills, keep_partial_teams=keep_partial_teams
         )
         
         if "error" in result:
@@ -0,0 +1,222 @@
+from django.core.cache import cache
+from django.test import TestCase
+from users.models import User, Student, StudentSkill
+from teams.models import Team, TeamMembership, TeamSettings
+from teams.services.auto_team_assignment_service import AutoTeamAssignmentService
+
+
+class AutoTeamAssignmentServiceTests(TestCase):
+    """Tests for the bulk team reassignment engine"""
+
+    academic_year = '4siw'
+
+    def _create_student(self, index, academic_year=None, academic_status='active'):
+        user = User.objects.create_user(
+            email=f'student{index}@test.com',
+            username=f'student{index}',
+            password='pass123',
+            first_name=f'Student{index}',
+            last_name='Test',
+            user_type='student'
+        )
+        Student.objects.create(
+            user=user,
+            matricule=f'MAT{index:04d}',
+            enrollment_year=2023,
+            current_year=academic_year or self.academic_year,
+            academic_status=academic_status
+        )
+        return user
+
+    def _create_team(self, name, users):
+        team = Team.objects.create(
+            name=name,
+            academic_year=self.academic_year,
+            maximum_members=6
+        )
+        for position, user in enumerate(users):
+            TeamMembership.objects.create(
+                team=team,
+                user=user,
+                role=TeamMembership.ROLE_OWNER if position == 0 else TeamMembership.ROLE_MEMBER
+            )
+        return team
+
+    def setUp(self):
+        self.users = [self._create_student(i) for i in range(12)]
+
+    def test_invalid_bounds_return_error(self):
+        """Test that min greater than max is rejected"""
+        result = AutoTeamAssignmentService.reassign_students_for_year(self.academic_year, 4, 3)
+        self.assertIn('error', result)
+
+    def test_undersized_teams_are_deleted_and_students_reassigned(self):
+        """Test that undersized teams are removed and their members regrouped"""
+        full_team = self._create_team('Full', self.users[:3])
+        self._create_team('Small', self.users[3:4])
+
+        result = AutoTeamAssignmentService.reassign_students_for_year(self.academic_year, 3, 3)
+
+        self.assertNotIn('error', result)
+        self.assertEqual(result['teams_deleted'], 1)
+        self.assertEqual(result['students_freed'], 1)
+        self.assertEqual(result['teams_created'], 3)
+        self.assertEqual(result['students_reassigned'], 9)
+        self.assertEqual(result['students_remaining'], 0)
+        self.assertFalse(Team.objects.filter(name='Small').exists())
+        self.assertEqual(full_team.members.count(), 3)
+
+        # Every active student of the year is now in exactly one team
+        for user in self.users:
+            self.assertEqual(TeamMembership.objects.filter(user=user).count(), 1)
+
+    def test_deleted_memberships_invalidate_cache_without_signals(self):
+        """Test that deleting teams invalidates cached team ids without a signal per membership"""
+        from django.db.models.signals import post_delete
+        from teams.services import TeamMembershipCache
+
+        cache.clear()
+        TeamMembershipCache.clear_local()
+        small_team = self._create_team('Small', self.users[:2])
+        self.assertTrue(TeamMembershipCache.is_member(self.users[0].id, small_team.id))
+        deleted = []
+
+        def receiver(sender, **kwargs):
+            deleted.append(kwargs['instance'])
+
+        post_delete.connect(receiver, sender=TeamMembership)
+        self.addCleanup(post_delete.disconnect, receiver, sender=TeamMembership)
+        with self.captureOnCommitCallbacks(execute=True):
+            result = AutoTeamAssignmentService.reassign_students_for_year(self.academic_year, 3, 3)
+
+        self.assertEqual(result['teams_deleted'], 1)
+        self.assertEqual(deleted, [])
+        self.assertFalse(TeamMembershipCache.is_member(self.users[0].id, small_team.id))
+
+    def test_each_new_team_has_one_owner(self):
+        """Test that the first member of each created team is its owner"""
+        AutoTeamAssignmentService.reassign_students_for_year(self.academic_year, 2, 4)
+
+        for team in Team.objects.filter(academic_year=self.academic_year):
+            self.assertEqual(
+                team.teammembership_set.filter(role=TeamMembership.ROLE_OWNER).count(), 1
+            )
+            self.assertGreaterEqual(team.members.count(), 2)
+            self.assertLessEqual(team.members.count(), 4)
+
+    def test_inactive_and_other_year_students_are_ignored(self):
+        """Test that only active students of the requested year are assigned"""
+        on_leave = self._create_student(100, academic_status='on_leave')
+        other_year = self._create_student(101, academic_year='3')
+
+        AutoTeamAssignmentService.reassign_students_for_year(self.academic_year, 3, 3)
+
+        self.assertFalse(TeamMembership.objects.filter(user=on_leave).exists())
+        self.assertFalse(TeamMembership.objects.filter(user=other_year).exists())
+
+    def test_rerun_does_not_reuse_team_names(self):
+        """Test that a second run numbers new teams after the existing ones"""
+        AutoTeamAssignmentService.reassign_students_for_year(self.academic_year, 3, 3)
+        self._create_student(200)
+        self._create_student(201)
+        self._create_student(202)
+
+        result = AutoTeamAssignmentService.reassign_students_for_year(self.academic_year, 3, 3)
+
+        self.assertNotIn('error', result)
+        self.assertEqual(result['teams_created'], 1)
+        self.assertTrue(Team.objects.filter(name=f'Auto-Team-{self.academic_year}-5').exists())
+
+    def test_stats_include_phase_timings(self):
+        """Test that the returned stats report per-phase timings"""
+        result = AutoTeamAssignmentService.reassign_students_for_year(self.academic_year, 3, 3)
+
+        for phase in ('delete_undersized', 'find_teamless', 'plan', 'create_teams', 'create_memberships', 'total'):
+            self.assertIn(phase, result['timings'])
+
+    def test_query_count_does_not_grow_with_cohort(self):
+        """Test that the number of queries is independent of the cohort size"""
+        # Warm the team settings cache so only the engine's own queries are counted
+        TeamSettings.get_settings(year=self.academic_year)
+        with self.assertNumQueries(7):
+            AutoTeamAssignmentService.reassign_students_for_year(self.academic_year, 3, 3)
+
+    def test_every_student_is_placed_when_bounds_allow(self):
+        """Test that the planner covers the whole cohort instead of drawing random sizes"""
+        self._create_student(300)
+
+        result = AutoTeamAssignmentService.reassign_students_for_year(self.academic_year, 3, 4)
+
+        self.assertEqual(result['students_reassigned'], 13)
+        self.assertEqual(result['students_remaining'], 0)
+        self.assertEqual(result['team_distribution'], {4: 1, 3: 3})
+
+    def test_seed_makes_grouping_reproducible(self):
+        """Test that two seeded runs produce the same teams"""
+        def grouping():
+            return sorted(
+                sorted(team.members.values_list('id', flat=True))
+                for team in Team.objects.filter(academic_year=self.academic_year)
+            )
+
+        AutoTeamAssignmentService.reassign_students_for_year(self.academic_year, 3, 4, seed=42)
+        first = grouping()
+        TeamMembership.objects.all().delete()
+        Team.objects.all().delete()
+        AutoTeamAssignmentService.reassign_students_for_year(self.academic_year, 3, 4, seed=42)
+
+        self.assertEqual(first, grouping())
+
+    def test_keep_partial_teams_tops_up_undersized_team(self):
+        """Test that an undersized team is filled instead of dissolved"""
+        small_team = self._create_team('Small', self.users[:2])
+
+        result = AutoTeamAssignmentService.reassign_students_for_year(
+            self.academic_year, 3, 4, keep_partial_teams=True
+        )
+
+        self.assertNotIn('error', result)
+        self.assertEqual(result['teams_deleted'], 0)
+        self.assertTrue(Team.objects.filter(pk=small_team.pk).exists())
+        self.assertGreaterEqual(small_team.members.count(), 3)
+        self.assertEqual(small_team.teammembership_set.filter(role=TeamMembership.ROLE_OWNER).count(), 1)
+        self.assertEqual(result['students_remaining'], 0)
+
+    def test_keep_partial_teams_respects_team_settings(self):
+        """Test that topping up and regrouping stay under the year's maximum team size"""
+        TeamSettings.objects.create(academic_year=self.academic_year, maximum_members=3)
+        # The cached settings outlive the test's transaction
+        self.addCleanup(cache.clear)
+        self._create_team('Small', self.users[:2])
+        self._create_team('Single', self.users[2:3])
+
+        result = AutoTeamAssignmentService.reassign_students_for_year(
+            self.academic_year, 3, 6, keep_partial_teams=True
+        )
+
+        self.assertNotIn('error', result)
+        for team in Team.objects.filter(academic_year=self.academic_year):
+            self.assertLessEqual(team.members.count(), 3)
+        self.assertEqual(result['students_remaining'], 0)
+
+    def test_balance_skills_uses_proficiency(self):
+        """Test that skill balancing spreads expert students over the teams"""
+        for user in self.users[:3]:
+            StudentSkill.objects.create(student=user.student, name='Django', proficiency_level='expert')
+
+        result = AutoTeamAssignmentService.reassign_students_for_year(
+            self.academic_year, 4, 4, balance_skills=True, seed=1
+        )
+
+        self.assertEqual(result['teams_created'], 3)
+        for team in Team.objects.filter(academic_year=self.academic_year):
+            self.assertEqual(
+                StudentSkill.objects.filter(student__user__in=team.members.all()).count(), 1
+            )
+
+    def test_dry_run_rolls_back(self):
+        """Test that a dry run reports the plan without writing it"""
+        result = AutoTeamAssignmentService.reassign_students_for_year(self.academic_year, 3, 3, dry_run=True)
+
+        self.assertEqual(result['teams_created'], 4)
+        self.assertFalse(Team.objects.exists())
@@ -0,0 +1,83 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from common.testing import QueryCountAssertionsMixin
+from users.models import User, Student
+from teams.models import Team, TeamMembership
+
+
+class TeamListQueryTests(QueryCountAssertionsMixin, APITestCase):
+    """Team owners and member counts come from annotations, not per-team queries"""
+
+    def setUp(self):
+        self.count = 0
+        self.team = self.add_team(members=2)
+        self.client.force_authenticate(user=self.team.teammembership_set.get(role=TeamMembership.ROLE_OWNER).user)
+
+    def create_student(self):
+        self.count += 1
+        user = User.objects.create_user(
+            email=f'student{self.count}@test.com',
+            username=f'student{self.count}',
+            password='pass123',
+            first_name='Student',
+            last_name='Test',
+            user_type='student'
+        )
+        Student.objects.create(
+            user=user,
+            matricule=f'M{self.count}',
+            enrollment_year=2023,
+            current_year='4siw',
+            academic_status='active'
+        )
+        return user
+
+    def add_team(self, members=1):
+        """Create a team with an owner and ``members - 1`` members"""
+        team = Team.objects.create(
+            name=f'Team {self.count}',
+            description='Team for query count testing',
+            academic_year='4siw',
+            maximum_members=3
+        )
+        TeamMembership.objects.create(team=team, user=self.create_student(), role=TeamMembership.ROLE_OWNER)
+        for _ in range(members - 1):
+            TeamMembership.objects.create(team=team, user=self.create_student(), role=TeamMembership.ROLE_MEMBER)
+        return team
+
+    def grow(self):
+        for members in (1, 2, 3):
+            self.add_team(members=members)
+
+    def test_team_list_queries_constant(self):
+        url = reverse('teams:team-list-create')
+        self.assertConstantQueries(lambda: self.client.get(url), self.grow)
+
+    def test_team_list_filters_queries_constant(self):
+        url = reverse('teams:team-list-create') + '?has_capacity=true&min_members=1'
+        self.assertConstantQueries(lambda: self.client.get(url), self.grow)
+
+    def test_annotations_match_model_properties(self):
+        self.grow()
+        teams = {team['id']: team for team in self.client.get(reverse('teams:team-list-create')).data['results']}
+
+        for team in Team.objects.all():
+            data = teams[team.id]
+            self.assertEqual(data['member_count'], team.current_member_count)
+            self.assertEqual(data['has_capacity'], team.has_capacity)
+            self.assertEqual(data['owner'], {'id': team.owner.id, 'username': team.owner.username})
+
+    def test_team_detail(self):
+        url = reverse('teams:team-detail', kwargs={'id': self.team.id})
+        response = self.client.get(url)
+
+        self.assertEqual(response.data['member_count'], 2)
+        self.assertTrue(response.data['has_capacity'])
+        self.assertEqual(response.data['owner']['id'], self.team.owner.id)
+
+    def test_team_without_owner(self):
+        team = Team.objects.create(name='Empty', academic_year='4siw', maximum_members=3)
+        team = Team.objects.with_member_stats().get(id=team.id)
+
+        self.assertEqual(team.annotated_member_count, 0)
+        self.assertIsNone(team.annotated_owner_id)
@@ -0,0 +1,49 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from common.testing import QueryCountAssertionsMixin
+from users.models import User, Student, StudentSkill
+from teams.models import Team, TeamMembership
+
+
+class TeamMemberListQueryTests(QueryCountAssertionsMixin, APITestCase):
+    """The team member list embeds users without N+1 queries"""
+
+    def setUp(self):
+        self.count = 0
+        self.team = Team.objects.create(
+            name='Query Team',
+            description='Team for query count testing',
+            academic_year='4siw',
+            maximum_members=10
+        )
+        self.owner = self.add_member(TeamMembership.ROLE_OWNER)
+        self.client.force_authenticate(user=self.owner)
+
+    def add_member(self, role=TeamMembership.ROLE_MEMBER):
+        self.count += 1
+        user = User.objects.create_user(
+            email=f'student{self.count}@test.com',
+            username=f'student{self.count}',
+            password='pass123',
+            first_name='Student',
+            last_name='Test',
+            user_type='student'
+        )
+        student = Student.objects.create(
+            user=user,
+            matricule=f'M{self.count}',
+            enrollment_year=2023,
+            current_year='4siw',
+            academic_status='active'
+        )
+        StudentSkill.objects.create(student=student, name='Python')
+        TeamMembership.objects.create(team=self.team, user=user, role=role)
+        return user
+
+    def grow(self):
+        for _ in range(3):
+            self.add_member()
+
+    def test_member_list_queries_constant(self):
+        url = reverse('teams:team-members-list', kwargs={'team_id': self.team.id})
+        self.assertConstantQueries(lambda: self.client.get(url), self.grow)
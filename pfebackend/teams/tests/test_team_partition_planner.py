@@ -0,0 +1,86 @@
+from django.test import SimpleTestCase
+from teams.services.team_partition_planner import TeamPartitionPlanner
+
+
+class TeamPartitionPlannerTests(SimpleTestCase):
+    """Tests for the team size partition planner"""
+
+    def test_invalid_bounds_raise(self):
+        """Test that min greater than max is rejected"""
+        with self.assertRaises(ValueError):
+            TeamPartitionPlanner(4, 3)
+
+    def test_covers_every_student_when_feasible(self):
+        """Test that every cohort size with a valid partition is fully placed"""
+        planner = TeamPartitionPlanner(3, 5)
+
+        for student_count in range(3, 200):
+            sizes = planner.team_sizes(student_count)
+            self.assertEqual(sum(sizes), student_count)
+            self.assertTrue(all(3 <= size <= 5 for size in sizes))
+            self.assertLessEqual(max(sizes) - min(sizes), 1)
+
+    def test_places_as_many_students_as_possible_when_infeasible(self):
+        """Test the fallback when no exact partition exists"""
+        planner = TeamPartitionPlanner(5, 5)
+
+        self.assertEqual(planner.team_sizes(12), [5, 5])
+        self.assertEqual(planner.team_sizes(4), [])
+
+        planner = TeamPartitionPlanner(4, 5)
+        self.assertEqual(planner.team_sizes(7), [5])
+        self.assertEqual(planner.placeable(11), 10)
+
+    def test_same_seed_gives_same_plan(self):
+        """Test that a seed makes the grouping reproducible"""
+        students = list(range(40))
+
+        first = TeamPartitionPlanner(3, 4, seed=7).plan(students)
+        second = TeamPartitionPlanner(3, 4, seed=7).plan(students)
+
+        self.assertEqual(first, second)
+        self.assertEqual(sorted(sum(first['new_teams'], [])), students)
+        self.assertEqual(first['unassigned'], [])
+
+    def test_partial_teams_are_filled_first(self):
+        """Test that existing teams with room receive students before new teams are made"""
+        planner = TeamPartitionPlanner(3, 4, seed=1)
+
+        plan = planner.plan(list(range(5)), partial_teams=[(10, 3), (11, 2)])
+
+        # Team 11 needs one student to reach the minimum, the remaining four
+        # go to team 10's spare place plus one new team of three
+        self.assertEqual(len(plan['fills'][11]), 1)
+        self.assertEqual(len(plan['fills'][10]), 1)
+        self.assertEqual([len(group) for group in plan['new_teams']], [3])
+        self.assertEqual(plan['unassigned'], [])
+
+    def test_partial_team_fill_keeps_leftover_partitionable(self):
+        """Test that spare places are not used when it would strand students"""
+        planner = TeamPartitionPlanner(3, 4, seed=1)
+
+        plan = planner.plan(list(range(3)), partial_teams=[(10, 3)])
+
+        # Filling team 10 would leave two students who cannot form a team
+        self.assertEqual(plan['fills'], {})
+        self.assertEqual([len(group) for group in plan['new_teams']], [3])
+
+    def test_select_teams_to_keep(self):
+        """Test that undersized teams are kept smallest deficit first while students suffice"""
+        planner = TeamPartitionPlanner(4, 5)
+
+        kept, dissolved = planner.select_teams_to_keep(2, [(1, 1), (2, 3), (3, 2)])
+
+        self.assertEqual(kept, [2, 3])
+        self.assertEqual(dissolved, [1])
+
+    def test_skill_balancing_spreads_scores(self):
+        """Test that the snake draft evens out team skill totals"""
+        students = list(range(12))
+        skill_scores = {student: student for student in students}
+
+        plan = TeamPartitionPlanner(4, 4, seed=3).plan(students, skill_scores=skill_scores)
+        totals = sorted(sum(skill_scores[student] for student in group) for group in plan['new_teams'])
+
+        self.assertEqual(len(plan['new_teams']), 3)
+        self.assertLessEqual(totals[-1] - totals[0], 3)
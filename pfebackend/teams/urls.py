@@ -17,6 +17,7 @@ urlpatterns = [
     
     # Team membership endpoints
     path('teams/<int:team_id>/members/', TeamMembershipListView.as_view(), name='team-members-list'),
+    path('teams/<int:team_id>/members/online/', TeamOnlineMembersView.as_view(), name='team-members-online'),
     path('teams/<int:team_id>/members/add/', TeamMembershipCreateView.as_view(), name='team-members-add'),
     path('teams/<int:team_id>/members/<int:id>/', TeamMembershipDetailView.as_view(), name='team-member-detail'),
     
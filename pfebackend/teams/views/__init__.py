@@ -1,5 +1,5 @@
 from .invitation_views import TeamInvitationCreateView, InvitationListView, InvitationResponseView
-from .membership_views import TeamMembershipListView, TeamMembershipCreateView, TeamMembershipDetailView
+from .membership_views import TeamMembershipListView, TeamMembershipCreateView, TeamMembershipDetailView, TeamOnlineMembersView
 from .team_views import TeamListCreateView, TeamDetailView
 from .join_requests_views import (
     JoinRequestCreateView,
@@ -16,6 +16,7 @@ __all__ = [
     'TeamMembershipListView',
     'TeamMembershipCreateView',
     'TeamMembershipDetailView',
+    'TeamOnlineMembersView',
     'TeamListCreateView',
     'TeamDetailView',
     'JoinRequestCreateView',
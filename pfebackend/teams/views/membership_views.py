@@ -5,15 +5,20 @@ from rest_framework.generics import (
     CreateAPIView
 )
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from django.core.exceptions import ValidationError as DjangoValidationError
 from teams.models import Team, TeamMembership
 from teams.serializers import TeamMembershipSerializer
 from teams.permissions import IsTeamMember, IsTeamOwner
 from notifications.services import NotificationService
-from teams.services import TeamService
+from teams.services import TeamService, TeamMembershipCache
+from common.presence import PresenceService
+from common.query_budget import query_budget
+from users.serializers.base import BaseProfileSerializer
 
 
+@query_budget(10)
 class TeamMembershipListView(ListAPIView):
     """
     List members of a team
@@ -30,7 +35,9 @@ class TeamMembershipListView(ListAPIView):
             team = Team.objects.get(id=team_id)
             self.check_object_permissions(self.request, team)
             # Use TeamService to get team members
-            return TeamService.get_team_members(team)
+            return TeamService.get_team_members(team).select_related('team').prefetch_related(
+                *BaseProfileSerializer.profile_prefetches('user__')
+            )
         except Team.DoesNotExist:
             return TeamMembership.objects.none()
 
@@ -161,3 +168,21 @@ class TeamMembershipDetailView(RetrieveUpdateDestroyAPIView):
                 'event_type': 'removed_from_team'
             }
         )
+
+
+class TeamOnlineMembersView(APIView):
+    """
+    Ids of the members of a team who currently have a WebSocket open
+    
+    GET /api/teams/{team_id}/members/online/
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request, team_id):
+        if not TeamMembershipCache.is_member(request.user.id, team_id):
+            raise PermissionDenied("You are not a member of this team.")
+        
+        return Response({
+            'team_id': team_id,
+            'online_user_ids': sorted(PresenceService.online_team_member_ids(team_id))
+        })
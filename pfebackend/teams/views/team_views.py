@@ -11,6 +11,7 @@ from teams.serializers import TeamSerializer
 from teams.permissions import IsTeamMember, IsTeamOwner
 from teams.services import TeamService
 from common.pagination import StaticPagination
+from common.query_budget import query_budget
 from users.permissions import IsStudent
 from django_filters.rest_framework import DjangoFilterBackend
 from teams.filters import TeamFilter
@@ -77,9 +78,12 @@ class TeamListCreateView(ListCreateAPIView):
     
     def get_queryset(self):
         """Return teams with proper filtering and optimal performance"""
-        queryset = Team.objects.all()
-        # .prefetch_related('members', 'teammembership_set')
-        return queryset
+        # Member counts and owners come with the page: no queries per team
+        return Team.objects.with_member_stats()
+
+    @query_budget(6)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
     
     def perform_create(self, serializer):
@@ -109,11 +113,15 @@ class TeamDetailView(RetrieveUpdateDestroyAPIView):
     PUT/PATCH /api/teams/{id}/ - Update team (owners only)
     DELETE /api/teams/{id}/ - Delete team (owners only)
     """
-    queryset = Team.objects.all()
+    queryset = Team.objects.with_member_stats()
     serializer_class = TeamSerializer
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = 'id'
 
+    @query_budget(4)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def get_permissions(self):
         """Use different permission classes based on the request method"""
         if self.request.method in ['PUT', 'PATCH', 'DELETE']:
@@ -66,21 +66,20 @@ class ThemeAdmin(ModelAdmin):
             )
             
             # Notify all co-supervisors
-            for supervisor in new_obj.co_supervisors.all():
-                NotificationService.create_and_send(
-                    recipient=supervisor,
-                    title="Theme Verified",
-                    content=f"A theme you are co-supervising '{new_obj.title}' has been verified.",
-                    notification_type="theme_verification",
-                    related_object=new_obj,
-                    priority="medium",
-                    action_url=f"/themes/{new_obj.id}/",
-                    metadata={
-                        "theme_id": new_obj.id,
-                        "academic_year": new_obj.academic_year,
-                        "proposed_by": new_obj.proposed_by.id
-                    }
-                )
+            NotificationService.create_and_send_bulk(
+                recipients=new_obj.co_supervisors.all(),
+                title="Theme Verified",
+                content=f"A theme you are co-supervising '{new_obj.title}' has been verified.",
+                notification_type="theme_verification",
+                related_object=new_obj,
+                priority="medium",
+                action_url=f"/themes/{new_obj.id}/",
+                metadata={
+                    "theme_id": new_obj.id,
+                    "academic_year": new_obj.academic_year,
+                    "proposed_by": new_obj.proposed_by.id
+                }
+            )
             
         else:
             print(f"Theme '{new_obj.title}' has been unverified.")
@@ -101,20 +100,19 @@ class ThemeAdmin(ModelAdmin):
             )
             
             # Notify all co-supervisors about unverification
-            for supervisor in new_obj.co_supervisors.all():
-                NotificationService.create_and_send(
-                    recipient=supervisor,
-                    title="Theme Unverified",
-                    content=f"A theme you are co-supervising '{new_obj.title}' has been unverified.",
-                    notification_type="theme_unverification",
-                    related_object=new_obj,
-                    priority="medium",
-                    action_url=f"/themes/{new_obj.id}/",
-                    metadata={
-                        "theme_id": new_obj.id,
-                        "academic_year": new_obj.academic_year,
-                        "proposed_by": new_obj.proposed_by.id
-                    }
-                )
+            NotificationService.create_and_send_bulk(
+                recipients=new_obj.co_supervisors.all(),
+                title="Theme Unverified",
+                content=f"A theme you are co-supervising '{new_obj.title}' has been unverified.",
+                notification_type="theme_unverification",
+                related_object=new_obj,
+                priority="medium",
+                action_url=f"/themes/{new_obj.id}/",
+                metadata={
+                    "theme_id": new_obj.id,
+                    "academic_year": new_obj.academic_year,
+                    "proposed_by": new_obj.proposed_by.id
+                }
+            )
 
 admin.site.register(Theme, ThemeAdmin)
\ No newline at end of file
@@ -5,7 +5,7 @@ from themes.services import AutoThemeAssignmentService
 User = get_user_model()
 
 # example usage : 
-# python manage.py auto_assign_teams 4siw --min_members 3 --max_members 5
+# python manage.py auto_assign_themes --year 4siw --user-id 1 --max_teams_per_theme 2 --dry-run
 class Command(BaseCommand):
     help = 'Automatically assigns themes to teams based on academic year matching'
 
@@ -28,11 +28,28 @@ class Command(BaseCommand):
             default=10,
             help='Maximum number of teams per theme (optional)'
         )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Seed for a reproducible allocation of teams without usable requests'
+        )
+        parser.add_argument(
+            '--preferences-only',
+            action='store_true',
+            help='Only assign themes the teams requested supervision for'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show the planned assignments and their quality without saving them'
+        )
 
     def handle(self, *args, **options):
         academic_year = options['year']
         user_id = options['user_id']
         max_teams_per_theme = options['max_teams_per_theme']
+        dry_run = options['dry_run']
 
         try:
             user = User.objects.get(pk=user_id)
@@ -42,14 +59,37 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS(f"Starting theme assignment for year {academic_year}..."))
         
-        result = AutoThemeAssignmentService.assign_themes_for_year(academic_year, user, max_teams_per_theme)
+        result = AutoThemeAssignmentService.assign_themes_for_year(
+            academic_year, user, max_teams_per_theme,
+            dry_run=dry_run,
+            seed=options['seed'],
+            fill_unmatched=not options['preferences_only'],
+        )
         
         if 'error' in result:
             self.stderr.write(self.style.ERROR(result['error']))
             return
 
-        self.stdout.write(self.style.SUCCESS(
-            f"Successfully assigned {result['assignments_created']} themes to teams\n"
+        if dry_run:
+            self.stdout.write(self.style.WARNING("DRY RUN: no assignment was saved"))
+            for assignment in result.get('assignments', []):
+                self.stdout.write(
+                    f"  {assignment['team_name']} -> {assignment['theme_title']} ({assignment['source']})"
+                )
+            self.stdout.write(self.style.SUCCESS(
+                f"Planned {result.get('assignments_planned', 0)} assignments"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Successfully assigned {result['assignments_created']} themes to teams"
+            ))
+
+        self.stdout.write(
             f"Teams without theme: {result['remaining_teams']}\n"
             f"Themes remaining: {result['remaining_themes']}"
-        ))
\ No newline at end of file
+        )
+
+        if result.get('metrics'):
+            self.stdout.write("\nAllocation quality:")
+            for name, value in result['metrics'].items():
+                self.stdout.write(f"  {name}: {value}")
\ No newline at end of file
@@ -1,9 +1,10 @@
 from django.db import transaction
 from django.db.models import Count
 import logging
+import time
 from teams.models import Team
-from themes.models import Theme, ThemeAssignment
-from users.models import User
+from themes.models import Theme, ThemeAssignment, ThemeSupervisionRequest
+from themes.services.theme_matching_planner import ThemeMatchingPlanner
 
 
 logger = logging.getLogger(__name__)
@@ -13,93 +14,125 @@ class AutoThemeAssignmentService:
     Service for automatically assigning validated themes to teams based on academic year matching.
     This service will:
     1. Find all teams without assigned themes for a given year
-    2. Find all validated themes for the same year
-    3. Assign themes to teams randomly
+    2. Find all validated themes for the same year and their remaining capacity
+    3. Read the teams' pending supervision requests as their preferences
+    4. Match teams to themes with ``ThemeMatchingPlanner`` and write the result in bulk
+
+    The whole allocation is planned in memory from three queries, so a dry run
+    can preview a full year without touching the database.
     """
-    
+
+    # Number of rows sent per INSERT when writing assignments
+    BULK_BATCH_SIZE = 500
+
     @classmethod
-    @transaction.atomic
-    def assign_themes_for_year(cls, academic_year, assigned_by_user, max_teams_per_theme=None):
+    def assign_themes_for_year(cls, academic_year, assigned_by_user, max_teams_per_theme=None,
+                               dry_run=False, seed=None, fill_unmatched=True):
         """
         Main entry point to assign themes to teams for a specific academic year.
-        
+
         Args:
             academic_year (str): The academic year code ('2', '3', '4siw', etc.)
             assigned_by_user (User): The user who is performing the assignment
-            
+            max_teams_per_theme (int|None): Optional max teams per theme; without
+                it every theme receives at most one new team per run
+            dry_run (bool): Plan the allocation without writing anything
+            seed (int): Optional seed for a reproducible fallback allocation
+            fill_unmatched (bool): Give teams whose requests could not be
+                honoured any theme with capacity left
+
         Returns:
-            dict: Statistics about the assignments made
+            dict: Statistics about the assignments made, with quality ``metrics``
+                  and, for dry runs, the planned ``assignments``
         """
         try:
-            logger.info(f"Starting theme assignment for year '{academic_year}'")
-            
+            logger.info(f"Starting theme assignment for year '{academic_year}' (dry_run={dry_run})")
+
+            started_at = time.perf_counter()
+
             stats = {
                 "academic_year": academic_year,
+                "dry_run": dry_run,
                 "teams_without_theme": 0,
                 "available_themes": 0,
                 "assignments_created": 0,
                 "remaining_teams": 0,
-                "remaining_themes": 0
+                "remaining_themes": 0,
+                "metrics": {},
             }
-            
-            # Step 1: Get teams without assigned themes for this year
-            teams_without_theme = cls._get_teams_without_theme(academic_year)
-            stats["teams_without_theme"] = len(teams_without_theme)
-            
-            # Step 2: Get validated themes for this year
-            available_themes = cls._get_available_themes(academic_year, max_teams_per_theme=max_teams_per_theme)
-            stats["available_themes"] = len(available_themes)
-            
-            # Step 3: Assign themes to teams
-            if teams_without_theme and available_themes:
-                result = cls._assign_themes_to_teams(teams_without_theme, available_themes, assigned_by_user)
-                stats.update(result)
-            
-            logger.info(f"Theme assignment completed: {stats['assignments_created']} assignments created")
+
+            with transaction.atomic():
+                # Step 1: Get teams without assigned themes for this year
+                teams_without_theme = cls._get_teams_without_theme(academic_year)
+                stats["teams_without_theme"] = len(teams_without_theme)
+
+                # Step 2: Get validated themes for this year with their remaining capacity
+                available_themes = cls._get_available_themes(academic_year, max_teams_per_theme=max_teams_per_theme)
+                stats["available_themes"] = len(available_themes)
+
+                # Step 3: Plan and write the assignments
+                if teams_without_theme and available_themes:
+                    result = cls._assign_themes_to_teams(
+                        teams_without_theme, available_themes, assigned_by_user, academic_year,
+                        dry_run=dry_run, seed=seed, fill_unmatched=fill_unmatched
+                    )
+                    stats.update(result)
+                else:
+                    stats["remaining_teams"] = len(teams_without_theme)
+                    stats["remaining_themes"] = len(available_themes)
+
+            stats["duration"] = time.perf_counter() - started_at
+
+            logger.info(
+                f"Theme assignment {'planned' if dry_run else 'completed'}: "
+                f"{stats['assignments_created']} assignments in {stats['duration']:.3f}s"
+            )
             return stats
-            
+
         except Exception as e:
             logger.exception(f"Error during theme assignment: {str(e)}")
             return {"error": str(e)}
-    
+
     @staticmethod
     def _get_teams_without_theme(academic_year):
         """
         Get teams that don't have an assigned theme for the given academic year.
-        
+
         Args:
             academic_year (str): The academic year code
-            
+
         Returns:
-            QuerySet: Team objects without assigned themes
+            list: Team objects without assigned themes, ordered by id
         """
         # Get teams that don't have a ThemeAssignment
-        teams = Team.objects.filter(
-            academic_year=academic_year
-        ).exclude(
-            assigned_theme__isnull=False
+        teams = list(
+            Team.objects.filter(
+                academic_year=academic_year,
+                assigned_theme__isnull=True
+            ).only('id', 'name').order_by('id')
         )
-        
-        logger.debug(f"Found {teams.count()} teams without themes for year {academic_year}")
+
+        logger.debug(f"Found {len(teams)} teams without themes for year {academic_year}")
         return teams
-    
+
     @staticmethod
     def _get_available_themes(academic_year, max_teams_per_theme=None):
         """
-        Get validated themes that can be assigned to more teams.
-        
+        Get validated themes that can be assigned to more teams, with the
+        number of teams each one can still take in ``remaining_capacity``.
+
         Args:
             academic_year (str): The academic year code
             max_teams_per_theme (int|None): Optional max teams per theme
-            
+
         Returns:
-            QuerySet: Theme objects available for assignment
+            list: Theme objects available for assignment
         """
         themes = Theme.objects.filter(
             academic_year=academic_year,
             is_verified=True
-        )
-        
+        ).only('id', 'title').order_by('id')
+
         if max_teams_per_theme is not None:
             # Annotate with current assignment count and filter
             themes = themes.annotate(
@@ -107,52 +140,100 @@ class AutoThemeAssignmentService:
             ).filter(
                 assignment_count__lt=max_teams_per_theme
             )
-        
-        logger.debug(f"Found {themes.count()} available themes for year {academic_year}")
+
+        themes = list(themes)
+        for theme in themes:
+            if max_teams_per_theme is not None:
+                theme.remaining_capacity = max_teams_per_theme - theme.assignment_count
+            else:
+                theme.remaining_capacity = 1
+
+        logger.debug(f"Found {len(themes)} available themes for year {academic_year}")
         return themes
-    
+
+    @staticmethod
+    def _get_team_preferences(academic_year):
+        """
+        Get the pending supervision requests of the year's teams without a
+        theme as (team_id, theme_id) pairs, oldest first.
+        """
+        return list(
+            ThemeSupervisionRequest.objects.filter(
+                status=ThemeSupervisionRequest.STATUS_PENDING,
+                team__academic_year=academic_year,
+                team__assigned_theme__isnull=True
+            ).order_by('created_at', 'id').values_list('team_id', 'theme_id')
+        )
+
     @classmethod
-    def _assign_themes_to_teams(cls, teams, themes, assigned_by_user):
+    def _assign_themes_to_teams(cls, teams, themes, assigned_by_user, academic_year,
+                                dry_run=False, seed=None, fill_unmatched=True):
         """
-        Assign themes to teams randomly.
-        
+        Match teams to themes and write the assignments.
+
+        Pending supervision requests are only read as preferences; their
+        status is left to the supervisors through ``ThemeSupervisionService``.
+
         Args:
-            teams (QuerySet): Teams to assign themes to
-            themes (QuerySet): Themes available for assignment
+            teams (list): Teams to assign themes to
+            themes (list): Themes available for assignment, with ``remaining_capacity``
             assigned_by_user (User): User performing the assignment
-            
+            academic_year (str): The academic year code
+            dry_run (bool): Only return the planned assignments
+            seed (int): Optional seed for the fallback allocation
+            fill_unmatched (bool): Allocate leftover capacity to unmatched teams
+
         Returns:
             dict: Statistics about the assignments
         """
-        # Convert to lists for easier manipulation
-        teams_list = list(teams)
-        themes_list = list(themes)
-        
-        assignments_created = 0
-        
-        # Randomize the order
-        import random
-        random.shuffle(teams_list)
-        random.shuffle(themes_list)
-        
-        # Assign themes to teams until we run out of either
-        for team, theme in zip(teams_list, themes_list):
-            try:
-                # Create the theme assignment
-                ThemeAssignment.objects.create(
-                    team=team,
-                    theme=theme,
+        teams_by_id = {team.id: team for team in teams}
+        themes_by_id = {theme.id: theme for theme in themes}
+        capacities = {theme.id: theme.remaining_capacity for theme in themes}
+        requests = cls._get_team_preferences(academic_year)
+
+        planner = ThemeMatchingPlanner(seed=seed)
+        plan = planner.plan(list(teams_by_id.keys()), capacities, requests, fill_unmatched=fill_unmatched)
+
+        planned = [
+            {
+                "team_id": team_id,
+                "team_name": teams_by_id[team_id].name,
+                "theme_id": theme_id,
+                "theme_title": themes_by_id[theme_id].title,
+                "source": source,
+            }
+            for team_id, (theme_id, source) in plan["assignments"].items()
+        ]
+
+        used = {}
+        for theme_id, _ in plan["assignments"].values():
+            used[theme_id] = used.get(theme_id, 0) + 1
+        remaining_themes = sum(1 for theme_id, capacity in capacities.items() if capacity > used.get(theme_id, 0))
+
+        result = {
+            "assignments_created": 0 if dry_run else len(planned),
+            "assignments_planned": len(planned),
+            "remaining_teams": len(plan["unassigned"]),
+            "remaining_themes": remaining_themes,
+            "metrics": plan["metrics"],
+        }
+
+        if dry_run:
+            result["assignments"] = planned
+            return result
+
+        ThemeAssignment.objects.bulk_create(
+            [
+                ThemeAssignment(
+                    team_id=assignment["team_id"],
+                    theme_id=assignment["theme_id"],
                     assigned_by=assigned_by_user,
-                    title=f"{theme.title} - {team.name}"
+                    title=f"{assignment['theme_title']} - {assignment['team_name']}"
                 )
-                assignments_created += 1
-                logger.debug(f"Assigned theme '{theme.title}' to team '{team.name}'")
-            except Exception as e:
-                logger.error(f"Failed to assign theme to team: {str(e)}")
-                continue
-        
-        return {
-            "assignments_created": assignments_created,
-            "remaining_teams": len(teams_list) - assignments_created,
-            "remaining_themes": len(themes_list) - assignments_created
-        }
\ No newline at end of file
+                for assignment in planned
+            ],
+            batch_size=cls.BULK_BATCH_SIZE
+        )
+
+        logger.debug(f"Created {len(planned)} theme assignments")
+        return result
@@ -0,0 +1,183 @@
+import heapq
+import random
+
+
+class ThemeMatchingPlanner:
+    """
+    Plans the allocation of themes to teams in memory.
+
+    Preferences come from supervision requests: a team ranks the themes it
+    requested in the order it sent the requests, and a theme ranks the teams
+    that requested it first-come, first-served. Each theme accepts up to its
+    remaining capacity.
+
+    Teams are matched with capacitated deferred acceptance (team-proposing
+    Gale-Shapley), which gives a stable matching that is optimal for teams:
+    no team and theme would both rather be matched to each other. Teams left
+    without a theme can then be spread over the remaining capacity, fullest
+    themes last, in an order drawn from ``random.Random(seed)``.
+    """
+
+    SOURCE_PREFERENCE = 'preference'
+    SOURCE_FALLBACK = 'fallback'
+
+    def __init__(self, seed=None):
+        self.seed = seed
+        self._random = random.Random(seed)
+
+    def plan(self, team_ids, capacities, requests, fill_unmatched=True):
+        """
+        Match teams to themes.
+
+        Args:
+            team_ids (list): Ids of the teams that need a theme
+            capacities (dict): Remaining capacity per theme id
+            requests (list): (team_id, theme_id) pairs ordered by request date;
+                pairs for unknown teams or themes are ignored
+            fill_unmatched (bool): Give teams that could not get a requested
+                theme any theme with capacity left
+
+        Returns:
+            dict: ``assignments`` maps team_id to (theme_id, source), where
+                  source is ``preference`` or ``fallback``, ``unassigned``
+                  lists team ids left without a theme and ``metrics`` holds
+                  quality figures for the allocation
+        """
+        team_set = set(team_ids)
+        preferences, theme_rankings = self._build_preferences(team_set, capacities, requests)
+
+        matched = self._deferred_acceptance(preferences, theme_rankings, capacities)
+
+        assignments = {
+            team_id: (theme_id, self.SOURCE_PREFERENCE)
+            for team_id, theme_id in matched.items()
+        }
+
+        remaining = dict(capacities)
+        for theme_id, _ in assignments.values():
+            remaining[theme_id] -= 1
+
+        unmatched = [team_id for team_id in team_ids if team_id not in assignments]
+        if fill_unmatched and unmatched:
+            for team_id, theme_id in self._fill(unmatched, remaining).items():
+                assignments[team_id] = (theme_id, self.SOURCE_FALLBACK)
+
+        unassigned = [team_id for team_id in team_ids if team_id not in assignments]
+
+        return {
+            "assignments": assignments,
+            "unassigned": unassigned,
+            "metrics": self._metrics(team_ids, capacities, preferences, assignments),
+        }
+
+    @staticmethod
+    def _build_preferences(team_set, capacities, requests):
+        """
+        Build the team preference lists and the theme rankings of teams
+        from the ordered supervision requests.
+        """
+        preferences = {}
+        theme_rankings = {}
+
+        for team_id, theme_id in requests:
+            if team_id not in team_set or capacities.get(theme_id, 0) <= 0:
+                continue
+
+            team_preferences = preferences.setdefault(team_id, [])
+            if theme_id in team_preferences:
+                continue
+            team_preferences.append(theme_id)
+
+            ranking = theme_rankings.setdefault(theme_id, {})
+            ranking[team_id] = len(ranking)
+
+        return preferences, theme_rankings
+
+    @staticmethod
+    def _deferred_acceptance(preferences, theme_rankings, capacities):
+        """
+        Team-proposing deferred acceptance with theme capacities.
+
+        Each theme keeps the teams it holds in a heap keyed on its ranking,
+        so the least preferred held team can be bumped in O(log capacity).
+        """
+        next_choice = {team_id: 0 for team_id in preferences}
+        held = {}
+        free_teams = list(preferences.keys())
+        free_teams.reverse()
+
+        while free_teams:
+            team_id = free_teams.pop()
+            choices = preferences[team_id]
+            if next_choice[team_id] >= len(choices):
+                continue
+
+            theme_id = choices[next_choice[team_id]]
+            next_choice[team_id] += 1
+            rank = theme_rankings[theme_id][team_id]
+
+            theme_heap = held.setdefault(theme_id, [])
+            if len(theme_heap) < capacities[theme_id]:
+                heapq.heappush(theme_heap, (-rank, team_id))
+            elif -theme_heap[0][0] > rank:
+                _, bumped_team = heapq.heapreplace(theme_heap, (-rank, team_id))
+                free_teams.append(bumped_team)
+            else:
+                free_teams.append(team_id)
+
+        return {
+            team_id: theme_id
+            for theme_id, theme_heap in held.items()
+            for _, team_id in theme_heap
+        }
+
+    def _fill(self, team_ids, remaining):
+        """
+        Spread teams over the themes with capacity left, always picking the
+        theme with the most free places.
+        """
+        teams = list(team_ids)
+        self._random.shuffle(teams)
+
+        theme_ids = [theme_id for theme_id, capacity in remaining.items() if capacity > 0]
+        self._random.shuffle(theme_ids)
+        heap = [(-remaining[theme_id], position, theme_id) for position, theme_id in enumerate(theme_ids)]
+        heapq.heapify(heap)
+
+        filled = {}
+        for team_id in teams:
+            if not heap:
+                break
+            free_places, position, theme_id = heapq.heappop(heap)
+            filled[team_id] = theme_id
+            remaining[theme_id] -= 1
+            if free_places + 1 < 0:
+                heapq.heappush(heap, (free_places + 1, position, theme_id))
+
+        return filled
+
+    @classmethod
+    def _metrics(cls, team_ids, capacities, preferences, assignments):
+        """Quality figures for a planned allocation"""
+        ranks = [
+            preferences[team_id].index(theme_id) + 1
+            for team_id, (theme_id, source) in assignments.items()
+            if source == cls.SOURCE_PREFERENCE
+        ]
+        by_fallback = sum(1 for _, source in assignments.values() if source == cls.SOURCE_FALLBACK)
+        capacity_total = sum(capacity for capacity in capacities.values() if capacity > 0)
+
+        return {
+            "teams": len(team_ids),
+            "teams_with_preferences": len(preferences),
+            "assigned": len(assignments),
+            "assigned_by_preference": len(ranks),
+            "assigned_by_fallback": by_fallback,
+            "unassigned": len(team_ids) - len(assignments),
+            "first_choice": ranks.count(1),
+            "average_preference_rank": round(sum(ranks) / len(ranks), 2) if ranks else None,
+            "preference_satisfaction_rate": round(len(ranks) / len(preferences), 3) if preferences else None,
+            "capacity_total": capacity_total,
+            "capacity_used": len(assignments),
+            "capacity_utilization": round(len(assignments) / capacity_total, 3) if capacity_total else None,
+        }
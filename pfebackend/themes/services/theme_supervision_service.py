@@ -110,9 +110,14 @@ class ThemeSupervisionService:
                 # Create action URL for the supervision request
                 action_url = f"/supervision-requests/{supervision_request.id}/"
                 
-                # Send notification to the invitee
-                NotificationService.create_and_send(
-                    recipient=invitee,
+                # Send notification to the invitee, and to the co-supervisors
+                # only if the main supervisor is invited
+                recipients = [invitee]
+                if invitee == theme.proposed_by:
+                    recipients += list(theme.co_supervisors.all())
+                
+                NotificationService.create_and_send_bulk(
+                    recipients=recipients,
                     title=title,
                     content=content,
                     notification_type='theme_supervision_request',
@@ -122,20 +127,6 @@ class ThemeSupervisionService:
                     metadata=metadata
                 )
                 
-                # Only notify co-supervisors if the main supervisor is invited
-                if invitee == theme.proposed_by:
-                    for co_supervisor in theme.co_supervisors.all():
-                        NotificationService.create_and_send(
-                            recipient=co_supervisor,
-                            title=title,
-                            content=content,
-                            notification_type='theme_supervision_request',
-                            related_object=supervision_request,
-                            priority='medium',
-                            action_url=action_url,
-                            metadata=metadata
-                        )
-                
                 return supervision_request
                 
         except ValidationError as e:
@@ -216,23 +207,22 @@ class ThemeSupervisionService:
                         
                         # Also notify other team members
                         team_members = team.members.exclude(id=requester.id)
-                        for member in team_members:
-                            NotificationService.create_and_send(
-                                recipient=member,
-                                title=f"Theme Assigned to Your Team",
-                                content=f"Your team has been assigned the theme '{theme.title}', supervised by {supervisor_name}",
-                                notification_type='theme_assignment',
-                                related_object=team.assigned_theme,
-                                action_url=f"/teams/{team.id}/theme/",
-                                metadata={
-                                    'team_id': team.id,
-                                    'theme_id': theme.id,
-                                    'theme_title': theme.title,
-                                    'profile_picture': user.profile_picture_url,
-                                    'supervisor_name': supervisor_name,
-                                    'event_type': 'theme_assigned'
-                                }
-                            )
+                        NotificationService.create_and_send_bulk(
+                            recipients=team_members,
+                            title=f"Theme Assigned to Your Team",
+                            content=f"Your team has been assigned the theme '{theme.title}', supervised by {supervisor_name}",
+                            notification_type='theme_assignment',
+                            related_object=team.assigned_theme,
+                            action_url=f"/teams/{team.id}/theme/",
+                            metadata={
+                                'team_id': team.id,
+                                'theme_id': theme.id,
+                                'theme_title': theme.title,
+                                'profile_picture': user.profile_picture_url,
+                                'supervisor_name': supervisor_name,
+                                'event_type': 'theme_assigned'
+                            }
+                        )
                     
                     return True, result_data
                     
@@ -399,14 +389,14 @@ class ThemeSupervisionService:
             supervision_request.status = ThemeSupervisionRequest.STATUS_CANCELLED
             supervision_request.save(update_fields=['status', 'updated_at'])
             
-            # Notify the theme proposer
             from notifications.services import NotificationService
             
             theme = supervision_request.theme
             requester_name = user.get_full_name() or user.username
             
-            NotificationService.create_and_send(
-                recipient=theme.proposed_by,
+            # Notify the theme proposer and co-supervisors
+            NotificationService.create_and_send_bulk(
+                recipients=[theme.proposed_by] + list(theme.co_supervisors.all()),
                 title="Supervision Request Cancelled",
                 content=f"{requester_name} has cancelled the request for supervision of theme '{theme.title}' for team '{team.name}'",
                 notification_type='theme_update',
@@ -420,23 +410,6 @@ class ThemeSupervisionService:
                 }
             )
             
-            # Also notify co-supervisors
-            for co_supervisor in theme.co_supervisors.all():
-                NotificationService.create_and_send(
-                    recipient=co_supervisor,
-                    title="Supervision Request Cancelled",
-                    content=f"{requester_name} has cancelled the request for supervision of theme '{theme.title}' for team '{team.name}'",
-                    notification_type='theme_update',
-                    related_object=theme,
-                    priority='low',
-                    metadata={
-                        'team_id': team.id,
-                        'theme_id': theme.id,
-                        'theme_title': theme.title,
-                        'event_type': 'supervision_request_cancelled'
-                    }
-                )
-            
             return True
             
         except ThemeSupervisionRequest.DoesNotExist:
@@ -0,0 +1,115 @@
+from django.test import TestCase
+from users.models import User
+from themes.models import Theme, ThemeSupervisionRequest
+from themes.models.project_models import ThemeAssignment
+from teams.models import Team
+from themes.services.auto_theme_assignment_service import AutoThemeAssignmentService
+
+
+class AutoThemeAssignmentServiceTests(TestCase):
+    """Tests for the matching-based theme allocation"""
+
+    academic_year = '4siw'
+
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            email='teacher@test.com',
+            username='teachertest',
+            password='pass123',
+            first_name='Teacher',
+            last_name='Test',
+            user_type='teacher'
+        )
+        self.student = User.objects.create_user(
+            email='student@test.com',
+            username='studenttest',
+            password='pass123',
+            first_name='Student',
+            last_name='Test',
+            user_type='student'
+        )
+        self.themes = [
+            Theme.objects.create(
+                title=f"Theme {index}",
+                description="Test theme description",
+                proposed_by=self.teacher,
+                academic_year=self.academic_year,
+                is_verified=True
+            )
+            for index in range(2)
+        ]
+        self.teams = [
+            Team.objects.create(
+                name=f"Team {index}",
+                academic_year=self.academic_year,
+                maximum_members=3
+            )
+            for index in range(3)
+        ]
+
+    def _request(self, team, theme):
+        return ThemeSupervisionRequest.objects.create(
+            theme=theme,
+            team=team,
+            requester=self.student,
+            invitee=self.teacher
+        )
+
+    def test_requests_are_honoured_within_capacity(self):
+        """Test that requested themes are assigned and requests left to the supervisors"""
+        honoured = self._request(self.teams[0], self.themes[1])
+        other = self._request(self.teams[0], self.themes[0])
+        self._request(self.teams[1], self.themes[1])
+
+        result = AutoThemeAssignmentService.assign_themes_for_year(
+            self.academic_year, self.teacher, max_teams_per_theme=1, fill_unmatched=False
+        )
+
+        self.assertNotIn('error', result)
+        self.assertEqual(result['assignments_created'], 1)
+        self.assertEqual(ThemeAssignment.objects.get(team=self.teams[0]).theme, self.themes[1])
+        self.assertEqual(result['metrics']['first_choice'], 1)
+
+        honoured.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(honoured.status, ThemeSupervisionRequest.STATUS_PENDING)
+        self.assertEqual(other.status, ThemeSupervisionRequest.STATUS_PENDING)
+
+    def test_fallback_uses_remaining_capacity(self):
+        """Test that teams without usable requests get the themes left over"""
+        self._request(self.teams[0], self.themes[0])
+
+        result = AutoThemeAssignmentService.assign_themes_for_year(
+            self.academic_year, self.teacher, max_teams_per_theme=2, seed=3
+        )
+
+        self.assertEqual(result['assignments_created'], 3)
+        self.assertEqual(result['metrics']['assigned_by_fallback'], 2)
+        self.assertEqual(ThemeAssignment.objects.get(team=self.teams[0]).theme, self.themes[0])
+        self.assertEqual(result['remaining_teams'], 0)
+
+    def test_dry_run_returns_plan_without_writing(self):
+        """Test that a dry run reports planned assignments only"""
+        self._request(self.teams[1], self.themes[0])
+
+        with self.assertNumQueries(5):
+            result = AutoThemeAssignmentService.assign_themes_for_year(
+                self.academic_year, self.teacher, max_teams_per_theme=1, dry_run=True
+            )
+
+        self.assertEqual(result['assignments_created'], 0)
+        self.assertEqual(result['assignments_planned'], 2)
+        self.assertIn(
+            {
+                "team_id": self.teams[1].id,
+                "team_name": self.teams[1].name,
+                "theme_id": self.themes[0].id,
+                "theme_title": self.themes[0].title,
+                "source": "preference",
+            },
+            result['assignments']
+        )
+        self.assertFalse(ThemeAssignment.objects.exists())
+        self.assertEqual(
+            ThemeSupervisionRequest.objects.filter(status=ThemeSupervisionRequest.STATUS_PENDING).count(), 1
+        )
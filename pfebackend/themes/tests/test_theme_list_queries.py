@@ -0,0 +1,54 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from common.testing import QueryCountAssertionsMixin
+from users.models import User, Teacher
+from themes.models import Theme
+
+
+class ThemeListQueryTests(QueryCountAssertionsMixin, APITestCase):
+    """The theme list embeds proposers and co-supervisors without N+1 queries"""
+
+    def setUp(self):
+        self.count = 0
+        self.teacher_user = self.create_teacher()
+        self.client.force_authenticate(user=self.teacher_user)
+        self.add_theme()
+
+    def create_teacher(self):
+        self.count += 1
+        user = User.objects.create_user(
+            email=f'teacher{self.count}@test.com',
+            username=f'teacher{self.count}',
+            password='pass123',
+            first_name='Teacher',
+            last_name='Test',
+            user_type='teacher'
+        )
+        Teacher.objects.create(user=user, department='Computer Science', grade='maitre_assistant_b')
+        return user
+
+    def add_theme(self):
+        """Create a theme proposed by a new teacher with three co-supervisors"""
+        theme = Theme.objects.create(
+            title=f'Theme {self.count}',
+            description='Theme for query count testing',
+            proposed_by=self.create_teacher(),
+            academic_year='4siw'
+        )
+        theme.co_supervisors.set([self.create_teacher() for _ in range(3)])
+
+    def grow(self):
+        for _ in range(3):
+            self.add_theme()
+
+    def test_theme_list_queries_constant(self):
+        url = reverse('theme-list')
+        self.assertConstantQueries(lambda: self.client.get(url), self.grow)
+
+    def test_theme_list_embeds_profiles(self):
+        response = self.client.get(reverse('theme-list'))
+        theme = response.data['results'][0]
+
+        self.assertEqual(theme['proposed_by']['profile']['department'], 'Computer Science')
+        self.assertEqual(len(theme['co_supervisors']), 3)
+        self.assertEqual(theme['co_supervisors'][0]['profile']['grade'], 'maitre_assistant_b')
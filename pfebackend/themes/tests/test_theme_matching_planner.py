@@ -0,0 +1,67 @@
+from django.test import SimpleTestCase
+from themes.services.theme_matching_planner import ThemeMatchingPlanner
+
+
+class ThemeMatchingPlannerTests(SimpleTestCase):
+    """Tests for the in-memory theme allocation engine"""
+
+    def test_teams_get_their_first_choice_when_possible(self):
+        """Test that non-conflicting requests are all honoured"""
+        plan = ThemeMatchingPlanner().plan(
+            [1, 2], {10: 1, 20: 1}, [(1, 10), (2, 20), (2, 10)]
+        )
+
+        self.assertEqual(plan['assignments'], {1: (10, 'preference'), 2: (20, 'preference')})
+        self.assertEqual(plan['metrics']['first_choice'], 2)
+        self.assertEqual(plan['metrics']['average_preference_rank'], 1)
+
+    def test_capacity_goes_to_earliest_request(self):
+        """Test that a full theme keeps the team that asked first"""
+        plan = ThemeMatchingPlanner().plan(
+            [1, 2], {10: 1, 20: 1}, [(2, 10), (1, 10), (1, 20)]
+        )
+
+        self.assertEqual(plan['assignments'][2], (10, 'preference'))
+        self.assertEqual(plan['assignments'][1], (20, 'preference'))
+
+    def test_later_proposal_bumps_less_preferred_team(self):
+        """Test that deferred acceptance lets a theme trade up to an earlier requester"""
+        # Team 2 holds theme 10 until team 1, which asked for it earlier,
+        # is turned down by its first choice and proposes to it
+        plan = ThemeMatchingPlanner().plan(
+            [1, 2, 3, 4],
+            {10: 1, 20: 1, 30: 1},
+            [(4, 30), (2, 30), (3, 20), (1, 20), (1, 10), (2, 10)],
+            fill_unmatched=False
+        )
+
+        self.assertEqual(plan['assignments'][1], (10, 'preference'))
+        self.assertEqual(plan['assignments'][3], (20, 'preference'))
+        self.assertEqual(plan['assignments'][4], (30, 'preference'))
+        self.assertEqual(plan['unassigned'], [2])
+
+    def test_unmatched_teams_fill_remaining_capacity(self):
+        """Test the fallback allocation and that it can be turned off"""
+        plan = ThemeMatchingPlanner(seed=1).plan([1, 2, 3], {10: 2, 20: 1}, [(1, 20)])
+
+        self.assertEqual(plan['assignments'][1], (20, 'preference'))
+        self.assertEqual(plan['assignments'][2], (10, 'fallback'))
+        self.assertEqual(plan['assignments'][3], (10, 'fallback'))
+        self.assertEqual(plan['metrics']['capacity_utilization'], 1)
+
+        plan = ThemeMatchingPlanner(seed=1).plan([1, 2, 3], {10: 2, 20: 1}, [(1, 20)], fill_unmatched=False)
+        self.assertEqual(plan['unassigned'], [2, 3])
+
+    def test_capacity_is_never_exceeded(self):
+        """Test that no theme receives more teams than its capacity"""
+        team_ids = list(range(50))
+        capacities = {100: 3, 200: 5, 300: 2}
+        requests = [(team_id, 100 + 100 * (team_id % 3)) for team_id in team_ids]
+
+        plan = ThemeMatchingPlanner(seed=5).plan(team_ids, capacities, requests)
+
+        counts = {}
+        for theme_id, _ in plan['assignments'].values():
+            counts[theme_id] = counts.get(theme_id, 0) + 1
+        self.assertEqual(counts, capacities)
+        self.assertEqual(len(plan['unassigned']), 40)
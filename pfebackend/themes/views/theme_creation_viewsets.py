@@ -6,7 +6,9 @@ from themes.models.theme_models import Theme
 from themes.serializers.theme_creation_serializers import ThemeInputSerializer, ThemeOutputSerializer
 from users.permissions import IsTeacher, IsExternalUser
 from common.pagination import StaticPagination
+from common.query_budget import query_budget
 from themes.filters import ThemeFilter
+from users.serializers.base import BaseProfileSerializer
 
 class ThemeViewSet(viewsets.ModelViewSet):
     """
@@ -32,7 +34,12 @@ class ThemeViewSet(viewsets.ModelViewSet):
         - `created_after`, `created_before`, `updated_after`, `updated_before` (datetime) - Filter by creation/update date.
         - `is_verified` (bool) - Filter by verification status.
     """
-    queryset = Theme.objects.all().order_by("-created_at")
+    queryset = Theme.objects.select_related("proposed_by").prefetch_related(
+        "documents",
+        "co_supervisors",
+        *BaseProfileSerializer.profile_prefetches("proposed_by__"),
+        *BaseProfileSerializer.profile_prefetches("co_supervisors__"),
+    ).order_by("-created_at")
 
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = StaticPagination
@@ -131,6 +138,7 @@ class ThemeViewSet(viewsets.ModelViewSet):
         ],
         responses={200: ThemeOutputSerializer(many=True)}
     )
+    @query_budget(15)
     def list(self, request, *args, **kwargs):
         """ Retrieve a list of themes with filtering, searching, and ordering. """
         return super().list(request, *args, **kwargs)
@@ -139,6 +147,7 @@ class ThemeViewSet(viewsets.ModelViewSet):
         operation_description="Retrieve details of a specific theme.",
         responses={200: ThemeOutputSerializer()}
     )
+    @query_budget(15)
     def retrieve(self, request, *args, **kwargs):
         """ Retrieve details of a specific theme. """
         return super().retrieve(request, *args, **kwargs)
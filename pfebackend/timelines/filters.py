@@ -1,7 +1,5 @@
 from django_filters import rest_framework as filters
-from django.utils.timezone import now
-from django.db.models import Q
-from timelines.models import Timeline
+from timelines.models import Timeline, TimelineQuerySet
 
 class TimelineFilter(filters.FilterSet):
     """
@@ -55,24 +53,7 @@ class TimelineFilter(filters.FilterSet):
         Returns:
             Filtered queryset
         """
-        current_time = now()
-        
-        # For timelines with both start and end dates
-        with_dates_q = (
-            Q(start_date__lte=current_time) & 
-            Q(end_date__gte=current_time)
-        )
-        
-        # For timelines with only start date (open-ended)
-        start_only_q = (
-            Q(start_date__lte=current_time) & 
-            Q(end_date__isnull=True)
-        )
-        
-        if value:
-            return queryset.filter(is_active=True).filter(with_dates_q | start_only_q)
-        else:
-            return queryset.exclude(is_active=True).exclude(with_dates_q | start_only_q)
+        return queryset.with_status().filter(annotated_is_current=value)
 
     def filter_by_status(self, queryset, name, value):
         """
@@ -86,24 +67,9 @@ class TimelineFilter(filters.FilterSet):
         Returns:
             Filtered queryset
         """
-        current_time = now()
-        
-        if value == 'upcoming':
-            return queryset.filter(is_active=True, start_date__gt=current_time)
-        elif value == 'active':
-            return queryset.filter(
-                is_active=True,
-                start_date__lte=current_time
-            ).filter(
-                Q(end_date__gte=current_time) | 
-                Q(end_date__isnull=True)
-            )
-        elif value == 'expired':
-            return queryset.filter(is_active=True, end_date__lt=current_time)
-        elif value == 'inactive':
-            return queryset.filter(is_active=False)
-        
-        return queryset
+        if value not in TimelineQuerySet.STATUSES:
+            return queryset
+        return queryset.with_status().filter(annotated_status=value)
 
     def filter_match_student(self, queryset, name, value):
         """
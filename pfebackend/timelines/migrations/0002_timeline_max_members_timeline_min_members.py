@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-17 07:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timelines', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timeline',
+            name='max_members',
+            field=models.PositiveIntegerField(default=2, help_text='Maximum number of members allowed in groups for this timeline'),
+        ),
+        migrations.AddField(
+            model_name='timeline',
+            name='min_members',
+            field=models.PositiveIntegerField(default=1, help_text='Minimum number of members required for groups in this timeline'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from rest_framework.exceptions import PermissionDenied
 import logging
-from .models import Timeline
+from .registry import TimelineRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -41,34 +41,37 @@ class APITimelineRequiredMixin:
         if not timeline_slugs:
             self.handle_no_permission("No timelines specified for this resource.")
         
+        # Timelines come from the cached registry, dates are checked in memory
+        timelines = TimelineRegistry.get_many(timeline_slugs)
+        
         # Try to find at least one valid and current timeline
         valid_timelines = []
         for slug in timeline_slugs:
-            try:
-                timeline = Timeline.objects.get(slug=slug)
-                if timeline.is_active and timeline.is_current:
-                    valid_timelines.append(timeline)
-            except Timeline.DoesNotExist:
+            timeline = timelines[slug]
+            if timeline is None:
                 logger.warning(f"Timeline '{slug}' does not exist.")
                 continue
+            if timeline.is_active and timeline.is_current:
+                valid_timelines.append(timeline)
         
         # If no valid timelines were found, explain why
         if not valid_timelines:
             # Get status info for all timelines to provide better error messages
             timelines_info = []
             for slug in timeline_slugs:
-                try:
-                    timeline = Timeline.objects.get(slug=slug)
-                    if not timeline.is_active:
+                timeline = timelines[slug]
+                if timeline is None:
+                    timelines_info.append(f"'{slug}' does not exist")
+                else:
+                    status = timeline.status
+                    if status == 'inactive':
                         timelines_info.append(f"'{timeline.name}' is not active")
-                    elif timeline.status == 'upcoming':
+                    elif status == 'upcoming':
                         timelines_info.append(f"'{timeline.name}' has not started yet (starts on {timeline.start_date.strftime('%Y-%m-%d %H:%M')})")
-                    elif timeline.status == 'expired':
+                    elif status == 'expired':
                         timelines_info.append(f"'{timeline.name}' has ended (ended on {timeline.end_date.strftime('%Y-%m-%d %H:%M')})")
                     else:
                         timelines_info.append(f"'{timeline.name}' is not current")
-                except Timeline.DoesNotExist:
-                    timelines_info.append(f"'{slug}' does not exist")
             
             if timelines_info:
                 detail = "None of the specified timelines are available: " + "; ".join(timelines_info)
@@ -1,8 +1,43 @@
 from django.db import models
+from django.db.models import BooleanField, Case, CharField, Q, Value, When
+from django.db.models.functions import Now
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
+class TimelineQuerySet(models.QuerySet):
+    # Statuses computed by with_status(), same rules as Timeline.status
+    STATUSES = ('upcoming', 'active', 'expired', 'inactive')
+
+    def with_status(self):
+        """
+        Annotate ``annotated_status`` and ``annotated_is_current``
+
+        The database evaluates the same rules as the ``status`` and
+        ``is_current`` properties against its own clock, so timelines can be
+        filtered and sorted by status without loading them.
+        """
+        now = Now()
+        return self.annotate(
+            annotated_status=Case(
+                When(is_active=False, then=Value('inactive')),
+                When(start_date__gt=now, then=Value('upcoming')),
+                When(end_date__lt=now, then=Value('expired')),
+                default=Value('active'),
+                output_field=CharField(),
+            ),
+            annotated_is_current=Case(
+                When(
+                    Q(is_active=True, start_date__lte=now)
+                    & (Q(end_date__isnull=True) | Q(end_date__gte=now)),
+                    then=Value(True),
+                ),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+        )
+
+
 class Timeline(models.Model):
     """
     Model representing a timeline in the application.
@@ -81,6 +116,8 @@ class Timeline(models.Model):
         help_text=_("Maximum number of members allowed in groups for this timeline")
     )
     
+    objects = TimelineQuerySet.as_manager()
+    
     class Meta:
         ordering = ['academic_year', 'start_date', 'timeline_type']
         verbose_name = _("Timeline")
@@ -162,12 +199,10 @@ class Timeline(models.Model):
             Timeline or None: The current timeline or None if no active timeline exists
         """
         try:
-            return cls.objects.get(
+            return cls.objects.with_status().get(
                 timeline_type=timeline_type,
                 academic_year=academic_year,
-                is_active=True,
-                start_date__lte=timezone.now(),
-                end_date__gte=timezone.now()
+                annotated_is_current=True
             )
         except (cls.DoesNotExist, cls.MultipleObjectsReturned):
             return None
\ No newline at end of file
@@ -0,0 +1,120 @@
+from django.core.cache import cache
+from django.db import transaction
+from common.cache import shared_timeout
+from timelines.models import Timeline
+import threading
+import time
+
+
+class TimelineRegistry:
+    """
+    Cached, version-stamped lookup of every timeline by slug
+
+    All timelines are loaded with one query and kept in the shared cache
+    under the current registry version, and in process memory. Saving or
+    deleting a timeline bumps the version once the transaction commits;
+    other processes compare their copy with the shared version at most
+    every ``LOCAL_TIMEOUT`` seconds, so a checked request costs no query
+    and usually no cache round trip.
+
+    The version is only seen by every process through a shared cache
+    (``CACHES``). With a per-process cache the version and snapshots expire
+    after ``LOCAL_TIMEOUT`` seconds instead, so each process reloads the
+    timelines at that pace.
+
+    ``is_current`` and ``status`` are properties of the returned instances,
+    evaluated against the current time on each call.
+    """
+
+    # Seconds a process trusts its copy before checking the shared version
+    LOCAL_TIMEOUT = 5
+    # Seconds a snapshot is kept in the shared cache
+    SHARED_TIMEOUT = 60 * 60 * 24
+
+    VERSION_KEY = 'timeline_registry_version'
+
+    _local = None  # (expires_at, version, {slug: Timeline})
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _snapshot_key(version):
+        return f'timeline_registry_{version}'
+
+    @staticmethod
+    def _new_version():
+        # Time based so that a version lost from the cache is never reused
+        return int(time.time() * 1000)
+
+    @classmethod
+    def _version_timeout(cls):
+        return shared_timeout(None, cls.LOCAL_TIMEOUT)
+
+    @classmethod
+    def _version(cls):
+        version = cache.get(cls.VERSION_KEY)
+        if version is None:
+            cache.add(cls.VERSION_KEY, cls._new_version(), cls._version_timeout())
+            version = cache.get(cls.VERSION_KEY)
+        return version
+
+    @classmethod
+    def get_all(cls):
+        """
+        Get every timeline
+
+        Returns:
+            dict: Timeline instances by slug
+        """
+        now = time.monotonic()
+        with cls._lock:
+            local = cls._local
+        if local and local[0] > now:
+            return local[2]
+
+        version = cls._version()
+        if local and local[1] == version:
+            timelines = local[2]
+        else:
+            timelines = cache.get(cls._snapshot_key(version))
+            if timelines is None:
+                timelines = {timeline.slug: timeline for timeline in Timeline.objects.all()}
+                cache.set(
+                    cls._snapshot_key(version), timelines, shared_timeout(cls.SHARED_TIMEOUT, cls.LOCAL_TIMEOUT)
+                )
+
+        with cls._lock:
+            cls._local = (now + cls.LOCAL_TIMEOUT, version, timelines)
+        return timelines
+
+    @classmethod
+    def get(cls, slug):
+        """Get a timeline by slug, or None if it does not exist"""
+        return cls.get_all().get(slug)
+
+    @classmethod
+    def get_many(cls, slugs):
+        """
+        Get several timelines by slug at once
+
+        Returns:
+            dict: Slug -> Timeline, or None for unknown slugs
+        """
+        timelines = cls.get_all()
+        return {slug: timelines.get(slug) for slug in slugs}
+
+    @classmethod
+    def invalidate(cls):
+        """Start a new registry version once the current transaction commits"""
+        def _invalidate():
+            try:
+                cache.incr(cls.VERSION_KEY)
+            except ValueError:
+                cache.set(cls.VERSION_KEY, cls._new_version(), cls._version_timeout())
+            cls.clear_local()
+
+        transaction.on_commit(_invalidate)
+
+    @classmethod
+    def clear_local(cls):
+        with cls._lock:
+            cls._local = None
@@ -1,4 +1,4 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.utils.timezone import make_aware, is_naive, now, timedelta
 from django_celery_beat.models import PeriodicTask, ClockedSchedule
@@ -6,10 +6,15 @@ import json
 import logging
 
 from timelines.models import Timeline
+from timelines.registry import TimelineRegistry
 from notifications.services import NotificationService
 
 logger = logging.getLogger(__name__)
 
+@receiver([post_save, post_delete], sender=Timeline)
+def invalidate_timeline_registry(sender, **kwargs):
+    TimelineRegistry.invalidate()
+
 @receiver(post_save, sender=Timeline)
 def schedule_reassignment_on_end(sender, instance, created, **kwargs):
     # Only process group timelines
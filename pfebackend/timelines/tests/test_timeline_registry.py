@@ -0,0 +1,105 @@
+from datetime import timedelta
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework.permissions import AllowAny
+from timelines.mixins import APITimelineRequiredMixin
+from timelines.models import Timeline
+from timelines.registry import TimelineRegistry
+
+
+class GroupsOrThemesView(APITimelineRequiredMixin, APIView):
+    permission_classes = [AllowAny]
+    timeline_slugs = ['groups-4siw', 'themes-4siw', 'missing']
+
+    def get(self, request):
+        return Response({'timeline': request.current_timeline.slug})
+
+
+class TimelineRegistryTests(TestCase):
+    def setUp(self):
+        TimelineRegistry.clear_local()
+        cache.delete(TimelineRegistry.VERSION_KEY)
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.groups = Timeline.objects.create(
+                name='Groups', timeline_type=Timeline.GROUPS, academic_year='4siw',
+                start_date=now - timedelta(days=1), end_date=now + timedelta(days=1)
+            )
+            self.themes = Timeline.objects.create(
+                name='Themes', timeline_type=Timeline.THEMES, academic_year='4siw',
+                start_date=now + timedelta(days=10), end_date=now + timedelta(days=20)
+            )
+
+    def request(self):
+        return GroupsOrThemesView.as_view()(APIRequestFactory().get('/'))
+
+    def test_loads_all_timelines_once(self):
+        with self.assertNumQueries(1):
+            timelines = TimelineRegistry.get_all()
+        self.assertEqual(set(timelines), {'groups-4siw', 'themes-4siw'})
+
+        with self.assertNumQueries(0):
+            self.assertEqual(TimelineRegistry.get('groups-4siw').pk, self.groups.pk)
+            self.assertIsNone(TimelineRegistry.get('missing'))
+
+    def test_shared_snapshot_used_by_other_processes(self):
+        TimelineRegistry.get_all()
+        TimelineRegistry.clear_local()
+
+        with self.assertNumQueries(0):
+            self.assertIn('groups-4siw', TimelineRegistry.get_all())
+
+    def test_mixin_allows_current_timeline_without_queries(self):
+        TimelineRegistry.get_all()
+
+        with self.assertNumQueries(0):
+            response = self.request()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['timeline'], 'groups-4siw')
+
+    def test_mixin_explains_unavailable_timelines(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.groups.end_date = timezone.now() - timedelta(hours=1)
+            self.groups.start_date = timezone.now() - timedelta(days=2)
+            self.groups.save()
+
+        response = self.request()
+
+        self.assertEqual(response.status_code, 403)
+        detail = str(response.data['detail'])
+        self.assertIn("'Groups' has ended", detail)
+        self.assertIn("'Themes' has not started yet", detail)
+        self.assertIn("'missing' does not exist", detail)
+
+    def test_save_invalidates_after_commit(self):
+        self.assertTrue(TimelineRegistry.get('groups-4siw').is_active)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.groups.is_active = False
+            self.groups.save()
+
+        self.assertEqual(TimelineRegistry.get('groups-4siw').status, 'inactive')
+
+    def test_delete_invalidates(self):
+        TimelineRegistry.get_all()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.themes.delete()
+
+        self.assertIsNone(TimelineRegistry.get('themes-4siw'))
+
+    def test_other_process_sees_new_version_after_local_timeout(self):
+        TimelineRegistry.get_all()
+        # Another process saved a timeline: the version moved on, our copy is stale
+        Timeline.objects.filter(pk=self.themes.pk).update(name='Renamed')
+        cache.incr(TimelineRegistry.VERSION_KEY)
+
+        self.assertEqual(TimelineRegistry.get('themes-4siw').name, 'Themes')
+        with mock.patch.object(TimelineRegistry, 'LOCAL_TIMEOUT', 0):
+            TimelineRegistry.clear_local()
+            TimelineRegistry.get_all()
+        self.assertEqual(TimelineRegistry.get('themes-4siw').name, 'Renamed')
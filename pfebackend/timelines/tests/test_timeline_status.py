@@ -0,0 +1,71 @@
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from users.models import User
+from timelines.models import Timeline
+
+
+class TimelineStatusTests(APITestCase):
+    """Status annotations follow the same rules as the Timeline properties"""
+
+    def setUp(self):
+        now = timezone.now()
+        self.user = User.objects.create_user(
+            email='admin@test.com',
+            username='admintest',
+            password='pass123',
+            first_name='Admin',
+            last_name='Test',
+            user_type='administrator'
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.active = Timeline.objects.create(
+            name='Active', timeline_type=Timeline.GROUPS, academic_year='4siw',
+            start_date=now - timedelta(days=1), end_date=now + timedelta(days=1)
+        )
+        self.open_ended = Timeline.objects.create(
+            name='Open ended', timeline_type=Timeline.THEMES, academic_year='4siw',
+            start_date=now - timedelta(days=1), end_date=None
+        )
+        self.upcoming = Timeline.objects.create(
+            name='Upcoming', timeline_type=Timeline.WORK, academic_year='4siw',
+            start_date=now + timedelta(days=5), end_date=now + timedelta(days=10)
+        )
+        self.expired = Timeline.objects.create(
+            name='Expired', timeline_type=Timeline.SOUTENANCE, academic_year='4siw',
+            start_date=now - timedelta(days=10), end_date=now - timedelta(days=5)
+        )
+        self.inactive = Timeline.objects.create(
+            name='Inactive', timeline_type=Timeline.GROUPS, academic_year='3',
+            start_date=now - timedelta(days=1), end_date=now + timedelta(days=1),
+            is_active=False
+        )
+
+    def test_annotations_match_properties(self):
+        for timeline in Timeline.objects.with_status():
+            self.assertEqual(timeline.annotated_status, timeline.status, timeline.name)
+            self.assertEqual(timeline.annotated_is_current, timeline.is_current, timeline.name)
+
+    def list_names(self, **params):
+        response = self.client.get(reverse('timeline:list'), params)
+        self.assertEqual(response.status_code, 200)
+        return {timeline['name'] for timeline in response.data['results']}
+
+    def test_filter_by_status(self):
+        self.assertEqual(self.list_names(status='active'), {'Active', 'Open ended'})
+        self.assertEqual(self.list_names(status='upcoming'), {'Upcoming'})
+        self.assertEqual(self.list_names(status='expired'), {'Expired'})
+        self.assertEqual(self.list_names(status='inactive'), {'Inactive'})
+        self.assertEqual(len(self.list_names(status='unknown')), 5)
+
+    def test_filter_is_current(self):
+        self.assertEqual(self.list_names(is_current='true'), {'Active', 'Open ended'})
+        self.assertEqual(self.list_names(is_current='false'), {'Upcoming', 'Expired', 'Inactive'})
+
+    def test_get_current_timeline(self):
+        self.assertEqual(Timeline.get_current_timeline(Timeline.GROUPS, '4siw'), self.active)
+        self.assertEqual(Timeline.get_current_timeline(Timeline.THEMES, '4siw'), self.open_ended)
+        self.assertIsNone(Timeline.get_current_timeline(Timeline.WORK, '4siw'))
+        self.assertIsNone(Timeline.get_current_timeline(Timeline.GROUPS, '3'))
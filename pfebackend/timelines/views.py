@@ -13,12 +13,12 @@ from timelines.serializers import TimelineSerializer
 from timelines.filters import TimelineFilter
 
 class TimelineListView(ListAPIView):
-    queryset = Timeline.objects.all()
+    queryset = Timeline.objects.with_status()
     serializer_class = TimelineSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_class = TimelineFilter
     search_fields = ["name", "description", "slug"]
-    ordering_fields = ["start_date", "end_date", "academic_year"]
+    ordering_fields = ["start_date", "end_date", "academic_year", "annotated_status"]
     ordering = ["academic_year", "start_date"]
     
     @swagger_auto_schema(
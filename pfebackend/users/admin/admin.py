@@ -16,14 +16,15 @@ from .admin_inlines import (
     TeacherProfileInline,
     AdministratorProfileInline,
     ExternalUserProfileInline,
+    ImportJobInline,
+    ImportJobDisplayMixin,
 )
-from django.http import HttpResponseRedirect
-from users.models import User, Student, StudentSkill, ExcelUpload
+from django.http import HttpResponse, HttpResponseRedirect
+from django.shortcuts import get_object_or_404
+from users.models import User, Student, StudentSkill, ExcelUpload, ImportJob, PromotionRun
+from users.services import ImportJobService
 from users.serializers.base import BaseProfileSerializer
 from django.template.response import TemplateResponse
-from ..student_importer_test_servic import import_students_from_excel
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
 import os
 
 # Dictionary mapping user types to their corresponding inline classes
@@ -129,18 +130,10 @@ class CustomUserAdmin(BaseUserAdmin, ModelAdmin):
             academic_year = request.POST.get('academic_year')
             
             if excel_file and academic_year:
-                # Save the file temporarily
-                file_path = default_storage.save(f'temp/students_import/{excel_file.name}', ContentFile(excel_file.read()))
-                try:
-                    # Call the import function
-                    import_students_from_excel(default_storage.path(file_path), academic_year)
-                    messages.success(request, f"Successfully imported students for academic year {academic_year}")
-                except Exception as e:
-                    messages.error(request, f"Error importing students: {str(e)}")
-                finally:
-                    # Clean up the temporary file
-                    if default_storage.exists(file_path):
-                        default_storage.delete(file_path)
+                # Imported in the background, see ImportJobService
+                upload = ExcelUpload.objects.create(file=excel_file, academic_year=academic_year, decision='update')
+                messages.success(request, f"Import of students for academic year {academic_year} queued")
+                return redirect('admin:users_excelupload_change', upload.id)
             else:
                 messages.error(request, "Please provide both an Excel file and academic year")
             
@@ -174,8 +167,103 @@ class CustomUserAdmin(BaseUserAdmin, ModelAdmin):
         )
         return redirect(reverse_lazy("admin:users_user_changelist"))
     
+
+class ExcelUploadAdmin(ModelAdmin):
+    """Uploads are imported in the background; the change page follows the import"""
+    list_display = ('__str__', 'academic_year', 'decision', 'created_at', 'import_status')
+    list_filter = ('academic_year', 'decision')
+    inlines = [ImportJobInline]
+    actions = ['run_import_again']
+    change_form_template = 'admin/users/import_change_form.html'
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('import_jobs')
+
+    def import_status(self, obj):
+        job = obj.latest_job
+        if job is None:
+            return "-"
+        if job.is_active:
+            return f"{job.get_status_display()} ({job.progress}%)"
+        return job.get_status_display()
+    import_status.short_description = _('Import')
+
+    def change_view(self, request, object_id, form_url='', extra_context=None):
+        upload = self.get_object(request, object_id)
+        job = upload.latest_job if upload else None
+        extra_context = {**(extra_context or {}), 'import_in_progress': bool(job and job.is_active)}
+        return super().change_view(request, object_id, form_url, extra_context)
+
+    @admin.action(description=_("Run the import again"))
+    def run_import_again(self, request, queryset):
+        for upload in queryset:
+            ImportJobService.enqueue(upload)
+        messages.success(request, f"{queryset.count()} import(s) queued.")
+
+
+class ImportJobAdmin(ImportJobDisplayMixin, ModelAdmin):
+    list_display = (
+        'upload', 'status', 'progress_display', 'created_count', 'updated_count',
+        'skipped_count', 'errors_link', 'created_at', 'finished_at',
+    )
+    list_filter = ('status',)
+    list_select_related = ('upload',)
+    readonly_fields = (
+        'upload', 'status', 'progress_display', 'total_rows', 'processed_rows', 'created_count',
+        'updated_count', 'skipped_count', 'errors_link', 'failure', 'started_at', 'finished_at',
+    )
+    exclude = ('errors',)
+    change_form_template = 'admin/users/import_change_form.html'
+
+    def has_add_permission(self, request):
+        return False
+
+    def change_view(self, request, object_id, form_url='', extra_context=None):
+        job = self.get_object(request, object_id)
+        extra_context = {**(extra_context or {}), 'import_in_progress': bool(job and job.is_active)}
+        return super().change_view(request, object_id, form_url, extra_context)
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                '<int:job_id>/errors/',
+                self.admin_site.admin_view(self.errors_view),
+                name='users_importjob_errors',
+            ),
+        ]
+        return custom_urls + urls
+
+    def errors_view(self, request, job_id):
+        """Download the skipped rows of an import as CSV"""
+        job = get_object_or_404(ImportJob, id=job_id)
+        response = HttpResponse(job.errors_csv(), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="import_{job.id}_errors.csv"'
+        return response
+
+
+class PromotionRunAdmin(ModelAdmin):
+    """Promotion runs are written by the importer only"""
+    list_display = ('academic_year', 'status', 'chunks_display', 'promoted_count', 'skipped_count', 'created_at', 'finished_at')
+    list_filter = ('status', 'academic_year')
+    readonly_fields = (
+        'checksum', 'academic_year', 'status', 'chunks_display', 'total_rows',
+        'promoted_count', 'skipped_count', 'finished_at',
+    )
+    exclude = ('plan', 'next_chunk', 'errors')
+
+    def has_add_permission(self, request):
+        return False
+
+    def chunks_display(self, obj):
+        return f"{obj.next_chunk}/{len(obj.plan)}"
+    chunks_display.short_description = _('Chunks applied')
+
+
 # Register your models here.
 admin.site.register(User, CustomUserAdmin)
 # admin.site.register(StudentSkill, ModelAdmin)
-admin.site.register(ExcelUpload, ModelAdmin)
+admin.site.register(ExcelUpload, ExcelUploadAdmin)
+admin.site.register(ImportJob, ImportJobAdmin)
+admin.site.register(PromotionRun, PromotionRunAdmin)
 admin.site.unregister(Group)
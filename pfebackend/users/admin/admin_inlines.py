@@ -1,5 +1,7 @@
 from django.contrib import admin
-from users.models import Student, Teacher, Administrator, ExternalUser
+from django.urls import reverse
+from django.utils.html import format_html
+from users.models import Student, Teacher, Administrator, ExternalUser, ImportJob
 from unfold import admin as UnfoldAdmin
 
 class StudentProfileInline(UnfoldAdmin.StackedInline):
@@ -29,3 +31,30 @@ class AdministratorProfileInline(UnfoldAdmin.StackedInline):
     verbose_name = "Administrator Profile"
     verbose_name_plural = "Administrator Profile"
     tab = True
+
+class ImportJobDisplayMixin:
+    """Progress bar and error file link of an ImportJob, for admin listings"""
+
+    def progress_display(self, obj):
+        return format_html('<progress value="{}" max="100"></progress> {}%', obj.progress, obj.progress)
+    progress_display.short_description = "Progress"
+
+    def errors_link(self, obj):
+        if not obj.errors:
+            return "-"
+        url = reverse('admin:users_importjob_errors', args=[obj.id])
+        return format_html('<a href="{}">{} rows</a>', url, len(obj.errors))
+    errors_link.short_description = "Skipped rows"
+
+class ImportJobInline(ImportJobDisplayMixin, UnfoldAdmin.TabularInline):
+    model = ImportJob
+    extra = 0
+    max_num = 0
+    can_delete = False
+    verbose_name = "Import"
+    verbose_name_plural = "Imports"
+    fields = (
+        'status', 'progress_display', 'processed_rows', 'created_count',
+        'updated_count', 'skipped_count', 'errors_link', 'started_at', 'finished_at',
+    )
+    readonly_fields = fields
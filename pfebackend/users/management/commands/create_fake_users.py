@@ -1,178 +1,349 @@
 import random
+import time
+from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 from faker import Faker
 from users.models import Student, Teacher, Administrator, StudentSkill, ExternalUser
+from teams.models import Team, TeamMembership, TeamSettings
+from teams.services import TeamPartitionPlanner
+from themes.models import Theme, ThemeAssignment
+from supervision.models import Meeting
+from notifications.models import Notification
 
 User = get_user_model()
 
+# Users per type for each --size preset
+PRESETS = {
+    'small': {'students': 10, 'teachers': 10, 'admins': 3, 'externals': 5},
+    'medium': {'students': 2000, 'teachers': 100, 'admins': 10, 'externals': 20},
+    'large': {'students': 20000, 'teachers': 500, 'admins': 20, 'externals': 100},
+}
+
+ACADEMIC_YEARS = ['2', '3', '4siw', '4isi', '4iasd', '5siw', '5isi', '5iasd']
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "HTML/CSS", "React",
+    "Django", "SQL", "Data Analysis", "Machine Learning",
+    "UI/UX Design", "Project Management", "Network Security"
+]
+
+
 class Command(BaseCommand):
-    help = 'Generate random users for testing purposes'
-    
+    help = 'Generate random users for testing, and with --full teams, themes, meetings and notifications for load testing'
+
+    # Share of the students placed in teams, of the teams given a theme,
+    # and per-row counts of the related data
+    TEAMED_RATIO = 0.9
+    ASSIGNED_RATIO = 0.8
+    THEMES_PER_TEACHER = 2
+    MEETINGS_PER_TEAM = 3
+    NOTIFICATIONS_PER_USER = 5
+    MIN_TEAM_MEMBERS = 3
+
+    # Fake texts are drawn from pools instead of generated per row
+    TEXT_POOL_SIZE = 200
+
     def add_arguments(self, parser):
-        parser.add_argument('--students', type=int, default=10, help='Number of students to create')
-        parser.add_argument('--teachers', type=int, default=10, help='Number of teachers to create')
-        parser.add_argument('--admins', type=int, default=3, help='Number of administrators to create')
-        parser.add_argument('--externals', type=int, default=5, help='Number of external users to create')
+        parser.add_argument('--size', choices=PRESETS.keys(), default='small', help='Preset number of users to create')
+        parser.add_argument('--students', type=int, help='Number of students to create (overrides the preset)')
+        parser.add_argument('--teachers', type=int, help='Number of teachers to create (overrides the preset)')
+        parser.add_argument('--admins', type=int, help='Number of administrators to create (overrides the preset)')
+        parser.add_argument('--externals', type=int, help='Number of external users to create (overrides the preset)')
         parser.add_argument('--password', type=str, default='zaarirmoh', help='Password for all created users')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed, the same seed generates the same data')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per INSERT statement')
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Also create teams, themes, theme assignments, meetings and notifications'
+        )
 
     def handle(self, **kwargs):
-        fake = Faker()
-        
-        # Get command parameters
-        num_students = kwargs.get('students', 10)
-        num_teachers = kwargs.get('teachers', 10)
-        num_admins = kwargs.get('admins', 3)
-        num_externals = kwargs.get('externals', 5)
-        password = kwargs.get('password', 'zaarirmoh')
-        
-        self.stdout.write('Creating random users...')
-        
-        # Create students
-        self.stdout.write(f'Creating {num_students} students...')
-        for i in range(num_students):
-            # Create user
-            first_name = fake.first_name()
-            last_name = fake.last_name()
-            email = f"student{i+1}@example.com"
-            username = f"student{i+1}"
-            
-            user = User.objects.create_user(
-                email=email,
-                username=username,
-                first_name=first_name,
-                last_name=last_name,
-                password=password,
-                user_type='student'
+        counts = dict(PRESETS[kwargs['size']])
+        for key in counts:
+            if kwargs.get(key) is not None:
+                counts[key] = kwargs[key]
+
+        self.random = random.Random(kwargs['seed'])
+        self.fake = Faker()
+        self.fake.seed_instance(kwargs['seed'])
+        self.batch_size = kwargs['batch_size']
+        self.now = timezone.now()
+        password = kwargs['password']
+        started = time.monotonic()
+
+        with transaction.atomic():
+            self.step('users and profiles', self.create_users, counts, make_password(password))
+            self.step('skills', self.create_skills)
+            if kwargs['full']:
+                self.step('teams', self.create_teams)
+                self.step('themes', self.create_themes)
+                self.step('theme assignments', self.create_assignments)
+                self.step('meetings', self.create_meetings)
+                self.step('notifications', self.create_notifications)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully created fake data in {time.monotonic() - started:.1f}s:'
+        ))
+        self.stdout.write(f"- {counts['students']} students (password: {password})")
+        self.stdout.write(f"- {counts['teachers']} teachers (password: {password})")
+        self.stdout.write(f"- {counts['admins']} administrators (password: {password})")
+        self.stdout.write(f"- {counts['externals']} external users (password: {password})")
+        if kwargs['full']:
+            self.stdout.write(
+                f'- {len(self.teams)} teams, {len(self.themes)} themes, {len(self.assignments)} assignments, '
+                f'{self.meeting_count} meetings, {self.notification_count} notifications'
             )
-            
-            # Choose a random academic year based on the ACADEMIC_YEAR_CHOICES
-            academic_year_choices = [
-                '2', '3', '4siw', '4isi', '4iasd', '5siw', '5isi', '5iasd'
+
+    def step(self, name, func, *args):
+        started = time.monotonic()
+        self.stdout.write(f'Creating {name}...')
+        func(*args)
+        self.stdout.write(f'  done in {time.monotonic() - started:.2f}s')
+
+    def text_pool(self, generate):
+        return [generate() for _ in range(self.TEXT_POOL_SIZE)]
+
+    def next_numbers(self, prefix, count, taken):
+        """Get the first ``count`` numbers not used by an existing ``<prefix><n>`` username"""
+        numbers = []
+        n = 0
+        while len(numbers) < count:
+            n += 1
+            if f'{prefix}{n}' not in taken:
+                numbers.append(n)
+        return numbers
+
+    def create_users(self, counts, password_hash):
+        """Create every user with one hashed password, then their profiles"""
+        prefixes = {'students': 'student', 'teachers': 'teacher', 'admins': 'admin', 'externals': 'external'}
+        user_types = {'students': 'student', 'teachers': 'teacher', 'admins': 'administrator', 'externals': 'external'}
+
+        query = Q()
+        for prefix in prefixes.values():
+            query |= Q(username__startswith=prefix)
+        taken = set(User.objects.filter(query).values_list('username', flat=True))
+
+        first_names = self.text_pool(self.fake.first_name)
+        last_names = self.text_pool(self.fake.last_name)
+
+        users = {}
+        for key, prefix in prefixes.items():
+            numbers = self.next_numbers(prefix, counts[key], taken)
+            users[key] = [
+                (n, User(
+                    email=f'{prefix}{n}@example.com',
+                    username=f'{prefix}{n}',
+                    first_name=self.random.choice(first_names),
+                    last_name=self.random.choice(last_names),
+                    password=password_hash,
+                    user_type=user_types[key],
+                    is_staff=key == 'admins',
+                ))
+                for n in numbers
             ]
-            
-            # Create student profile with valid current_year
-            student = Student.objects.create(
+
+        self.all_users = User.objects.bulk_create(
+            [user for rows in users.values() for _, user in rows], batch_size=self.batch_size
+        )
+
+        self.students = Student.objects.bulk_create([
+            Student(
                 user=user,
-                matricule=f"STU{i+1:04d}",
-                enrollment_year=random.randint(2018, 2024),
-                current_year=random.choice(academic_year_choices),
-                # group=random.randint(1, 6),
-                academic_status=random.choice(['active'])
-            )
-            
-            # Add some random skills for each student
-            available_skills = [
-                "Python", "Java", "JavaScript", "HTML/CSS", "React", 
-                "Django", "SQL", "Data Analysis", "Machine Learning",
-                "UI/UX Design", "Project Management", "Network Security"
-            ]
-            
-            # Add 1-4 random skills for each student
-            num_skills = random.randint(1, 4)
-            for _ in range(num_skills):
-                skill_name = random.choice(available_skills)
-                proficiency = random.choice(['beginner', 'intermediate', 'advanced', 'expert'])
-                
-                # Create the skill if it doesn't already exist for this student
-                StudentSkill.objects.get_or_create(
-                    student=student,
-                    name=skill_name,
-                    defaults={'proficiency_level': proficiency}
-                )
-        
-        # Create teachers
-        self.stdout.write(f'Creating {num_teachers} teachers...')
-        for i in range(num_teachers):
-            # Create user
-            first_name = fake.first_name()
-            last_name = fake.last_name()
-            email = f"teacher{i+1}@example.com"
-            username = f"teacher{i+1}"
-            
-            user = User.objects.create_user(
-                email=email,
-                username=username,
-                first_name=first_name,
-                last_name=last_name,
-                password=password,
-                user_type='teacher'
+                matricule=f'STU{n:04d}',
+                enrollment_year=self.random.randint(2018, 2024),
+                current_year=self.random.choice(ACADEMIC_YEARS),
+                academic_status='active',
             )
-            
-            # Create teacher profile
-            Teacher.objects.create(
+            for n, user in users['students']
+        ], batch_size=self.batch_size)
+
+        self.teachers = [user for _, user in users['teachers']]
+        Teacher.objects.bulk_create([
+            Teacher(
                 user=user,
-                department=random.choice(['Computer Science', 'Mathematics', 'Physics', 'Chemistry', 'Biology']),
-                grade=random.choice([
-                    'professeur',
-                    'maitre_conferences_a',
-                    'maitre_conferences_b',
-                    'maitre_assistant_a',
-                    'maitre_assistant_b'
-                ])
-            )
-        
-        # Create administrators
-        self.stdout.write(f'Creating {num_admins} administrators...')
-        for i in range(num_admins):
-            # Create user
-            first_name = fake.first_name()
-            last_name = fake.last_name()
-            email = f"admin{i+1}@example.com"
-            username = f"admin{i+1}"
-            
-            user = User.objects.create_user(
-                email=email,
-                username=username,
-                first_name=first_name,
-                last_name=last_name,
-                password=password,
-                user_type='administrator',
-                is_staff=True
+                department=self.random.choice(['Computer Science', 'Mathematics', 'Physics', 'Chemistry', 'Biology']),
+                grade=self.random.choice([grade for grade, _ in Teacher.GRADE_CHOICES]),
             )
-            
-            # Create administrator profile
-            Administrator.objects.create(
+            for user in self.teachers
+        ], batch_size=self.batch_size)
+
+        self.admins = [user for _, user in users['admins']]
+        Administrator.objects.bulk_create([
+            Administrator(
                 user=user,
-                role_description=random.choice([
+                role_description=self.random.choice([
                     'System Administrator',
                     'Academic Affairs',
                     'Student Affairs',
                     'Technical Support',
                     'Department Head'
-                ])
+                ]),
             )
-            
-        # Create external users
-        self.stdout.write(f'Creating {num_externals} external users...')
-        for i in range(num_externals):
-            # Create user
-            first_name = fake.first_name()
-            last_name = fake.last_name()
-            email = f"external{i+1}@example.com"
-            username = f"external{i+1}"
-            
-            user = User.objects.create_user(
-                email=email,
-                username=username,
-                first_name=first_name,
-                last_name=last_name,
-                password=password,
-                user_type='external'
-            )
-            
-            # Create external user profile
-            ExternalUser.objects.create(
+            for user in self.admins
+        ], batch_size=self.batch_size)
+
+        ExternalUser.objects.bulk_create([
+            ExternalUser(
                 user=user,
-                EXTERNAL_USER_TYPE=random.choice([
+                EXTERNAL_USER_TYPE=self.random.choice([
                     ExternalUser.UNIVERSITY,
                     ExternalUser.COMPANY,
                     ExternalUser.OTHER
-                ])
+                ]),
+            )
+            for _, user in users['externals']
+        ], batch_size=self.batch_size)
+
+    def create_skills(self):
+        """Give every student 1 to 4 different skills"""
+        levels = ['beginner', 'intermediate', 'advanced', 'expert']
+        StudentSkill.objects.bulk_create([
+            StudentSkill(student=student, name=name, proficiency_level=self.random.choice(levels))
+            for student in self.students
+            for name in self.random.sample(SKILLS, self.random.randint(1, 4))
+        ], batch_size=self.batch_size)
+
+    def create_teams(self):
+        """Split most students of each year into teams, the first member owning the team"""
+        max_members = TeamSettings.DEFAULT_MAX_MEMBERS
+        planner = TeamPartitionPlanner(self.MIN_TEAM_MEMBERS, max_members, seed=self.random.random())
+        taken_names = set(Team.objects.values_list('academic_year', 'name'))
+
+        by_year = {}
+        for student in self.students:
+            by_year.setdefault(student.current_year, []).append(student.user)
+
+        teams = []
+        members = []
+        for year in ACADEMIC_YEARS:
+            users = by_year.get(year, [])
+            self.random.shuffle(users)
+            number = 0
+            position = 0
+            for size in planner.team_sizes(int(len(users) * self.TEAMED_RATIO)):
+                number += 1
+                while (year, f'Groupe {number}') in taken_names:
+                    number += 1
+                owner = users[position]
+                teams.append(Team(
+                    name=f'Groupe {number}',
+                    description=f'Team of {owner.get_full_name()}',
+                    academic_year=year,
+                    maximum_members=max_members,
+                    created_by=owner,
+                    updated_by=owner,
+                ))
+                members.append(users[position:position + size])
+                position += size
+
+        self.teams = Team.objects.bulk_create(teams, batch_size=self.batch_size)
+        TeamMembership.objects.bulk_create([
+            TeamMembership(
+                team=team,
+                user=user,
+                role=TeamMembership.ROLE_OWNER if index == 0 else TeamMembership.ROLE_MEMBER,
+            )
+            for team, team_members in zip(self.teams, members)
+            for index, user in enumerate(team_members)
+        ], batch_size=self.batch_size)
+
+    def create_themes(self):
+        """Let teachers propose themes for every year, some with co-supervisors"""
+        self.themes = []
+        if not self.teachers:
+            return
+
+        titles = self.text_pool(lambda: self.fake.catch_phrase())
+        descriptions = self.text_pool(lambda: self.fake.paragraph(nb_sentences=5))
+        themes = []
+        for _ in range(len(self.teachers) * self.THEMES_PER_TEACHER):
+            teacher = self.random.choice(self.teachers)
+            themes.append(Theme(
+                title=self.random.choice(titles),
+                description=self.random.choice(descriptions),
+                proposed_by=teacher,
+                tools=', '.join(self.random.sample(SKILLS, 3)),
+                is_verified=True,
+                academic_year=self.random.choice(ACADEMIC_YEARS),
+                created_by=teacher,
+                updated_by=teacher,
+            ))
+        self.themes = Theme.objects.bulk_create(themes, batch_size=self.batch_size)
+
+        CoSupervisor = Theme.co_supervisors.through
+        CoSupervisor.objects.bulk_create([
+            CoSupervisor(theme_id=theme.id, user_id=co_supervisor.id)
+            for theme in self.themes
+            if len(self.teachers) > 1 and self.random.random() < 0.3
+            for co_supervisor in [self.random.choice(self.teachers)]
+            if co_supervisor.id != theme.proposed_by_id
+        ], batch_size=self.batch_size)
+
+    def create_assignments(self):
+        """Assign a theme of the same year to most teams"""
+        self.assignments = []
+        if not self.themes or not self.admins:
+            return
+
+        themes_by_year = {}
+        for theme in self.themes:
+            themes_by_year.setdefault(theme.academic_year, []).append(theme)
+
+        assignments = []
+        for team in self.teams:
+            year_themes = themes_by_year.get(team.academic_year)
+            if year_themes and self.random.random() < self.ASSIGNED_RATIO:
+                theme = self.random.choice(year_themes)
+                assignments.append(ThemeAssignment(
+                    title=theme.title,
+                    team=team,
+                    theme=theme,
+                    assigned_by=self.random.choice(self.admins),
+                ))
+        self.assignments = ThemeAssignment.objects.bulk_create(assignments, batch_size=self.batch_size)
+
+    def create_meetings(self):
+        """Schedule past and upcoming meetings between supervisors and their teams"""
+        titles = self.text_pool(lambda: self.fake.sentence(nb_words=4))
+        meetings = []
+        for assignment in self.assignments:
+            supervisor_id = assignment.theme.proposed_by_id
+            for _ in range(self.MEETINGS_PER_TEAM):
+                scheduled_at = self.now + timedelta(days=self.random.randint(-60, 60), hours=self.random.randint(8, 17))
+                meetings.append(Meeting(
+                    title=self.random.choice(titles),
+                    team=assignment.team,
+                    scheduled_by_id=supervisor_id,
+                    scheduled_at=scheduled_at,
+                    duration_minutes=self.random.choice([30, 60, 90]),
+                    location_type=self.random.choice([Meeting.LOCATION_TYPE_ONLINE, Meeting.LOCATION_TYPE_PHYSICAL]),
+                    status=Meeting.STATUS_COMPLETED if scheduled_at < self.now else Meeting.STATUS_SCHEDULED,
+                    created_by_id=supervisor_id,
+                    updated_by_id=supervisor_id,
+                ))
+        Meeting.objects.bulk_create(meetings, batch_size=self.batch_size)
+        self.meeting_count = len(meetings)
+
+    def create_notifications(self):
+        """Give every user a few read and unread notifications"""
+        contents = self.text_pool(lambda: self.fake.sentence(nb_words=10))
+        types = [notification_type for notification_type, _ in Notification.NOTIFICATION_TYPES]
+        notifications = [
+            Notification(
+                recipient_id=user.id,
+                title=self.random.choice(contents)[:50],
+                content=self.random.choice(contents),
+                type=self.random.choice(types),
+                status=self.random.choice(['read', 'unread', 'unread']),
+                priority=self.random.choice(['low', 'medium', 'high']),
             )
-        
-        self.stdout.write(self.style.SUCCESS('Successfully created random users:'))
-        self.stdout.write(f'- {num_students} students (password: {password})')
-        self.stdout.write(f'- {num_teachers} teachers (password: {password})')
-        self.stdout.write(f'- {num_admins} administrators (password: {password})')
-        self.stdout.write(f'- {num_externals} external users (password: {password})')
\ No newline at end of file
+            for user in self.all_users
+            for _ in range(self.NOTIFICATIONS_PER_USER)
+        ]
+        Notification.objects.bulk_create(notifications, batch_size=self.batch_size)
+        self.notification_count = len(notifications)
@@ -0,0 +1,59 @@
+# Generated by Django 5.1.6 on 2026-10-17 07:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExcelUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Creation Date')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Update Date')),
+                ('file', models.FileField(upload_to='uploads/excels/')),
+                ('academic_year', models.CharField(choices=[('1', '1st Year'), ('2', '2nd Year'), ('3', '3rd Year'), ('4siw', '4th Year SIW'), ('4isi', '4th Year ISI'), ('4iasd', '4th Year IASD'), ('5siw', '5th Year SIW'), ('5isi', '5th Year ISI'), ('5iasd', '5th Year IASD')], default='2', max_length=10)),
+                ('decision', models.CharField(choices=[('update', 'Update'), ('create', 'Create')], default='update', max_length=10)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='studentskill',
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='phone_number',
+            field=models.IntegerField(blank=True, help_text='Enter a valid phone number with country code', null=True),
+        ),
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Creation Date')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Update Date')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='queued', max_length=10)),
+                ('total_rows', models.PositiveIntegerField(default=0)),
+                ('processed_rows', models.PositiveIntegerField(default=0)),
+                ('created_count', models.PositiveIntegerField(default=0)),
+                ('updated_count', models.PositiveIntegerField(default=0)),
+                ('skipped_count', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list, help_text='Skipped rows: row, matricule, message')),
+                ('failure', models.TextField(blank=True, help_text='Why the import stopped, when it failed')),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('upload', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to='users.excelupload')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+    ]
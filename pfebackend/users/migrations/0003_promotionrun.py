@@ -0,0 +1,34 @@
+# Generated by Django 5.1.6 on 2026-10-17 07:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_excelupload_importjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PromotionRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Creation Date')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Update Date')),
+                ('checksum', models.CharField(help_text='SHA-256 of the sheet and academic year', max_length=64, unique=True)),
+                ('academic_year', models.CharField(max_length=10)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='running', max_length=10)),
+                ('plan', models.JSONField(default=list, help_text='Chunks to apply: from, to and student ids')),
+                ('next_chunk', models.PositiveIntegerField(default=0)),
+                ('total_rows', models.PositiveIntegerField(default=0)),
+                ('promoted_count', models.PositiveIntegerField(default=0)),
+                ('skipped_count', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list, help_text='Skipped rows: row, matricule, message')),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -4,6 +4,8 @@ from .teacher import Teacher
 from .user import User
 from .external_user import ExternalUser
 from .excel_upload import ExcelUpload
+from .import_job import ImportJob
+from .promotion_run import PromotionRun
 
 
 __all__ = [
@@ -14,4 +16,6 @@ __all__ = [
     'Teacher',
     'ExternalUser',
     'ExcelUpload',
+    'ImportJob',
+    'PromotionRun',
 ]
\ No newline at end of file
@@ -26,9 +26,18 @@ class ExcelUpload(TimeStampedModel):
     
     
     def save(self, *args, **kwargs):
+        is_new = self._state.adding
         super().save(*args, **kwargs)
-        from ..student_importer_test_servic import import_students_from_excel, create_students_from_excel
-        if self.decision == 'update':
-            import_students_from_excel(file_path=self.file.path, academic_year=self.academic_year)
-        elif self.decision == 'create':
-            create_students_from_excel(file_path=self.file.path, academic_year=self.academic_year)
+        if is_new:
+            # The import runs in a Celery worker, see ImportJobService
+            from ..services import ImportJobService
+            ImportJobService.enqueue(self)
+
+    @property
+    def latest_job(self):
+        # Works from prefetched import_jobs (ordered newest first)
+        jobs = self.import_jobs.all()
+        return jobs[0] if jobs else None
+
+    def __str__(self):
+        return f"{self.file.name} ({self.academic_year}, {self.decision})"
@@ -0,0 +1,68 @@
+import csv
+import io
+from django.db import models
+from common.models import TimeStampedModel
+from .excel_upload import ExcelUpload
+
+
+class ImportJob(TimeStampedModel):
+    """
+    Background run of the import of an ``ExcelUpload``
+
+    Counters are updated after every chunk of rows so that the admin can
+    show the progress of a running import; ``errors`` lists the rows that
+    were skipped and why.
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = (
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    )
+
+    upload = models.ForeignKey(ExcelUpload, on_delete=models.CASCADE, related_name='import_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True)
+
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+
+    errors = models.JSONField(default=list, blank=True, help_text="Skipped rows: row, matricule, message")
+    failure = models.TextField(blank=True, help_text="Why the import stopped, when it failed")
+
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+
+    @property
+    def is_active(self):
+        return self.status in (self.STATUS_QUEUED, self.STATUS_RUNNING)
+
+    @property
+    def progress(self):
+        """Percentage of the rows processed so far"""
+        if self.status == self.STATUS_DONE:
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(100, self.processed_rows * 100 // self.total_rows)
+
+    def errors_csv(self):
+        """Get the skipped rows as CSV text"""
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=['row', 'matricule', 'message'])
+        writer.writeheader()
+        writer.writerows(self.errors)
+        return output.getvalue()
+
+    def __str__(self):
+        return f"Import of {self.upload} ({self.get_status_display()})"
@@ -0,0 +1,48 @@
+from django.db import models
+from common.models import TimeStampedModel
+
+
+class PromotionRun(TimeStampedModel):
+    """
+    Record of the promotion of the students listed in a deliberation sheet
+
+    A run is identified by the checksum of the sheet and the academic year,
+    so importing the same sheet again finds the same run. The transitions
+    are planned once, stored in ``plan`` as chunks of student ids per
+    source and target year, and applied chunk by chunk; ``next_chunk`` is
+    saved with each chunk, so an interrupted run resumes where it stopped
+    and a finished one is not applied twice.
+    """
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = (
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    )
+
+    checksum = models.CharField(max_length=64, unique=True, help_text="SHA-256 of the sheet and academic year")
+    academic_year = models.CharField(max_length=10)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_RUNNING)
+
+    plan = models.JSONField(default=list, help_text="Chunks to apply: from, to and student ids")
+    next_chunk = models.PositiveIntegerField(default=0)
+
+    total_rows = models.PositiveIntegerField(default=0)
+    promoted_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True, help_text="Skipped rows: row, matricule, message")
+
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    @property
+    def is_done(self):
+        return self.status == self.STATUS_DONE
+
+    def __str__(self):
+        return f"Promotion of year {self.academic_year} ({self.get_status_display()})"
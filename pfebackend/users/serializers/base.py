@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db.models import prefetch_related_objects
 
 User = get_user_model()
 
@@ -10,6 +11,13 @@ class BaseProfileSerializer:
     """
     _registry = {}
 
+    # Lookups loading the profile of each user type, nested relations included
+    _profile_lookups = {
+        'student': ('student__skills',),
+        'teacher': ('teacher',),
+        'administrator': ('administrator',),
+    }
+
     @classmethod
     def register(cls, user_type, serializer_class):
         """Register a profile serializer for a specific user type"""
@@ -33,4 +41,43 @@ class BaseProfileSerializer:
             return getattr(user_instance, 'teacher', None)
         elif user_type == 'administrator':
             return getattr(user_instance, 'administrator', None)
-        return None
\ No newline at end of file
+        return None
+
+    @classmethod
+    def profile_prefetches(cls, prefix=''):
+        """
+        Get ``prefetch_related`` lookups loading the profiles of related users
+
+        Args:
+            prefix: Path to the users from the queried model, e.g. 'proposed_by__'
+
+        Returns:
+            list: Lookups costing one query per profile type for the whole queryset
+        """
+        return [
+            f'{prefix}{lookup}'
+            for lookups in cls._profile_lookups.values()
+            for lookup in lookups
+        ]
+
+    @classmethod
+    def prefetch_profiles(cls, users):
+        """
+        Load the profiles of many users at once
+
+        Users are grouped by type and each group costs one query per profile
+        table; profiles already loaded (select_related, prefetch_related) are
+        not fetched again.
+
+        Args:
+            users: List of user instances
+        """
+        by_type = {}
+        for user in users:
+            if user is not None:
+                by_type.setdefault(user.user_type, []).append(user)
+
+        for user_type, group in by_type.items():
+            lookups = cls._profile_lookups.get(user_type)
+            if lookups:
+                prefetch_related_objects(group, *lookups)
@@ -1,6 +1,7 @@
 from djoser.serializers import UserCreateSerializer, UserSerializer
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import models
 from .base import BaseProfileSerializer
 
 User = get_user_model()
@@ -38,11 +39,25 @@ class CustomUserCreateSerializer(UserCreateSerializer):
         
         return user
 
+class CustomUserListSerializer(serializers.ListSerializer):
+    """
+    List serializer loading the profiles of the whole list up front,
+    with one query per user type instead of one per user
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        users = list(iterable)
+        BaseProfileSerializer.prefetch_profiles(users)
+        return super().to_representation(users)
+
+
 class CustomUserSerializer(UserSerializer):
     profile = serializers.SerializerMethodField()
     
     class Meta(UserSerializer.Meta):
         model = User
+        list_serializer_class = CustomUserListSerializer
         fields = (
             'id', 'email', 'username', 'first_name', 'last_name', 'user_type', 
             'profile','profile_picture_url','country','state','phone_number',
@@ -58,8 +73,16 @@ class CustomUserSerializer(UserSerializer):
             return {}
             
         # Get and use the appropriate serializer
-        serializer_class = BaseProfileSerializer.get_serializer_for_type(instance.user_type)
-        return serializer_class(profile_instance).data
+        return self.get_profile_serializer(instance.user_type).to_representation(profile_instance)
+
+    def get_profile_serializer(self, user_type):
+        """Profile serializer for a user type, built once and reused for every row"""
+        if not hasattr(self, '_profile_serializers'):
+            self._profile_serializers = {}
+        if user_type not in self._profile_serializers:
+            serializer_class = BaseProfileSerializer.get_serializer_for_type(user_type)
+            self._profile_serializers[user_type] = serializer_class()
+        return self._profile_serializers[user_type]
     
     def update(self, instance, validated_data):
         profile_data = None
@@ -0,0 +1,13 @@
+from .student_import_service import StudentImportService, StudentImportResult, ACADEMIC_YEAR_TRANSITIONS
+from .student_sheet_reader import StudentSheetReader
+from .student_promotion_service import StudentPromotionService
+from .import_job_service import ImportJobService
+
+__all__ = [
+    'StudentImportService',
+    'StudentImportResult',
+    'ACADEMIC_YEAR_TRANSITIONS',
+    'StudentSheetReader',
+    'StudentPromotionService',
+    'ImportJobService',
+]
@@ -0,0 +1,111 @@
+import logging
+from django.db import transaction
+from django.utils import timezone
+from users.models import ImportJob
+from .student_import_service import StudentImportService
+from .student_promotion_service import StudentPromotionService
+
+logger = logging.getLogger(__name__)
+
+
+class ImportJobService:
+    """
+    Service class running ``ExcelUpload`` imports in the background
+
+    ``enqueue`` records a queued ``ImportJob`` and hands it to the
+    ``run_import_job`` Celery task once the upload is committed, so the
+    upload request returns right away. The task calls ``run``, which
+    stores the counters after every chunk and the skipped rows at the end.
+    """
+
+    @staticmethod
+    def enqueue(upload):
+        """
+        Queue the import of an uploaded sheet
+
+        Args:
+            upload: ExcelUpload instance
+
+        Returns:
+            The queued ImportJob
+        """
+        from users.tasks import run_import_job
+
+        job = ImportJob.objects.create(upload=upload)
+
+        def _send():
+            try:
+                run_import_job.delay(job.id)
+            except Exception as e:
+                logger.error(f"Could not queue import job {job.id}: {str(e)}")
+                ImportJob.objects.filter(id=job.id).update(
+                    status=ImportJob.STATUS_FAILED,
+                    failure=f"Could not queue the import: {str(e)}",
+                    finished_at=timezone.now(),
+                )
+
+        transaction.on_commit(_send)
+        return job
+
+    @staticmethod
+    def _save_progress(job_id, result):
+        ImportJob.objects.filter(id=job_id).update(
+            total_rows=max(result.total, result.processed),
+            processed_rows=result.processed,
+            created_count=result.created,
+            updated_count=result.promoted,
+            skipped_count=result.skipped,
+        )
+
+    @classmethod
+    def run(cls, job_id):
+        """
+        Run a queued import job
+
+        Jobs that are no longer queued (e.g. a redelivered task) are left alone.
+
+        Args:
+            job_id: ImportJob id
+
+        Returns:
+            The ImportJob, or None if it was not queued
+        """
+        claimed = ImportJob.objects.filter(id=job_id, status=ImportJob.STATUS_QUEUED).update(
+            status=ImportJob.STATUS_RUNNING, started_at=timezone.now()
+        )
+        if not claimed:
+            logger.info(f"Import job {job_id} is not queued, skipping")
+            return None
+
+        job = ImportJob.objects.select_related('upload').get(id=job_id)
+        upload = job.upload
+        result = None
+
+        def progress(current):
+            nonlocal result
+            result = current
+            cls._save_progress(job_id, current)
+
+        try:
+            if upload.decision == 'create':
+                sheet = StudentImportService.open_sheet(upload.file.path)
+                result = StudentImportService.create_students(sheet, upload.academic_year, progress=progress)
+            else:
+                _, result = StudentPromotionService.run(upload.file.path, upload.academic_year, progress=progress)
+        except Exception as e:
+            logger.exception(f"Import job {job_id} failed: {str(e)}")
+            job.status = ImportJob.STATUS_FAILED
+            job.failure = str(e)
+        else:
+            job.status = ImportJob.STATUS_DONE
+
+        if result is not None:
+            job.total_rows = max(result.total, result.processed)
+            job.processed_rows = result.processed
+            job.created_count = result.created
+            job.updated_count = result.promoted
+            job.skipped_count = result.skipped
+            job.errors = result.errors
+        job.finished_at = timezone.now()
+        job.save()
+        return job
@@ -0,0 +1,273 @@
+import logging
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils.text import slugify
+from users.models import User, Student
+from .student_sheet_reader import StudentSheetReader
+
+logger = logging.getLogger(__name__)
+
+# Helper mapping of academic year transitions
+ACADEMIC_YEAR_TRANSITIONS = {
+    '2': '3',
+    '3': '4siw',
+    '4siw': '5siw',
+    '4isi': '5isi',
+    '4iasd': '5iasd',
+}
+
+
+class StudentImportResult:
+    """Counters and per-row errors of one import"""
+
+    def __init__(self):
+        self.total = 0
+        self.created = 0
+        self.promoted = 0
+        self.skipped = 0
+        self.errors = []  # [{'row', 'matricule', 'message'}]
+
+    @property
+    def processed(self):
+        return self.created + self.promoted + self.skipped
+
+    def skip(self, row, matricule, message):
+        self.skipped += 1
+        self.errors.append({'row': row, 'matricule': matricule, 'message': message})
+
+    def __str__(self):
+        return (
+            f"Created: {self.created}, Promoted: {self.promoted}, "
+            f"Skipped: {self.skipped}"
+        )
+
+
+class StudentImportService:
+    """
+    Service class for importing students from the registrar's Excel exports
+
+    Sheets have six heading rows before the column titles. Imports take
+    either a whole DataFrame or an iterable of DataFrame chunks, such as a
+    ``StudentSheetReader`` streaming a large workbook or CSV file.
+
+    Rows are processed in chunks of ``STUDENT_IMPORT_CHUNK_SIZE``: columns
+    are normalized with vectorized pandas operations, the chunk's existing
+    matricules are loaded with one query and rows are written with
+    ``bulk_create``, so the number of queries grows with the number of
+    chunks, not rows. Existing usernames are loaded once per import and
+    collisions are resolved in memory. Promotions are handled by
+    ``StudentPromotionService``.
+
+    Each chunk is committed on its own and reported to the optional
+    ``progress`` callback. Rerunning a sheet after a failure is safe:
+    students created by the committed chunks are skipped.
+
+    New accounts share the temporary password ``STUDENT_IMPORT_PASSWORD``,
+    hashed once per import.
+    """
+
+    HEADER_ROWS = 6
+    EMAIL_DOMAIN = 'esi-sba.dz'
+
+    # Normalized field -> column title in the sheet
+    COLUMNS = {
+        'matricule': "N° d'inscription",
+        'last_name': 'Nom',
+        'first_name': 'Prénom',
+        'decision': 'Décision',
+    }
+    CREATE_FIELDS = ('matricule', 'last_name', 'first_name')
+    UPDATE_FIELDS = ('matricule', 'decision')
+
+    @staticmethod
+    def chunk_size():
+        return getattr(settings, 'STUDENT_IMPORT_CHUNK_SIZE', 500)
+
+    @staticmethod
+    def password_hash():
+        return make_password(getattr(settings, 'STUDENT_IMPORT_PASSWORD', 'zaarirmoh'))
+
+    @classmethod
+    def open_sheet(cls, file_path):
+        """
+        Stream an Excel or CSV export in chunks
+
+        Returns:
+            StudentSheetReader: Iterable of DataFrame chunks
+        """
+        return StudentSheetReader(file_path, cls.chunk_size())
+
+    @classmethod
+    def normalize(cls, df, fields):
+        """
+        Select and clean the columns needed for an import
+
+        Column titles are matched ignoring case and surrounding spaces.
+        Values are stripped, names capitalized and decisions lowercased;
+        missing cells become empty strings and blank rows are dropped.
+
+        Args:
+            df: DataFrame as read from the sheet
+            fields: Normalized fields required, keys of ``COLUMNS``
+
+        Returns:
+            DataFrame: One column per field, plus ``row`` (sheet row number)
+
+        Raises:
+            ValueError: If a required column is missing
+        """
+        titles = {str(title).strip().lower(): title for title in df.columns}
+        missing = [cls.COLUMNS[field] for field in fields if cls.COLUMNS[field].lower() not in titles]
+        if missing:
+            raise ValueError(f"Missing required columns in Excel file: {', '.join(missing)}")
+
+        normalized = pd.DataFrame(index=df.index)
+        for field in fields:
+            column = df[titles[cls.COLUMNS[field].lower()]]
+            normalized[field] = column.astype(str).where(column.notna(), '').str.strip()
+
+        if 'matricule' in normalized:
+            # Numeric cells come back as "12345.0" from some exports
+            normalized['matricule'] = normalized['matricule'].str.replace(r'\.0$', '', regex=True)
+        for field in ('last_name', 'first_name'):
+            if field in normalized:
+                normalized[field] = normalized[field].str.capitalize()
+        if 'decision' in normalized:
+            normalized['decision'] = normalized['decision'].str.lower()
+
+        # Sheet row number: rows up to the titles, then 1-based data rows
+        header_row = df.attrs.get('header_row', cls.HEADER_ROWS + 1)
+        normalized['row'] = df.index + header_row + 1
+        return normalized[(normalized[list(fields)] != '').any(axis=1)]
+
+    @classmethod
+    def _chunks(cls, source, result):
+        """Iterate over the chunks of a DataFrame or an iterable of chunks"""
+        if isinstance(source, pd.DataFrame):
+            result.total = len(source)
+            size = cls.chunk_size()
+            for start in range(0, len(source), size):
+                yield source.iloc[start:start + size]
+            return
+
+        for chunk in source:
+            # Readers know their size once the file is opened
+            result.total = max(getattr(source, 'total_rows', None) or 0, result.total)
+            yield chunk
+
+    @staticmethod
+    def _unique_usernames(base_usernames, taken):
+        """
+        Give each base username a free variant, suffixing 1, 2, ... on collision
+
+        Args:
+            base_usernames: Iterable of slugified names
+            taken: Set of usernames and email local parts already in use,
+                   updated in place
+
+        Returns:
+            list: One unique username per base username
+        """
+        next_suffix = {}
+        usernames = []
+        for base in base_usernames:
+            username = base
+            if username in taken:
+                counter = next_suffix.get(base, 1)
+                while f"{base}{counter}" in taken:
+                    counter += 1
+                username = f"{base}{counter}"
+                next_suffix[base] = counter + 1
+            taken.add(username)
+            usernames.append(username)
+        return usernames
+
+    @classmethod
+    def _taken_usernames(cls):
+        """Get the usernames, and the local parts of school emails, in use"""
+        domain = f"@{cls.EMAIL_DOMAIN}"
+        taken = set()
+        for username, email in User.objects.values_list('username', 'email'):
+            taken.add(username)
+            if email.endswith(domain):
+                taken.add(email[:-len(domain)])
+        return taken
+
+    @classmethod
+    def create_students(cls, source, academic_year, progress=None):
+        """
+        Create student accounts for the rows of a sheet
+
+        Rows with missing data, and matricules that already exist or repeat
+        an earlier row, are skipped.
+
+        Args:
+            source: DataFrame as read from the sheet, or an iterable of chunks
+            academic_year: Current year given to the new students
+            progress: Optional callable receiving the result after each chunk
+
+        Returns:
+            StudentImportResult: Import counters and skipped rows
+        """
+        result = StudentImportResult()
+        taken = None
+        password = None
+        domain = f"@{cls.EMAIL_DOMAIN}"
+
+        for chunk in cls._chunks(source, result):
+            rows = cls.normalize(chunk, cls.CREATE_FIELDS)
+
+            incomplete = (rows[list(cls.CREATE_FIELDS)] == '').any(axis=1)
+            for row in rows[incomplete].itertuples(index=False):
+                result.skip(row.row, row.matricule, "Missing matricule, first name or last name")
+            rows = rows[~incomplete]
+
+            existing = set(
+                Student.objects.filter(matricule__in=rows['matricule'].unique().tolist())
+                .values_list('matricule', flat=True)
+            ) if len(rows) else set()
+            known = rows['matricule'].isin(existing)
+            repeated = rows['matricule'].duplicated() & ~known
+            for row in rows[known].itertuples(index=False):
+                result.skip(row.row, row.matricule, "Student already exists")
+            for row in rows[repeated].itertuples(index=False):
+                result.skip(row.row, row.matricule, "Matricule repeated in the file")
+            rows = rows[~known & ~repeated]
+
+            if not rows.empty:
+                if taken is None:
+                    taken = cls._taken_usernames()
+                    password = cls.password_hash()
+                base_usernames = (rows['first_name'] + '.' + rows['last_name']).map(slugify)
+                rows = rows.assign(username=cls._unique_usernames(base_usernames, taken))
+
+                with transaction.atomic():
+                    users = User.objects.bulk_create([
+                        User(
+                            email=f"{row.username}{domain}",
+                            username=row.username,
+                            first_name=row.first_name,
+                            last_name=row.last_name,
+                            password=password,
+                            user_type='student',
+                        )
+                        for row in rows.itertuples(index=False)
+                    ])
+                    Student.objects.bulk_create([
+                        Student(
+                            user=user,
+                            matricule=matricule,
+                            current_year=academic_year,
+                            academic_status='active',
+                        )
+                        for user, matricule in zip(users, rows['matricule'])
+                    ])
+                result.created += len(users)
+
+            if progress:
+                progress(result)
+
+        logger.info(f"Student import for year {academic_year} complete. {result}")
+        return result
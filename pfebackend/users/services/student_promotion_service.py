@@ -0,0 +1,195 @@
+import hashlib
+import logging
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from users.models import Student, PromotionRun
+from .student_import_service import StudentImportService, StudentImportResult, ACADEMIC_YEAR_TRANSITIONS
+
+logger = logging.getLogger(__name__)
+
+
+class StudentPromotionService:
+    """
+    Service class moving the students admitted in a deliberation sheet to the next year
+
+    The whole sheet is read first and turned into a plan: the ids of the
+    students to move, grouped by source and target year and cut into chunks
+    of ``STUDENT_IMPORT_CHUNK_SIZE``. Each chunk is then applied with one
+    ``UPDATE ... WHERE id IN (...) AND current_year = <source>`` statement
+    in its own transaction. The year condition makes every statement
+    idempotent: a student already moved is never moved again.
+
+    ``run`` records the plan in a ``PromotionRun`` keyed by the checksum of
+    the sheet. Importing the same sheet again returns the finished run
+    without touching any student, and a run that failed resumes from its
+    last committed chunk.
+    """
+
+    @staticmethod
+    def checksum(file_path, academic_year):
+        """Get the SHA-256 of a sheet's content and the academic year it is imported for"""
+        digest = hashlib.sha256(f'{academic_year}:'.encode())
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @classmethod
+    def plan(cls, source, academic_year, result):
+        """
+        Find the students to promote
+
+        Rows that are not admitted, unknown for the year or repeated are
+        recorded as skipped in ``result``.
+
+        Args:
+            source: DataFrame as read from the sheet, or an iterable of chunks
+            academic_year: Year the sheet is for
+            result: StudentImportResult collecting the skipped rows
+
+        Returns:
+            list: Chunks as {'from': year, 'to': year, 'ids': [student ids]}
+        """
+        next_year = ACADEMIC_YEAR_TRANSITIONS.get(academic_year)
+        planned = set()
+        by_target = {}
+
+        for chunk in StudentImportService._chunks(source, result):
+            rows = StudentImportService.normalize(chunk, StudentImportService.UPDATE_FIELDS)
+            rows = rows[rows['matricule'] != '']
+
+            if next_year is None:
+                for row in rows.itertuples(index=False):
+                    result.skip(row.row, row.matricule, f"No transition mapping defined for year '{academic_year}'")
+                continue
+
+            # 'Admis(e)' but not 'Non admis(e)'
+            admitted = rows['decision'].str.match(r'admis')
+            for row in rows[~admitted].itertuples(index=False):
+                result.skip(row.row, row.matricule, f"Marked '{row.decision}', not promoted")
+            rows = rows[admitted]
+            if rows.empty:
+                continue
+
+            students = dict(
+                Student.objects.filter(matricule__in=rows['matricule'].tolist(), current_year=academic_year)
+                .values_list('matricule', 'id')
+            )
+            for row in rows.itertuples(index=False):
+                student_id = students.get(row.matricule)
+                if student_id is None:
+                    result.skip(row.row, row.matricule, f"Student not found for year {academic_year}")
+                elif student_id in planned:
+                    result.skip(row.row, row.matricule, "Matricule repeated in the file")
+                else:
+                    planned.add(student_id)
+                    by_target.setdefault((academic_year, next_year), []).append(student_id)
+
+        size = StudentImportService.chunk_size()
+        return [
+            {'from': source_year, 'to': target_year, 'ids': ids[start:start + size]}
+            for (source_year, target_year), ids in by_target.items()
+            for start in range(0, len(ids), size)
+        ]
+
+    @staticmethod
+    def apply_chunk(chunk):
+        """
+        Move one chunk of students to their target year
+
+        Returns:
+            int: Number of students moved
+        """
+        return Student.objects.filter(id__in=chunk['ids'], current_year=chunk['from']).update(
+            current_year=chunk['to']
+        )
+
+    @classmethod
+    def promote(cls, source, academic_year, progress=None):
+        """
+        Promote the admitted students of a sheet, without recording a run
+
+        Args:
+            source: DataFrame as read from the sheet, or an iterable of chunks
+            academic_year: Year the sheet is for
+            progress: Optional callable receiving the result after each chunk
+
+        Returns:
+            StudentImportResult: Import counters and skipped rows
+        """
+        result = StudentImportResult()
+        chunks = cls.plan(source, academic_year, result)
+        if progress:
+            progress(result)
+
+        for chunk in chunks:
+            with transaction.atomic():
+                result.promoted += cls.apply_chunk(chunk)
+            if progress:
+                progress(result)
+
+        logger.info(f"Promotion from year {academic_year} complete. {result}")
+        return result
+
+    @classmethod
+    def run(cls, file_path, academic_year, progress=None):
+        """
+        Promote the admitted students of a sheet file, once
+
+        Args:
+            file_path: Path of the deliberation sheet (Excel or CSV)
+            academic_year: Year the sheet is for
+            progress: Optional callable receiving the result after each chunk
+
+        Returns:
+            tuple: (PromotionRun, StudentImportResult)
+        """
+        checksum = cls.checksum(file_path, academic_year)
+        result = StudentImportResult()
+
+        run = PromotionRun.objects.filter(checksum=checksum).first()
+        created = False
+        if run is None:
+            plan = cls.plan(StudentImportService.open_sheet(file_path), academic_year, result)
+            run, created = PromotionRun.objects.get_or_create(checksum=checksum, defaults={
+                'academic_year': academic_year,
+                'plan': plan,
+                'total_rows': result.total,
+                'skipped_count': result.skipped,
+                'errors': result.errors,
+            })
+
+        if not created:
+            result = StudentImportResult()
+            result.total = run.total_rows
+            result.skipped = run.skipped_count
+            result.errors = list(run.errors)
+            result.promoted = run.promoted_count
+            if run.is_done:
+                logger.info(f"Promotion run {run.id} already applied, nothing to do")
+                return run, result
+            logger.info(f"Resuming promotion run {run.id} at chunk {run.next_chunk}/{len(run.plan)}")
+            PromotionRun.objects.filter(id=run.id).update(status=PromotionRun.STATUS_RUNNING)
+
+        if progress:
+            progress(result)
+
+        try:
+            for index in range(run.next_chunk, len(run.plan)):
+                with transaction.atomic():
+                    moved = cls.apply_chunk(run.plan[index])
+                    PromotionRun.objects.filter(id=run.id).update(
+                        next_chunk=index + 1, promoted_count=F('promoted_count') + moved
+                    )
+                result.promoted += moved
+                if progress:
+                    progress(result)
+        except Exception:
+            PromotionRun.objects.filter(id=run.id).update(status=PromotionRun.STATUS_FAILED)
+            raise
+
+        PromotionRun.objects.filter(id=run.id).update(status=PromotionRun.STATUS_DONE, finished_at=timezone.now())
+        run.refresh_from_db()
+        logger.info(f"Promotion run {run.id} for year {academic_year} complete. {result}")
+        return run, result
@@ -0,0 +1,115 @@
+import csv
+import itertools
+import os
+import pandas as pd
+
+
+class StudentSheetReader:
+    """
+    Reads a registrar export lazily, in DataFrames of ``chunk_size`` rows
+
+    ``.xlsx`` / ``.xlsm`` workbooks are read with openpyxl's read-only
+    iterator and ``.csv`` files (comma, semicolon or tab separated) with the
+    csv module, so only one chunk of rows is held in memory whatever the
+    size of the file. Legacy ``.xls`` workbooks are loaded whole by pandas
+    and then chunked the same way.
+
+    The title row is the first row, among the first ``HEADER_SEARCH_ROWS``,
+    containing the matricule column; the heading rows above it are skipped.
+    Each chunk is indexed by its position among the data rows and carries
+    the sheet row number of the titles in ``attrs['header_row']``, which
+    ``StudentImportService.normalize`` uses to number rows in its reports.
+    """
+
+    HEADER_SEARCH_ROWS = 20
+    HEADER_TITLE = "N° d'inscription"
+
+    EXCEL_EXTENSIONS = ('.xlsx', '.xlsm')
+    CSV_EXTENSIONS = ('.csv',)
+    LEGACY_EXTENSIONS = ('.xls',)
+
+    def __init__(self, file_path, chunk_size):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.extension = os.path.splitext(file_path)[1].lower()
+        if self.extension not in self.EXCEL_EXTENSIONS + self.CSV_EXTENSIONS + self.LEGACY_EXTENSIONS:
+            raise ValueError(f"Unsupported file type '{self.extension}', expected an Excel or CSV file.")
+        # Number of rows after the titles, when it can be known before reading
+        self.total_rows = None
+
+    def __iter__(self):
+        if self.extension in self.EXCEL_EXTENSIONS:
+            return self._chunks(self._excel_rows)
+        if self.extension in self.CSV_EXTENSIONS:
+            return self._chunks(self._csv_rows)
+        return self._chunks(self._legacy_rows)
+
+    def _excel_rows(self):
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.active
+            yield sheet.max_row
+            yield from sheet.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+    def _csv_rows(self):
+        with open(self.file_path, encoding='utf-8-sig', newline='') as f:
+            line_count = sum(1 for _ in f)
+            f.seek(0)
+            sample = f.read(4096)
+            f.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+            except csv.Error:
+                dialect = csv.excel
+            yield line_count
+            yield from csv.reader(f, dialect)
+
+    def _legacy_rows(self):
+        df = pd.read_excel(self.file_path, header=None, dtype=str)
+        yield len(df)
+        yield from df.itertuples(index=False, name=None)
+
+    def _find_header(self, rows):
+        """
+        Get the titles and sheet row number of the title row
+
+        Raises:
+            ValueError: If no title row is found
+        """
+        title = self.HEADER_TITLE.lower()
+        for number, row in enumerate(itertools.islice(rows, self.HEADER_SEARCH_ROWS), start=1):
+            cells = ['' if cell is None or cell != cell else str(cell).strip() for cell in row]
+            if title in (cell.lower() for cell in cells):
+                titles = [cell or f'Unnamed: {i}' for i, cell in enumerate(cells)]
+                return titles, number
+        raise ValueError(f"Missing required columns in Excel file: {self.HEADER_TITLE}")
+
+    def _chunks(self, read_rows):
+        rows = read_rows()
+        try:
+            row_count = next(rows)
+            titles, header_row = self._find_header(rows)
+            if row_count:
+                self.total_rows = max(row_count - header_row, 0)
+
+            position = 0
+            while True:
+                batch = list(itertools.islice(rows, self.chunk_size))
+                if not batch:
+                    break
+                # Short rows (trailing empty cells) are padded, extra cells dropped
+                width = len(titles)
+                batch = [tuple(row[:width]) + (None,) * (width - len(row)) for row in batch]
+                chunk = pd.DataFrame(
+                    batch, columns=titles, dtype=object,
+                    index=pd.RangeIndex(position, position + len(batch))
+                )
+                chunk.attrs['header_row'] = header_row
+                position += len(batch)
+                yield chunk
+        finally:
+            rows.close()
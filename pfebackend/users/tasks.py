@@ -0,0 +1,25 @@
+from celery import shared_task
+from .services import ImportJobService
+
+
+@shared_task
+def run_import_job(job_id):
+    """
+    Celery task running a queued student import.
+
+    Args:
+        job_id (int): ImportJob id
+
+    Returns:
+        dict: Final status and counters of the job
+    """
+    job = ImportJobService.run(job_id)
+    if job is None:
+        return {"status": "skipped"}
+    return {
+        "status": job.status,
+        "processed": job.processed_rows,
+        "created": job.created_count,
+        "updated": job.updated_count,
+        "skipped": job.skipped_count,
+    }
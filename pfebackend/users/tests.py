@@ -4,6 +4,7 @@ from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from users.models import User, Student, Teacher, Administrator, ExternalUser, StudentSkill
 from django.utils import timezone
+from common.testing import QueryCountAssertionsMixin
 
 class UserModelTests(TestCase):
     def test_student_creation(self):
@@ -231,4 +232,558 @@ class UserAPITests(APITestCase):
         response = self.client.get(url, {'user_type': 'student'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['user_type'], 'student')
\ No newline at end of file
+        self.assertEqual(response.data[0]['user_type'], 'student')
+
+class CustomUserSerializerQueryTests(QueryCountAssertionsMixin, APITestCase):
+    """Profiles of listed users are loaded with one query per user type"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            email='admin@test.com',
+            username='admintest',
+            password='pass123',
+            first_name='Admin',
+            last_name='Test',
+            user_type='administrator'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        self.count = 0
+        self.add_users()
+
+    def add_users(self):
+        """Create one student (with skills) and one teacher"""
+        self.count += 1
+        student_user = User.objects.create_user(
+            email=f'student{self.count}@test.com',
+            username=f'student{self.count}',
+            password='pass123',
+            first_name='Student',
+            last_name='Test',
+            user_type='student'
+        )
+        student = Student.objects.create(
+            user=student_user,
+            matricule=f'M{self.count}',
+            enrollment_year=2023,
+            current_year='4siw',
+            academic_status='active'
+        )
+        StudentSkill.objects.create(student=student, name='Python')
+        StudentSkill.objects.create(student=student, name='Django')
+
+        teacher_user = User.objects.create_user(
+            email=f'teacher{self.count}@test.com',
+            username=f'teacher{self.count}',
+            password='pass123',
+            first_name='Teacher',
+            last_name='Test',
+            user_type='teacher'
+        )
+        Teacher.objects.create(user=teacher_user, department='Computer Science', grade='maitre_assistant_b')
+
+    def grow(self):
+        for _ in range(3):
+            self.add_users()
+
+    def test_many_serializer_prefetches_profiles(self):
+        from users.serializers import CustomUserSerializer
+
+        self.grow()
+        users = list(User.objects.order_by('id'))
+        # One query per profile type present plus the student skills
+        with self.assertNumQueries(4):
+            data = CustomUserSerializer(users, many=True).data
+
+        by_type = {item['user_type']: item['profile'] for item in data}
+        self.assertEqual(by_type['teacher']['department'], 'Computer Science')
+        self.assertEqual(len(by_type['student']['skills']), 2)
+        self.assertEqual(by_type['administrator'], {})
+
+    def test_profile_list_queries_constant(self):
+        url = reverse('profile-list')
+        self.assertConstantQueries(lambda: self.client.get(url), self.grow)
+
+    def test_student_list_queries_constant(self):
+        url = reverse('student-list')
+        self.assertConstantQueries(lambda: self.client.get(url), self.grow)
+
+    def test_teacher_list_queries_constant(self):
+        url = reverse('teacher-list')
+        self.assertConstantQueries(lambda: self.client.get(url), self.grow)
+
+
+class StudentImportServiceTests(TestCase):
+    """Students are imported in bulk from the registrar's sheets"""
+
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write_sheet(self, rows, name='students.xlsx'):
+        """Write a sheet laid out like the registrar's exports (six heading rows)"""
+        import os
+        import pandas as pd
+
+        path = os.path.join(self.tmpdir.name, name)
+        pd.DataFrame(rows).to_excel(path, startrow=6, index=False)
+        return path
+
+    def create_student(self, matricule, username, current_year='2'):
+        user = User.objects.create_user(
+            email=f'{username}@esi-sba.dz',
+            username=username,
+            password='pass123',
+            first_name='Existing',
+            last_name='Student',
+            user_type='student'
+        )
+        return Student.objects.create(user=user, matricule=matricule, current_year=current_year)
+
+    def test_create_students(self):
+        from users.student_importer_test_servic import create_students_from_excel
+
+        self.create_student('100', 'ali.benali')
+        path = self.write_sheet([
+            {"N° d'inscription": 100, 'Nom': 'benali', 'Prénom': 'ali'},
+            {"N° d'inscription": 101, 'Nom': 'benali', 'Prénom': 'ali'},
+            {"N° d'inscription": 102, 'Nom': ' BENALI ', 'Prénom': 'Ali'},
+            {"N° d'inscription": 102, 'Nom': 'Other', 'Prénom': 'Name'},
+            {"N° d'inscription": 103, 'Nom': '', 'Prénom': 'Sara'},
+            {"N° d'inscription": 104, 'Nom': 'Kaci', 'Prénom': 'sara'},
+        ])
+
+        result = create_students_from_excel(path, '3')
+
+        self.assertEqual(result.created, 3)
+        self.assertEqual(result.skipped, 3)
+        self.assertEqual(
+            sorted((error['row'], error['matricule']) for error in result.errors),
+            [(8, '100'), (11, '102'), (12, '103')]
+        )
+        students = Student.objects.filter(current_year='3').select_related('user').order_by('matricule')
+        self.assertEqual(
+            [(s.matricule, s.user.username, s.user.email, s.user.last_name) for s in students],
+            [
+                ('101', 'alibenali', 'alibenali@esi-sba.dz', 'Benali'),
+                ('102', 'alibenali1', 'alibenali1@esi-sba.dz', 'Benali'),
+                ('104', 'sarakaci', 'sarakaci@esi-sba.dz', 'Kaci'),
+            ]
+        )
+        self.assertTrue(students[0].user.check_password('zaarirmoh'))
+
+    def test_create_students_queries_do_not_grow_with_rows(self):
+        from users.services import StudentImportService
+        import pandas as pd
+
+        def sheet(count, offset):
+            return pd.DataFrame({
+                "N° d'inscription": [str(offset + i) for i in range(count)],
+                'Nom': ['Student'] * count,
+                'Prénom': [f'Name{offset + i}' for i in range(count)],
+            })
+
+        # Existing matricules, existing usernames, then users and students
+        # inside a savepoint
+        with self.assertNumQueries(6):
+            StudentImportService.create_students(sheet(5, 0), '2')
+        with self.assertNumQueries(6):
+            StudentImportService.create_students(sheet(40, 100), '2')
+        self.assertEqual(Student.objects.count(), 45)
+
+    def test_create_students_missing_column(self):
+        from users.student_importer_test_servic import create_students_from_excel
+
+        path = self.write_sheet([{"N° d'inscription": 1, 'Nom': 'Kaci'}])
+        with self.assertRaises(ValueError):
+            create_students_from_excel(path, '2')
+
+    def test_promote_students(self):
+        from users.student_importer_test_servic import import_students_from_excel
+
+        self.create_student('200', 'first')
+        self.create_student('201', 'second')
+        self.create_student('202', 'third', current_year='3')
+        path = self.write_sheet([
+            {"N° d'inscription": 200, 'Nom': 'A', 'Prénom': 'B', 'Décision': 'Admis(e)'},
+            {"N° d'inscription": 201, 'Nom': 'A', 'Prénom': 'B', 'Décision': 'Ajourné(e)'},
+            {"N° d'inscription": 202, 'Nom': 'A', 'Prénom': 'B', 'Décision': 'Admis(e)'},
+            {"N° d'inscription": 203, 'Nom': 'A', 'Prénom': 'B', 'Décision': 'Admis(e)'},
+        ])
+
+        result = import_students_from_excel(path, '2')
+
+        self.assertEqual(result.promoted, 1)
+        self.assertEqual(result.skipped, 3)
+        self.assertEqual(
+            dict(Student.objects.values_list('matricule', 'current_year')),
+            {'200': '3', '201': '2', '202': '3'}
+        )
+
+
+class ImportJobTests(TestCase):
+    """Uploaded sheets are imported by a background job"""
+
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        settings_override = self.settings(MEDIA_ROOT=self.tmpdir.name, STUDENT_IMPORT_CHUNK_SIZE=2)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def upload(self, rows, decision='create', academic_year='2'):
+        """Create an ExcelUpload without running its job"""
+        import io
+        from unittest import mock
+        import pandas as pd
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from users.models import ExcelUpload
+
+        content = io.BytesIO()
+        pd.DataFrame(rows).to_excel(content, startrow=6, index=False)
+        with mock.patch('users.tasks.run_import_job.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                upload = ExcelUpload.objects.create(
+                    file=SimpleUploadedFile('students.xlsx', content.getvalue()),
+                    decision=decision,
+                    academic_year=academic_year,
+                )
+        return upload, delay
+
+    def test_upload_queues_job(self):
+        from users.models import ImportJob
+
+        upload, delay = self.upload([{"N° d'inscription": 1, 'Nom': 'Kaci', 'Prénom': 'Sara'}])
+
+        job = upload.import_jobs.get()
+        self.assertEqual(job.status, ImportJob.STATUS_QUEUED)
+        delay.assert_called_once_with(job.id)
+        # Editing the upload does not import it again
+        upload.save()
+        self.assertEqual(upload.import_jobs.count(), 1)
+        self.assertFalse(Student.objects.exists())
+
+    def test_run_job(self):
+        from users.models import ImportJob
+        from users.services import ImportJobService
+
+        upload, _ = self.upload([
+            {"N° d'inscription": 1, 'Nom': 'Kaci', 'Prénom': 'Sara'},
+            {"N° d'inscription": 2, 'Nom': 'Kaci', 'Prénom': 'Amine'},
+            {"N° d'inscription": 3, 'Nom': '', 'Prénom': 'Yasmine'},
+            {"N° d'inscription": 4, 'Nom': 'Benali', 'Prénom': 'Ali'},
+        ])
+        job = upload.import_jobs.get()
+
+        ImportJobService.run(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.STATUS_DONE)
+        self.assertEqual(
+            (job.total_rows, job.processed_rows, job.created_count, job.skipped_count),
+            (4, 4, 3, 1)
+        )
+        self.assertEqual(job.progress, 100)
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(job.errors_csv().splitlines()[1], '10,3,"Missing matricule, first name or last name"')
+        self.assertEqual(Student.objects.count(), 3)
+
+        # A redelivered task does not run the job again
+        self.assertIsNone(ImportJobService.run(job.id))
+
+    def test_failed_job(self):
+        from users.models import ImportJob
+        from users.services import ImportJobService
+
+        upload, _ = self.upload([{"N° d'inscription": 1, 'Nom': 'Kaci'}])
+        job = upload.import_jobs.get()
+
+        with self.assertLogs('users.services.import_job_service', 'ERROR'):
+            ImportJobService.run(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.STATUS_FAILED)
+        self.assertIn('Prénom', job.failure)
+
+    def test_admin_error_file(self):
+        from users.services import ImportJobService
+
+        upload, _ = self.upload([{"N° d'inscription": 5, 'Nom': 'Kaci', 'Prénom': 'Sara', 'Décision': 'Ajourné'}],
+                                decision='update')
+        job = upload.import_jobs.get()
+        ImportJobService.run(job.id)
+
+        admin_user = User.objects.create_superuser(
+            email='admin@test.com', username='admin', first_name='Admin', last_name='Test', password='pass123'
+        )
+        self.client.force_login(admin_user)
+        response = self.client.get(reverse('admin:users_importjob_errors', args=[job.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('8,5,"Marked \'ajourné\', not promoted"', response.content.decode())
+        self.assertEqual(self.client.get(reverse('admin:users_excelupload_change', args=[upload.id])).status_code, 200)
+
+
+class StudentSheetReaderTests(TestCase):
+    """Large exports are read lazily, one chunk of rows at a time"""
+
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def path(self, name):
+        import os
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_excel_chunks(self):
+        import pandas as pd
+        from users.services import StudentSheetReader
+
+        path = self.path('students.xlsx')
+        pd.DataFrame({
+            "N° d'inscription": [1, 2, 3, 4, 5],
+            'Nom': ['A', 'B', 'C', 'D', 'E'],
+        }).to_excel(path, startrow=6, index=False)
+
+        reader = StudentSheetReader(path, chunk_size=2)
+        chunks = list(reader)
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(reader.total_rows, 5)
+        self.assertEqual(list(chunks[1]["N° d'inscription"]), [3, 4])
+        self.assertEqual(list(chunks[1].index), [2, 3])
+        self.assertEqual(chunks[1].attrs['header_row'], 7)
+
+    def test_csv_import(self):
+        from users.services import StudentImportService, StudentSheetReader
+
+        path = self.path('students.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("N° d'inscription;Nom;Prénom\n10;kaci;sara\n11;;amine\n;;\n12;benali;ali\n")
+
+        with self.settings(STUDENT_IMPORT_CHUNK_SIZE=2):
+            result = StudentImportService.create_students(StudentImportService.open_sheet(path), '2')
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.errors, [
+            {'row': 3, 'matricule': '11', 'message': "Missing matricule, first name or last name"}
+        ])
+        self.assertEqual(
+            sorted(Student.objects.values_list('matricule', 'user__username')),
+            [('10', 'sarakaci'), ('12', 'alibenali')]
+        )
+
+    def test_promotion_across_chunks(self):
+        import pandas as pd
+        from users.services import StudentImportService, StudentPromotionService
+
+        for matricule in ('1', '2', '3'):
+            user = User.objects.create_user(
+                email=f'{matricule}@test.com', username=f'u{matricule}', password='pass123',
+                first_name='A', last_name='B', user_type='student'
+            )
+            Student.objects.create(user=user, matricule=matricule, current_year='3')
+
+        path = self.path('deliberation.xlsx')
+        pd.DataFrame({
+            "N° d'inscription": ['1', '2', '3', '1'],
+            'Décision': ['Admis(e)', 'Ajourné(e)', 'Admis(e)', 'Admis(e)'],
+        }).to_excel(path, startrow=6, index=False)
+
+        with self.settings(STUDENT_IMPORT_CHUNK_SIZE=2):
+            result = StudentPromotionService.promote(StudentImportService.open_sheet(path), '3')
+
+        self.assertEqual(result.promoted, 2)
+        self.assertEqual([error['row'] for error in result.errors], [9, 11])
+        self.assertEqual(
+            dict(Student.objects.values_list('matricule', 'current_year')),
+            {'1': '4siw', '2': '3', '3': '4siw'}
+        )
+
+    def test_unsupported_file(self):
+        from users.services import StudentSheetReader
+
+        with self.assertRaises(ValueError):
+            StudentSheetReader(self.path('students.pdf'), chunk_size=10)
+
+
+class StudentPromotionRunTests(TestCase):
+    """Promotions are applied once per sheet and resume after a failure"""
+
+    def setUp(self):
+        import os
+        import tempfile
+        import pandas as pd
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        settings_override = self.settings(STUDENT_IMPORT_CHUNK_SIZE=2)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        for i in range(5):
+            user = User.objects.create_user(
+                email=f's{i}@test.com', username=f's{i}', password='pass123',
+                first_name='A', last_name='B', user_type='student'
+            )
+            Student.objects.create(user=user, matricule=str(i), current_year='2')
+
+        self.path = os.path.join(self.tmpdir.name, 'deliberation.xlsx')
+        pd.DataFrame({
+            "N° d'inscription": ['0', '1', '2', '3', '4'],
+            'Décision': ['Admis(e)', 'Admis(e)', 'Admis(e)', 'Admis(e)', 'Ajourné(e)'],
+        }).to_excel(self.path, startrow=6, index=False)
+
+    def years(self):
+        return dict(Student.objects.values_list('matricule', 'current_year'))
+
+    def test_run_is_idempotent(self):
+        from users.models import PromotionRun
+        from users.services import StudentPromotionService
+
+        run, result = StudentPromotionService.run(self.path, '2')
+        self.assertEqual(run.status, PromotionRun.STATUS_DONE)
+        self.assertEqual((run.next_chunk, len(run.plan)), (2, 2))
+        self.assertEqual((result.promoted, result.skipped), (4, 1))
+
+        # Running the same sheet again touches no student, not even one
+        # moved back to year 2 by hand since
+        Student.objects.filter(matricule='0').update(current_year='2')
+        with self.assertNumQueries(1):
+            again, result = StudentPromotionService.run(self.path, '2')
+        self.assertEqual(again.id, run.id)
+        self.assertEqual(result.promoted, 4)
+        self.assertEqual(self.years()['0'], '2')
+
+    def test_grouped_updates(self):
+        from users.models import PromotionRun
+        from users.services import StudentPromotionService
+
+        import pandas as pd
+
+        user = User.objects.create_user(
+            email='s5@test.com', username='s5', password='pass123',
+            first_name='A', last_name='B', user_type='student'
+        )
+        Student.objects.create(user=user, matricule='5', current_year='2')
+        pd.DataFrame({
+            "N° d'inscription": ['0', '1', '2', '3', '4', '5'],
+            'Décision': ['Admis(e)', 'Admis(e)', 'Admis(e)', 'Admis(e)', 'Ajourné(e)', 'Non admis(e)'],
+        }).to_excel(self.path, startrow=6, index=False)
+
+        run, _ = StudentPromotionService.run(self.path, '2')
+        Student.objects.update(current_year='2')
+        PromotionRun.objects.filter(id=run.id).update(status=PromotionRun.STATUS_FAILED, next_chunk=0)
+
+        # Resuming costs the run lookup, then per chunk one UPDATE of the
+        # students and one of the run inside a savepoint, then the status
+        with self.assertNumQueries(1 + 1 + 2 * 4 + 2):
+            StudentPromotionService.run(self.path, '2')
+        self.assertEqual(self.years(), {'0': '3', '1': '3', '2': '3', '3': '3', '4': '2', '5': '2'})
+
+    def test_resume_after_failure(self):
+        from unittest import mock
+        from django.db import DatabaseError
+        from users.models import PromotionRun
+        from users.services import StudentPromotionService
+
+        apply_chunk = StudentPromotionService.apply_chunk
+        calls = []
+
+        def failing_apply(chunk):
+            calls.append(chunk)
+            if len(calls) == 2:
+                raise DatabaseError("connection lost")
+            return apply_chunk(chunk)
+
+        with mock.patch.object(StudentPromotionService, 'apply_chunk', side_effect=failing_apply):
+            with self.assertRaises(DatabaseError):
+                StudentPromotionService.run(self.path, '2')
+
+        run = PromotionRun.objects.get()
+        self.assertEqual((run.status, run.next_chunk, run.promoted_count), (PromotionRun.STATUS_FAILED, 1, 2))
+        self.assertEqual(self.years(), {'0': '3', '1': '3', '2': '2', '3': '2', '4': '2'})
+
+        run, result = StudentPromotionService.run(self.path, '2')
+        self.assertEqual((run.status, run.next_chunk, run.promoted_count), (PromotionRun.STATUS_DONE, 2, 4))
+        self.assertEqual(result.promoted, 4)
+        self.assertEqual(self.years(), {'0': '3', '1': '3', '2': '3', '3': '3', '4': '2'})
+
+
+class CreateFakeUsersCommandTests(TestCase):
+    """Fake data is created in bulk and reproducibly"""
+
+    def run_command(self, **options):
+        import io
+        from django.core.management import call_command
+
+        options = {'students': 30, 'teachers': 4, 'admins': 1, 'externals': 1, 'seed': 7, **options}
+        call_command('create_fake_users', stdout=io.StringIO(), **options)
+
+    def test_creates_related_data(self):
+        from teams.models import Team, TeamMembership
+        from themes.models import ThemeAssignment
+        from notifications.models import Notification
+
+        self.run_command(full=True)
+
+        self.assertEqual(User.objects.count(), 36)
+        self.assertEqual(Student.objects.count(), 30)
+        self.assertTrue(User.objects.get(username='student1').check_password('zaarirmoh'))
+        self.assertEqual(len(set(User.objects.values_list('password', flat=True))), 1)
+        self.assertTrue(Team.objects.exists())
+        self.assertEqual(Notification.objects.count(), 36 * 5)
+
+        for membership in TeamMembership.objects.select_related('team', 'user__student'):
+            self.assertEqual(membership.user.student.current_year, membership.team.academic_year)
+        self.assertEqual(
+            TeamMembership.objects.filter(role='owner').count(), Team.objects.count()
+        )
+        for assignment in ThemeAssignment.objects.select_related('team', 'theme'):
+            self.assertEqual(assignment.theme.academic_year, assignment.team.academic_year)
+
+    def test_creates_users_only_by_default(self):
+        from teams.models import Team
+        from notifications.models import Notification
+
+        self.run_command()
+
+        self.assertEqual(User.objects.count(), 36)
+        self.assertFalse(Team.objects.exists())
+        self.assertFalse(Notification.objects.exists())
+
+    def test_same_seed_same_data(self):
+        def snapshot():
+            return list(
+                Student.objects.order_by('user__username')
+                .values_list('user__username', 'user__first_name', 'current_year')
+            )
+
+        self.run_command()
+        first = snapshot()
+        User.objects.all().delete()
+        self.run_command()
+
+        self.assertEqual(snapshot(), first)
+
+    def test_rerun_adds_users(self):
+        self.run_command()
+        self.run_command()
+
+        self.assertEqual(Student.objects.count(), 60)
+        self.assertTrue(User.objects.filter(username='student60').exists())
+
+    def test_queries_do_not_grow_with_users(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as small:
+            self.run_command(students=5)
+        User.objects.all().delete()
+        with CaptureQueriesContext(connection) as larger:
+            self.run_command(students=30)
+
+        self.assertEqual(len(larger), len(small))
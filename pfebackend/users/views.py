@@ -7,6 +7,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth import get_user_model
 from users.serializers.user import CustomUserSerializer
 from common.pagination import StaticPagination
+from common.query_budget import query_budget
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from .filters import StudentFilter, TeacherFilter, ExternalUserFilter
@@ -19,6 +20,7 @@ from .serializers import StudentSkillSerializer
 
 User = get_user_model()
 
+@query_budget(10)
 class BaseUserListView(generics.ListAPIView):
     """
     Base view for user listing with common configurations.
@@ -229,6 +231,7 @@ class ProfilePictureUpdateView(generics.CreateAPIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+@query_budget(10)
 class ProfileListView(generics.ListAPIView):
     """
     API view that lists all user profiles.